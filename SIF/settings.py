@@ -58,6 +58,27 @@ ALLOWED_HOSTS = []
 # Clockify API Key
 CLOCKIFY_API_KEY = os.getenv('CLOCKIFY_API_KEY')
 
+# Clockify API endpoint and client tuning
+CLOCKIFY_API_BASE = os.getenv('CLOCKIFY_API_BASE', 'https://api.clockify.me/api/v1')
+CLOCKIFY_MAX_WORKERS = int(os.getenv('CLOCKIFY_MAX_WORKERS', 8))  # Concurrent requests / pooled connections
+CLOCKIFY_TIMEOUT = int(os.getenv('CLOCKIFY_TIMEOUT', 10))  # Seconds per request
+CLOCKIFY_RATE_LIMIT = float(os.getenv('CLOCKIFY_RATE_LIMIT', 10))  # Requests per second allowed for our API key
+CLOCKIFY_MAX_RETRIES = int(os.getenv('CLOCKIFY_MAX_RETRIES', 5))  # Retries per request on 429/5xx/network errors
+CLOCKIFY_RETRY_BUDGET = int(os.getenv('CLOCKIFY_RETRY_BUDGET', 50))  # Retries allowed across all requests per minute
+CLOCKIFY_BACKOFF = float(os.getenv('CLOCKIFY_BACKOFF', 0.5))  # Base backoff in seconds, doubled per retry
+
+# Number of time entries written per bulk_create/bulk_update batch during a sync
+CLOCKIFY_SYNC_BATCH_SIZE = int(os.getenv('CLOCKIFY_SYNC_BATCH_SIZE', 500))
+
+# Page size requested when walking a user's time entries (Clockify allows up to 5000)
+CLOCKIFY_PAGE_SIZE = int(os.getenv('CLOCKIFY_PAGE_SIZE', 200))
+
+# Rows fetched per database round trip when streaming time-entry exports
+CLOCKIFY_EXPORT_CHUNK_SIZE = int(os.getenv('CLOCKIFY_EXPORT_CHUNK_SIZE', 2000))
+
+# A sync still "running" after this many seconds is treated as crashed and its lock released
+CLOCKIFY_SYNC_STALE_AFTER = int(os.getenv('CLOCKIFY_SYNC_STALE_AFTER', 3600))
+
 RECAPTCHA_SITE_KEY = os.getenv("RECAPTCHA_SITE_KEY")
 RECAPTCHA_SECRET_KEY = os.getenv("RECAPTCHA_SECRET_KEY")
 
@@ -136,6 +157,25 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Typeahead and editor analytics are invalidated by bumping a generation key,
+# so every worker process must share one cache; the default per-process
+# LocMemCache would keep serving stale results in the other workers. The file
+# cache is shared by the workers of one checkout; point CACHE_BACKEND/CACHE_LOCATION
+# at Redis or Memcached when running on several hosts. Tests use a LocMemCache
+# (see SIF/test_runner.py).
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    }
+}
+
+TEST_RUNNER = 'SIF.test_runner.TestRunner'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -204,4 +244,34 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# 🔐 Media is only served through authenticated download views.
+# "nginx" hands the bytes off with X-Accel-Redirect to FILE_SERVE_INTERNAL_URL
+# (an `internal` location aliased to MEDIA_ROOT), "sendfile" uses X-Sendfile;
+# empty lets Django send the file itself.
+FILE_SERVE_BACKEND = os.getenv('FILE_SERVE_BACKEND', '')
+FILE_SERVE_INTERNAL_URL = os.getenv('FILE_SERVE_INTERNAL_URL', '/protected-media/')
+
+# Roles allowed to download filter files
+FILTER_DOWNLOAD_ROLES = ['admin', 'senior', 'junior']
+
+# Batch filter uploads: files per request (ZIP members included) and bytes per file
+FILTER_BATCH_MAX_FILES = int(os.getenv('FILTER_BATCH_MAX_FILES', 200))
+FILTER_MAX_UPLOAD_SIZE = int(os.getenv('FILTER_MAX_UPLOAD_SIZE', 5 * 1024 * 1024))
+DATA_UPLOAD_MAX_NUMBER_FILES = FILTER_BATCH_MAX_FILES  # Django's own per-request file cap (default 100)
+
+# Resumable (chunked) uploads: largest bundle, suggested chunk size (must fit in
+# DATA_UPLOAD_MAX_MEMORY_SIZE, 2.5 MB by default) and idle seconds before cleanup
+FILTER_RESUMABLE_MAX_SIZE = int(os.getenv('FILTER_RESUMABLE_MAX_SIZE', 500 * 1024 * 1024))
+FILTER_UPLOAD_CHUNK_SIZE = int(os.getenv('FILTER_UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024))
+FILTER_UPLOAD_EXPIRE_AFTER = int(os.getenv('FILTER_UPLOAD_EXPIRE_AFTER', 24 * 3600))
+
+# Seconds event-name/year typeahead results stay cached (cleared on any Event change)
+EVENT_TYPEAHEAD_CACHE_SECONDS = int(os.getenv('EVENT_TYPEAHEAD_CACHE_SECONDS', 3600))
+
+# Seconds editor analytics for a period stay cached (cleared on any EditorLog change)
+EDITOR_ANALYTICS_CACHE_SECONDS = int(os.getenv('EDITOR_ANALYTICS_CACHE_SECONDS', 900))
+
+# Most rows accepted by one editor log CSV/XLSX import
+EDITOR_LOG_IMPORT_MAX_ROWS = int(os.getenv('EDITOR_LOG_IMPORT_MAX_ROWS', 5000))
+
 
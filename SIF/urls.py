@@ -22,10 +22,6 @@ from django.contrib.auth import views as auth_views  # Built-in auth views (e.g.
 # ─── Custom Admin ────────────────────────────────────────────────────
 from users.admin import custom_admin_site  # Role-restricted admin site for 'admin' users
 
-# ─── Static & Media Config (for development) ─────────────────────────
-from django.conf import settings  # Access project settings
-from django.conf.urls.static import static  # Serve media files in dev mode
-
 # ─── URL Patterns ────────────────────────────────────────────────────
 urlpatterns = [
     path('admin/', custom_admin_site.urls),  # Custom admin route
@@ -33,8 +29,9 @@ urlpatterns = [
     path('user/', include(('users.urls', 'users'), namespace='users')),  # User-related routes
     path('', include(('dashboard.urls', 'dashboard'), namespace='dashboard')),  # Dashboard routes with namespace
     path('api/clockify/', include('clockify_integration.urls')),
+    path('api/uploads/', include('event.urls')),  # Resumable filter uploads
 
 ]
 
-# Serve media files during development
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Media files are not exposed here: downloads go through the role-checked
+# views in dashboard (see event/serving.py).
@@ -0,0 +1,205 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+import logging
+import random
+import threading
+import time
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: throttling and transient gateway errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker of a client.
+    `rate` tokens are added per second up to `capacity`; acquire() blocks until one is free.
+    pause() stops handing out tokens for a while, e.g. after a 429.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = max(1, capacity or rate)  # Below 1 token the bucket could never serve a request
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class RetryBudget:
+    """
+    Caps total retries across all calls to `limit` per rolling `window` seconds,
+    so a degraded API fails fast instead of multiplying load.
+    """
+
+    def __init__(self, limit, window=60):
+        self.limit = limit
+        self.window = window
+        self.spent = deque()
+        self.lock = threading.Lock()
+
+    def try_spend(self):
+        with self.lock:
+            now = time.monotonic()
+            while self.spent and now - self.spent[0] > self.window:
+                self.spent.popleft()
+            if len(self.spent) >= self.limit:
+                return False
+            self.spent.append(now)
+            return True
+
+
+def retry_after_seconds(response):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date). Returns None if absent/invalid.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ClockifyClient:
+    """
+    Thin Clockify API client sharing one pooled requests.Session.
+    Keeps TCP/TLS connections alive between calls and runs independent
+    requests on a bounded thread pool. Every request goes through a token
+    bucket sized to the API key's quota and is retried with exponential
+    backoff (honouring Retry-After) within a shared retry budget.
+    """
+
+    def __init__(self, api_key, base_url=None, max_workers=None, timeout=None,
+                 rate_limit=None, max_retries=None, retry_budget=None, backoff=None):
+        self.base_url = (base_url or settings.CLOCKIFY_API_BASE).rstrip("/")
+        self.max_workers = max_workers or settings.CLOCKIFY_MAX_WORKERS
+        self.timeout = timeout or settings.CLOCKIFY_TIMEOUT
+        self.max_retries = settings.CLOCKIFY_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff or settings.CLOCKIFY_BACKOFF
+        self.bucket = TokenBucket(rate_limit or settings.CLOCKIFY_RATE_LIMIT)
+        self.retry_budget = RetryBudget(settings.CLOCKIFY_RETRY_BUDGET if retry_budget is None else retry_budget)
+
+        self.session = requests.Session()
+        self.session.headers.update({"X-Api-Key": api_key})
+        # One pooled connection per worker so concurrent calls never queue on the pool
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, path, params=None, timeout=None):
+        """
+        GET `path` (relative to the API base) and return the decoded JSON.
+        Throttled and transient failures are retried; raises
+        requests.RequestException once retries or the retry budget run out.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error, delay = e, None
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+                delay = retry_after_seconds(response)
+
+            if attempt >= self.max_retries or not self.retry_budget.try_spend():
+                raise error
+            if delay is None:
+                delay = self._backoff(attempt)
+            if getattr(error, "response", None) is not None and error.response.status_code == 429:
+                # Stop every worker, not just this one, until the quota recovers
+                self.bucket.pause(delay)
+            logger.warning("Clockify request %s failed (%s); retry %s in %.1fs", url, error, attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _backoff(self, attempt):
+        # Exponential backoff with full jitter, capped at one minute
+        return random.uniform(0, min(60, self.backoff * 2 ** attempt))
+
+    def iter_pages(self, path, params=None, page_size=None):
+        """
+        Walk a paginated list endpoint, yielding items until a short page is returned.
+        """
+        page_size = page_size or settings.CLOCKIFY_PAGE_SIZE
+        params = dict(params or {}, page=1, **{"page-size": page_size})
+
+        while True:
+            items = self.get(path, params=params)
+            yield from items
+
+            if len(items) < page_size:
+                return
+            params["page"] += 1
+
+    def map(self, func, items):
+        """
+        Run func(item) for every item on the worker pool.
+        Yields (item, result, error) tuples in completion order; exactly one of
+        result/error is set. Callers should keep DB work on their own thread.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            futures = {pool.submit(func, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+
+
+def get_client():
+    """
+    Return the process-wide ClockifyClient, or None if no API key is configured.
+    The client is rebuilt if the configured key changes.
+    """
+    global _client
+    api_key = settings.CLOCKIFY_API_KEY
+    if not api_key:
+        return None
+
+    if _client is None or _client.session.headers.get("X-Api-Key") != api_key:
+        _client = ClockifyClient(api_key)
+    return _client
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import SyncRun
+from .services import sync_clockify_workspaces, sync_clockify_users, sync_clockify_projects, sync_clockify_time_entries
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def release_stale_runs():
+    """
+    Fail runs stuck in "running" longer than CLOCKIFY_SYNC_STALE_AFTER so a
+    crashed worker cannot hold the sync lock forever.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CLOCKIFY_SYNC_STALE_AFTER)
+    return SyncRun.objects.filter(active=True, status='running', started_at__lt=cutoff).update(
+        status='failed', active=False, finished_at=timezone.now(), error="Run timed out (worker stopped?)"
+    )
+
+
+def queue_sync_run(full=False):
+    """
+    Queue a new sync run unless one is already pending or running.
+    Returns (run, created); when a run is already active it is returned instead.
+    """
+    release_stale_runs()
+    try:
+        with transaction.atomic():
+            return SyncRun.objects.create(full=full), True
+    except IntegrityError:
+        # The one_active_sync_run constraint is the lock
+        return SyncRun.objects.filter(active=True).first(), False
+
+
+def claim_run(run):
+    """
+    Atomically move a pending run to running. Returns False if another worker got it first.
+    """
+    now = timezone.now()
+    claimed = SyncRun.objects.filter(pk=run.pk, status='pending').update(status='running', started_at=now)
+    if claimed:
+        run.status = 'running'
+        run.started_at = now
+    return bool(claimed)
+
+
+def next_pending_run():
+    return SyncRun.objects.filter(status='pending').order_by('created_at').first()
+
+
+def _count(result):
+    # Sync functions return either a list of saved objects or a counts dict
+    return len(result) if isinstance(result, list) else result
+
+
+def execute_run(run):
+    """
+    Run every sync step for a claimed run, recording results and timings.
+    """
+    steps = [
+        ("workspaces", sync_clockify_workspaces),
+        ("users", sync_clockify_users),
+        ("projects", sync_clockify_projects),
+        ("time_entries", lambda: sync_clockify_time_entries(incremental=not run.full)),
+    ]
+    result = {}
+    run.error = ""
+    try:
+        for name, step in steps:
+            outcome = step()
+            if isinstance(outcome, dict) and outcome.get("error"):
+                run.error = f"{name}: {outcome['error']}"
+                break
+            result[name] = _count(outcome)
+    except Exception as e:
+        logger.exception("Clockify sync run %s failed", run.pk)
+        run.error = str(e)
+
+    run.result = result
+    run.status = 'failed' if run.error else 'success'
+    run.active = False
+    run.finished_at = timezone.now()
+    run.save(update_fields=['result', 'error', 'status', 'active', 'finished_at'])
+    return run
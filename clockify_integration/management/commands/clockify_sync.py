@@ -0,0 +1,45 @@
+import time
+from django.core.management.base import BaseCommand
+from clockify_integration.jobs import queue_sync_run, claim_run, next_pending_run, execute_run, release_stale_runs
+
+
+class Command(BaseCommand):
+    help = "Sync Clockify data in the background. Runs once, or as a worker loop with --loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Walk every user's full time-entry history.")
+        parser.add_argument('--loop', action='store_true', help="Keep running and execute queued sync runs.")
+        parser.add_argument('--every', type=int, default=0,
+                            help="With --loop, also queue a sync every N seconds (0 = only run queued syncs).")
+        parser.add_argument('--poll', type=int, default=5, help="With --loop, seconds between queue checks.")
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            run, created = queue_sync_run(full=options['full'])
+            if run.status != 'pending' or not claim_run(run):
+                self.stdout.write(self.style.WARNING(f"{run} is already in progress."))
+                return
+            self._execute(run)
+            return
+
+        self.stdout.write(f"Clockify sync worker started (poll {options['poll']}s).")
+        last_scheduled = 0
+        while True:
+            release_stale_runs()
+            if options['every'] and time.monotonic() - last_scheduled >= options['every']:
+                queue_sync_run(full=options['full'])
+                last_scheduled = time.monotonic()
+
+            run = next_pending_run()
+            if run and claim_run(run):
+                self._execute(run)
+            else:
+                time.sleep(options['poll'])
+
+    def _execute(self, run):
+        self.stdout.write(f"Starting sync #{run.pk}...")
+        execute_run(run)
+        if run.status == 'success':
+            self.stdout.write(self.style.SUCCESS(f"Sync #{run.pk} finished in {run.duration_seconds:.1f}s: {run.result}"))
+        else:
+            self.stdout.write(self.style.ERROR(f"Sync #{run.pk} failed: {run.error}"))
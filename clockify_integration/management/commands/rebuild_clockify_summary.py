@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from clockify_integration.reports import rebuild_daily_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Clockify daily summary table from raw time entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="Rows written per INSERT batch.")
+
+    def handle(self, *args, **options):
+        count = rebuild_daily_summaries(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily summary rows."))
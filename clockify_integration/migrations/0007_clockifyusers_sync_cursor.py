@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clockify_integration', '0006_clockifytimeentry_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clockifyusers',
+            name='entries_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clockifyusers',
+            name='entries_synced_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
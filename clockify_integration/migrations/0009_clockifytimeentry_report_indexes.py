@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clockify_integration', '0008_syncrun'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clockifytimeentry',
+            index=models.Index(fields=['user', 'start'], name='clockify_in_user_id_8f055e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clockifytimeentry',
+            index=models.Index(fields=['project', 'start'], name='clockify_in_project_2dd507_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:09
+
+from django.db import migrations, models
+from django.utils.dateparse import parse_duration
+
+
+def backfill_duration_seconds(apps, schema_editor):
+    ClockifyTimeEntry = apps.get_model('clockify_integration', 'ClockifyTimeEntry')
+    pending = ClockifyTimeEntry.objects.filter(duration_seconds__isnull=True).exclude(duration__isnull=True).exclude(duration='')
+
+    batch = []
+    for entry in pending.only('id', 'duration').iterator(chunk_size=1000):
+        parsed = parse_duration(entry.duration)
+        if parsed is None:
+            continue
+        entry.duration_seconds = int(parsed.total_seconds())
+        batch.append(entry)
+        if len(batch) >= 1000:
+            ClockifyTimeEntry.objects.bulk_update(batch, ['duration_seconds'])
+            batch = []
+    ClockifyTimeEntry.objects.bulk_update(batch, ['duration_seconds'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clockify_integration', '0009_clockifytimeentry_report_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clockifytimeentry',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_duration_seconds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clockify_integration', '0010_clockifytimeentry_duration_seconds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClockifyDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total_seconds', models.PositiveIntegerField(default=0)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='clockify_integration.clockifyprojects')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='clockify_integration.clockifyusers')),
+            ],
+            options={
+                'verbose_name': 'Daily Summary',
+                'verbose_name_plural': 'Daily Summaries',
+                'indexes': [models.Index(fields=['day'], name='clockify_in_day_9bf62c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'project', 'day'), name='unique_daily_summary')],
+            },
+        ),
+    ]
@@ -19,6 +19,10 @@ class ClockifyUsers(models.Model):
         related_name="users"  # makes it easy to access workspace.users.all()
     )
 
+    # Incremental time-entry sync cursor (high-water mark)
+    entries_synced_until = models.DateTimeField(null=True, blank=True)  # latest entry start seen
+    entries_synced_at = models.DateTimeField(null=True, blank=True)  # when the last sync finished
+
     def __str__(self):
         return f"{self.name} ({self.workspace.name})"
     
@@ -46,6 +50,7 @@ class ClockifyTimeEntry(models.Model):
     end = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
     duration = models.CharField(max_length=50, blank=True, null=True)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True, db_index=True)  # Parsed `duration`, for SQL totals
 
     def __str__(self):
         return f"{self.user.name} - {self.description or 'No Description'}"
@@ -53,3 +58,71 @@ class ClockifyTimeEntry(models.Model):
     class Meta:
         verbose_name = "Time Entry"
         verbose_name_plural = "Time Entries"
+        indexes = [
+            models.Index(fields=['user', 'start']),  # Reports filtered by user, newest first
+            models.Index(fields=['project', 'start']),  # Reports filtered by project, newest first
+        ]
+
+
+class ClockifyDailySummary(models.Model):
+    """
+    Rollup of time entries per user, project and day (in TIME_ZONE).
+    Maintained by the sync for the days it touches; rebuild with
+    `manage.py rebuild_clockify_summary`.
+    """
+    user = models.ForeignKey("ClockifyUsers", on_delete=models.CASCADE, related_name="daily_summaries")
+    project = models.ForeignKey("ClockifyProjects", on_delete=models.CASCADE, related_name="daily_summaries")
+    day = models.DateField()
+    total_seconds = models.PositiveIntegerField(default=0)
+    entry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Daily Summary"
+        verbose_name_plural = "Daily Summaries"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'project', 'day'], name='unique_daily_summary'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.name} - {self.project.name} - {self.day}"
+
+
+class SyncRun(models.Model):
+    """
+    One background Clockify sync. `active` is True while the run is pending or
+    running; a conditional unique constraint on it acts as the global sync lock.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    active = models.BooleanField(default=True)
+    full = models.BooleanField(default=False)  # walk full history instead of resuming from cursors
+    result = models.JSONField(null=True, blank=True)  # per-step counts
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['active'], condition=models.Q(active=True), name='one_active_sync_run'),
+        ]
+
+    def __str__(self):
+        return f"Sync #{self.pk} ({self.status})"
+
+    @property
+    def duration_seconds(self):
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
@@ -0,0 +1,108 @@
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from .models import ClockifyTimeEntry, ClockifyDailySummary
+
+# Columns each total is grouped by
+TOTAL_GROUPINGS = {
+    "user": ["user_id", "user__name"],
+    "project": ["project_id", "project__name"],
+    "day": ["day"],
+}
+
+
+def duration_totals(entries, by):
+    """
+    Group a ClockifyTimeEntry queryset by user, project or day (in the current
+    timezone) and return dict rows with total_seconds and entry_count.
+    Runs as a single GROUP BY query.
+    """
+    group = TOTAL_GROUPINGS[by]
+    if by == "day":
+        entries = entries.annotate(day=TruncDate("start"))
+    return (
+        entries.values(*group)
+        .annotate(total_seconds=Sum("duration_seconds"), entry_count=Count("id"))
+        .order_by(*group)
+    )
+
+
+def summary_key(user_id, project_id, start):
+    """
+    The (user, project, day) ClockifyDailySummary row an entry counts towards, or None without a start.
+    """
+    if start is None:
+        return None
+    return (user_id, project_id, timezone.localdate(start))
+
+
+def _summary_rows(entries):
+    # One GROUP BY over the entries, shaped like ClockifyDailySummary
+    return (
+        entries.filter(start__isnull=False)
+        .annotate(day=TruncDate("start"))
+        .values("user_id", "project_id", "day")
+        .annotate(total=Coalesce(Sum("duration_seconds"), 0), count=Count("id"))
+        .order_by()
+    )
+
+
+def _save_summaries(rows, batch_size):
+    ClockifyDailySummary.objects.bulk_create(
+        [
+            ClockifyDailySummary(user_id=r["user_id"], project_id=r["project_id"], day=r["day"],
+                                 total_seconds=r["total"], entry_count=r["count"])
+            for r in rows
+        ],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["user", "project", "day"],
+        update_fields=["total_seconds", "entry_count"],
+    )
+
+
+def refresh_daily_summaries(keys, batch_size=None):
+    """
+    Recompute the summary rows for the given (user_id, project_id, day) keys
+    from raw entries, deleting rows whose entries are gone.
+    """
+    keys = {key for key in keys if key is not None}
+    if not keys:
+        return
+    batch_size = batch_size or settings.CLOCKIFY_SYNC_BATCH_SIZE
+
+    days = [key[2] for key in keys]
+    range_start = timezone.make_aware(datetime.combine(min(days), time.min))
+    range_end = timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min))
+    entries = ClockifyTimeEntry.objects.filter(
+        user_id__in={key[0] for key in keys},
+        start__gte=range_start,
+        start__lt=range_end,
+    )
+    fresh = [row for row in _summary_rows(entries) if (row["user_id"], row["project_id"], row["day"]) in keys]
+    stale = keys - {(row["user_id"], row["project_id"], row["day"]) for row in fresh}
+
+    with transaction.atomic():
+        _save_summaries(fresh, batch_size)
+        stale = list(stale)
+        for i in range(0, len(stale), batch_size):
+            match = Q()
+            for user_id, project_id, day in stale[i:i + batch_size]:
+                match |= Q(user_id=user_id, project_id=project_id, day=day)
+            ClockifyDailySummary.objects.filter(match).delete()
+
+
+def rebuild_daily_summaries(batch_size=None):
+    """
+    Rebuild the whole ClockifyDailySummary table from raw entries.
+    Returns the number of summary rows written.
+    """
+    batch_size = batch_size or settings.CLOCKIFY_SYNC_BATCH_SIZE
+    rows = list(_summary_rows(ClockifyTimeEntry.objects.all()))
+    with transaction.atomic():
+        ClockifyDailySummary.objects.all().delete()
+        _save_summaries(rows, batch_size)
+    return len(rows)
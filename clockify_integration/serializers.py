@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry
+from .models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry, SyncRun
 
 class ClockifyWorkspaceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -19,9 +19,20 @@ class ClockifyProjectSerializer(serializers.ModelSerializer):
         fields = ['workspace', 'project_id', 'name']
 
 class ClockifyTimeEntrySerializer(serializers.ModelSerializer):
+    id = serializers.CharField(source='time_entry_id', read_only=True)
     user = serializers.CharField(source='user.name', read_only=True)
     project = serializers.CharField(source='project.name', read_only=True)
+    # Rendered in the current timezone, e.g. "Jan 05, 2025 09:30 AM"
+    start = serializers.DateTimeField(format="%b %d, %Y %I:%M %p", read_only=True)
+    end = serializers.DateTimeField(format="%b %d, %Y %I:%M %p", read_only=True)
 
     class Meta:
         model = ClockifyTimeEntry
-        fields = ['time_entry_id', 'user', 'project', 'description', 'start', 'end', 'duration']
\ No newline at end of file
+        fields = ['id', 'user', 'project', 'description', 'start', 'end', 'duration', 'duration_seconds']
+
+class SyncRunSerializer(serializers.ModelSerializer):
+    duration_seconds = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SyncRun
+        fields = ['id', 'status', 'full', 'result', 'error', 'created_at', 'started_at', 'finished_at', 'duration_seconds']
@@ -1,35 +1,34 @@
 from django.conf import settings
 from .models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry
-from django.utils.dateparse import parse_datetime
+from django.utils.dateparse import parse_datetime, parse_duration
+from django.utils import timezone
+from django.db import transaction
+from .client import get_client
+from .reports import refresh_daily_summaries, summary_key
+from datetime import timezone as dt_timezone
 import requests
 import logging
 
 logger = logging.getLogger(__name__)
 
-CLOCKIFY_API_BASE = "https://api.clockify.me/api/v1"
-
-def sync_clockify_workspaces():
+def sync_clockify_workspaces(client=None):
     """
     Fetch workspaces from Clockify API and save/update them in the database.
     Returns a list of ClockifyWorkspace objects.
     """
-    api_key = settings.CLOCKIFY_API_KEY
-    if not api_key:
+    client = client or get_client()
+    if client is None:
         return {"error": "Clockify API key is not configured in settings."}
 
-    headers = {"X-Api-Key": api_key}
-    url = f"{CLOCKIFY_API_BASE}/workspaces"
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        workspaces = client.get("workspaces")
+    except requests.HTTPError as e:
+        logger.error("Clockify workspaces fetch failed: %s %s", e.response.status_code, e.response.text)
+        return {"error": "Failed to fetch workspaces", "status_code": e.response.status_code, "body": e.response.text}
     except requests.RequestException as e:
         logger.error("Clockify workspaces request failed: %s", e)
         return {"error": "Request to Clockify failed", "detail": str(e)}
 
-    if response.status_code != 200:
-        logger.error("Clockify workspaces fetch failed: %s %s", response.status_code, response.text)
-        return {"error": "Failed to fetch workspaces", "status_code": response.status_code, "body": response.text}
-
-    workspaces = response.json()
     saved_workspaces = []
 
     for ws in workspaces:
@@ -45,36 +44,28 @@ def sync_clockify_workspaces():
 
     return saved_workspaces
 
-def sync_clockify_users():
+def sync_clockify_users(client=None):
     """
     Fetch users for all workspaces from Clockify API and save/update them in the database.
+    Workspaces are fetched concurrently.
     Returns a list of ClockifyUser objects.
     """
-    api_key = settings.CLOCKIFY_API_KEY
-    if not api_key:
+    client = client or get_client()
+    if client is None:
         return {"error": "Clockify API key is not configured in settings."}
 
-    headers = {"X-Api-Key": api_key}
     all_users = []
 
     workspaces = ClockifyWorkspace.objects.all()
     if not workspaces.exists():
         return {"error": "No workspaces found. Please sync workspaces first."}
 
-    for workspace in workspaces:
-        url = f"{CLOCKIFY_API_BASE}/workspaces/{workspace.workspace_id}/users"
-
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-        except requests.RequestException as e:
-            logger.error(f"Clockify users request failed for workspace {workspace.name}: %s", e)
-            continue
-
-        if response.status_code != 200:
-            logger.error("Clockify users fetch failed for %s: %s %s", workspace.name, response.status_code, response.text)
+    fetch = lambda workspace: client.get(f"workspaces/{workspace.workspace_id}/users")
+    for workspace, users, error in client.map(fetch, workspaces):
+        if error:
+            logger.error("Clockify users fetch failed for %s: %s", workspace.name, error)
             continue
 
-        users = response.json()
         for user in users:
             u_id = user.get("id")
             name = user.get("name") or ""
@@ -95,31 +86,25 @@ def sync_clockify_users():
 
     return all_users
 
-def sync_clockify_projects():
+def sync_clockify_projects(client=None):
     """
     Fetch projects from Clockify API for each workspace and save them in the database.
+    Workspaces are fetched concurrently.
     Returns a list of all saved Projects objects.
     """
-    api_key = settings.CLOCKIFY_API_KEY
-    if not api_key:
+    client = client or get_client()
+    if client is None:
         return {"error": "Clockify API key is not configured in settings."}
 
-    headers = {"X-Api-Key": api_key}
     saved_projects = []
 
-    # Loop through all workspaces in your database
-    for workspace in ClockifyWorkspace.objects.all():
-        response = requests.get(
-            f"{CLOCKIFY_API_BASE}/workspaces/{workspace.workspace_id}/projects/",
-            headers=headers
-        )
-
-        if response.status_code != 200:
-            print(f"⚠️ Failed to fetch projects for workspace {workspace.name}")
+    # Fetch every workspace in your database at once
+    fetch = lambda workspace: list(client.iter_pages(f"workspaces/{workspace.workspace_id}/projects"))
+    for workspace, projects, error in client.map(fetch, ClockifyWorkspace.objects.all()):
+        if error:
+            logger.error("Clockify projects fetch failed for %s: %s", workspace.name, error)
             continue
 
-        projects = response.json()
-
         for project in projects:
             obj, created = ClockifyProjects.objects.update_or_create(
                 project_id=project["id"],
@@ -133,51 +118,174 @@ def sync_clockify_projects():
     return saved_projects
 
 
-def sync_clockify_time_entries():
+# Fields compared when deciding whether an incoming entry changed
+TIME_ENTRY_SYNC_FIELDS = ["user_id", "project_id", "description", "start", "end", "duration", "duration_seconds"]
+
+
+def duration_to_seconds(duration):
+    """
+    Convert a Clockify ISO-8601 duration (e.g. "PT1H30M") to whole seconds.
+    Returns None for running entries or unparseable values.
+    """
+    parsed = parse_duration(duration) if duration else None
+    return int(parsed.total_seconds()) if parsed is not None else None
+
+
+def _chunks(items, size):
+    """
+    Yield successive slices of `items` with at most `size` elements.
+    """
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _time_entry_values(entry, user, project_map):
+    """
+    Map a raw Clockify time entry onto ClockifyTimeEntry field values.
+    Returns None when the entry's project is unknown locally.
+    """
+    project_pk = project_map.get(entry.get("projectId"))
+    if project_pk is None:
+        return None
+
+    time_interval = entry.get("timeInterval") or {}
+    start = time_interval.get("start")
+    end = time_interval.get("end")
+    return {
+        "user_id": user.pk,
+        "project_id": project_pk,
+        "description": entry.get("description", ""),
+        "start": parse_datetime(start) if start else None,
+        "end": parse_datetime(end) if end else None,
+        "duration": time_interval.get("duration"),
+        "duration_seconds": duration_to_seconds(time_interval.get("duration")),
+    }
+
+
+def upsert_time_entries(incoming, batch_size=None):
+    """
+    Bulk insert/update time entries.
+    `incoming` maps time_entry_id -> field values (see _time_entry_values).
+    Existing rows are diffed first so unchanged entries cost no writes.
+    Daily summary rows for the affected days are refreshed in the same transaction.
+    Returns a dict with inserted/updated/unchanged counts.
+    """
+    batch_size = batch_size or settings.CLOCKIFY_SYNC_BATCH_SIZE
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not incoming:
+        return counts
+
+    ids = list(incoming)
+    existing = {}
+    for chunk in _chunks(ids, batch_size):
+        rows = ClockifyTimeEntry.objects.filter(time_entry_id__in=chunk).only("time_entry_id", *TIME_ENTRY_SYNC_FIELDS)
+        for row in rows:
+            existing[row.time_entry_id] = row
+
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    summary_keys = set()  # daily summary rows touched by this batch
+    for time_entry_id, values in incoming.items():
+        obj = existing.get(time_entry_id)
+        if obj is None:
+            to_create.append(ClockifyTimeEntry(time_entry_id=time_entry_id, **values))
+            summary_keys.add(summary_key(values["user_id"], values["project_id"], values["start"]))
+            continue
+
+        if all(getattr(obj, field) == value for field, value in values.items()):
+            counts["unchanged"] += 1
+            continue
+
+        # An edit can move the entry to another day or project, so refresh both rows
+        summary_keys.add(summary_key(obj.user_id, obj.project_id, obj.start))
+        summary_keys.add(summary_key(values["user_id"], values["project_id"], values["start"]))
+        for field, value in values.items():
+            setattr(obj, field, value)
+        obj.updated_at = now  # bulk_update skips auto_now
+        to_update.append(obj)
+
+    with transaction.atomic():
+        ClockifyTimeEntry.objects.bulk_create(to_create, batch_size=batch_size)
+        ClockifyTimeEntry.objects.bulk_update(to_update, TIME_ENTRY_SYNC_FIELDS + ["updated_at"], batch_size=batch_size)
+        refresh_daily_summaries(summary_keys, batch_size=batch_size)
+
+    counts["inserted"] = len(to_create)
+    counts["updated"] = len(to_update)
+    return counts
+
+
+def iter_time_entries(client, workspace_id, user_id, start=None, page_size=None):
+    """
+    Walk every page of a user's time entries, yielding raw entry dicts.
+    When `start` is given only entries starting at or after it are requested.
+    Raises requests.RequestException if any page fails.
+    """
+    params = {}
+    if start:
+        params["start"] = start.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    path = f"workspaces/{workspace_id}/user/{user_id}/time-entries"
+    return client.iter_pages(path, params=params, page_size=page_size)
+
+
+def sync_clockify_time_entries(batch_size=None, incremental=True, client=None):
     """
     Fetch and sync all users' time entries from each Clockify workspace.
+    With `incremental`, only entries newer than each user's cursor are fetched;
+    otherwise the full history is walked.
+    Users are fetched concurrently; entries are written in bulk per workspace.
+    Returns a dict with inserted/updated/unchanged/skipped counts.
     """
-    api_key = settings.CLOCKIFY_API_KEY
-    if not api_key:
+    client = client or get_client()
+    if client is None:
         return {"error": "Clockify API key is missing in settings."}
 
-    headers = {"X-Api-Key": api_key}
-    saved_entries = []
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    users = list(ClockifyUsers.objects.select_related("workspace"))
 
-    # Loop through all workspaces in your DB
-    for workspace in ClockifyWorkspace.objects.all():
-        # Then loop through all users in this workspace
-        users = ClockifyUsers.objects.filter(workspace=workspace)
-        for user in users:
-            url = f"{CLOCKIFY_API_BASE}/workspaces/{workspace.workspace_id}/user/{user.user_id}/time-entries"
-            response = requests.get(url, headers=headers)
+    def fetch(user):
+        start = user.entries_synced_until if incremental else None
+        return list(iter_time_entries(client, user.workspace.workspace_id, user.user_id, start=start))
 
-            if response.status_code != 200:
-                print(f"⚠️ Failed to fetch time entries for workspace {workspace.name}, user {user.name}")
-                continue
+    # Fetch every user's pages at once, then group the results per workspace
+    fetched = {}
+    for user, entries, error in client.map(fetch, users):
+        if error:
+            # Leave the cursor untouched so the next run retries this user
+            logger.error("Clockify time entries fetch failed for %s, user %s: %s", user.workspace.name, user.name, error)
+            continue
+        fetched.setdefault(user.workspace, []).append((user, entries))
 
-            time_entries = response.json()
-
-            for entry in time_entries:
-                time_interval = entry.get("timeInterval", {})
-                start_dt = parse_datetime(time_interval.get("start")) if time_interval.get("start") else None
-                end_dt = parse_datetime(time_interval.get("end")) if time_interval.get("end") else None
-                duration = time_interval.get("duration")
-
-                project = ClockifyProjects.objects.filter(project_id=entry.get("projectId")).first()
-
-                obj, created = ClockifyTimeEntry.objects.update_or_create(
-                    time_entry_id=entry["id"],
-                    defaults={
-                        "user": user,
-                        "project": project,
-                        "description": entry.get("description", ""),
-                        "start": start_dt,
-                        "end": end_dt,
-                        "duration": duration,
-                    }
-                )
-                obj.save(update_fields=["updated_at"])
-                saved_entries.append(obj)
-
-    return saved_entries
+    for workspace, results in fetched.items():
+        # Resolve Clockify project ids to local pks once per workspace
+        project_map = dict(
+            ClockifyProjects.objects.filter(workspace=workspace).values_list("project_id", "id")
+        )
+        incoming = {}
+        synced_users = []
+
+        for user, entries in results:
+            latest_start = user.entries_synced_until
+            for entry in entries:
+                values = _time_entry_values(entry, user, project_map)
+                if values is None:
+                    totals["skipped"] += 1
+                    continue
+                incoming[entry["id"]] = values
+                if values["start"] and (latest_start is None or values["start"] > latest_start):
+                    latest_start = values["start"]
+
+            user.entries_synced_until = latest_start
+            synced_users.append(user)
+
+        counts = upsert_time_entries(incoming, batch_size=batch_size)
+        for key, value in counts.items():
+            totals[key] += value
+
+        # Advance cursors only once their entries are stored
+        now = timezone.now()
+        for user in synced_users:
+            user.entries_synced_at = now
+        ClockifyUsers.objects.bulk_update(synced_users, ["entries_synced_until", "entries_synced_at"])
+
+    return totals
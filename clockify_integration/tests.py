@@ -1,3 +1,341 @@
-from django.test import TestCase
+import json
+from datetime import date, datetime, timezone as dt_timezone
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from dashboard.pagination import encode_cursor
+
+from .client import ClockifyClient, TokenBucket
+from .jobs import queue_sync_run, claim_run, execute_run
+from .models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry, ClockifyDailySummary
+from .reports import rebuild_daily_summaries
+from .services import sync_clockify_time_entries, upsert_time_entries
+
+
+class StubClockify:
+    """
+    Minimal local Clockify stand-in: serves canned time entries per user,
+    honours page/page-size and records how many requests were in flight at once.
+    """
+
+    def __init__(self, entries_by_user, delay=0.05, throttle_first=0):
+        self.entries_by_user = entries_by_user
+        self.delay = delay
+        self.throttle_first = throttle_first  # answer this many requests with 429
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/api/v1"
+
+    def handle(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.requests.append(request.path)
+            throttled = len(self.requests) <= self.throttle_first
+        try:
+            time.sleep(self.delay)
+            if throttled:
+                request.send_response(429)
+                request.send_header("Retry-After", "0")
+                request.send_header("Content-Length", "0")
+                request.end_headers()
+                return
+            url = urlparse(request.path)
+            query = parse_qs(url.query)
+            user_id = url.path.split("/user/")[1].split("/")[0]
+            page = int(query.get("page", ["1"])[0])
+            size = int(query.get("page-size", ["50"])[0])
+            body = self.entries_by_user.get(user_id, [])[(page - 1) * size:page * size]
+
+            payload = json.dumps(body).encode()
+            request.send_response(200)
+            request.send_header("Content-Type", "application/json")
+            request.send_header("Content-Length", str(len(payload)))
+            request.end_headers()
+            request.wfile.write(payload)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_entry(entry_id, project_id, hour):
+    return {
+        "id": entry_id,
+        "projectId": project_id,
+        "description": f"entry {entry_id}",
+        "timeInterval": {
+            "start": f"2025-01-01T{hour:02d}:00:00Z",
+            "end": f"2025-01-01T{hour:02d}:30:00Z",
+            "duration": "PT30M",
+        },
+    }
+
+
+def create_workspace(user_count=1):
+    """
+    One workspace with project "p1" and users u0..u<n-1>. Returns (project, users).
+    """
+    workspace = ClockifyWorkspace.objects.create(workspace_id="ws1", name="Workspace")
+    project = ClockifyProjects.objects.create(project_id="p1", name="Project", workspace=workspace)
+    users = [
+        ClockifyUsers.objects.create(user_id=f"u{n}", name=f"User {n}", email=f"u{n}@example.com", workspace=workspace)
+        for n in range(user_count)
+    ]
+    return project, users
+
+
+class ConcurrentTimeEntrySyncTests(TestCase):
+    def setUp(self):
+        _, users = create_workspace(user_count=4)
+        self.entries_by_user = {user.user_id: [make_entry(f"{user.user_id}-e{i}", "p1", i) for i in range(5)] for user in users}
+
+    def test_sync_walks_pages_concurrently(self):
+        with StubClockify(self.entries_by_user) as stub:
+            client = ClockifyClient("test-key", base_url=stub.base_url, max_workers=4)
+            with self.settings(CLOCKIFY_PAGE_SIZE=2):
+                result = sync_clockify_time_entries(client=client)
+            client.close()
+
+        self.assertEqual(result, {"inserted": 20, "updated": 0, "unchanged": 0, "skipped": 0})
+        self.assertEqual(ClockifyTimeEntry.objects.count(), 20)
+        # 5 entries at 2 per page is 3 pages per user
+        self.assertEqual(len(stub.requests), 12)
+        self.assertGreater(stub.max_in_flight, 1)
+
+    def test_sync_advances_user_cursor(self):
+        with StubClockify(self.entries_by_user) as stub:
+            client = ClockifyClient("test-key", base_url=stub.base_url, max_workers=4)
+            sync_clockify_time_entries(client=client)
+        client.close()
+
+        user = ClockifyUsers.objects.get(user_id="u0")
+        self.assertIsNotNone(user.entries_synced_at)
+        self.assertEqual(user.entries_synced_until.hour, 4)
+
+    def test_throttled_requests_are_retried(self):
+        with StubClockify(self.entries_by_user, throttle_first=3) as stub:
+            client = ClockifyClient("test-key", base_url=stub.base_url, max_workers=4)
+            result = sync_clockify_time_entries(client=client)
+        client.close()
+
+        self.assertEqual(result["inserted"], 20)
+        self.assertEqual(len(stub.requests), 4 + 3)
+
+    def test_retry_budget_stops_retries(self):
+        with StubClockify(self.entries_by_user, throttle_first=100) as stub:
+            client = ClockifyClient("test-key", base_url=stub.base_url, max_workers=1, retry_budget=2)
+            result = sync_clockify_time_entries(client=client)
+        client.close()
+
+        self.assertEqual(result["inserted"], 0)
+        # One attempt per user plus the two budgeted retries
+        self.assertEqual(len(stub.requests), 4 + 2)
+        self.assertIsNone(ClockifyUsers.objects.get(user_id="u0").entries_synced_at)
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_sub_one_rate_still_serves_requests(self):
+        bucket = TokenBucket(0.5)  # One request every two seconds
+        self.assertEqual(bucket.capacity, 1)
+        started = time.monotonic()
+        bucket.acquire()
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertLess(bucket.tokens, 1)  # The next acquire() waits for a refill
+
+
+class SyncRunLockTests(TestCase):
+    def test_only_one_run_is_active(self):
+        first, created = queue_sync_run()
+        self.assertTrue(created)
+        second, created = queue_sync_run()
+        self.assertFalse(created)
+        self.assertEqual(second.pk, first.pk)
+
+    def test_trigger_endpoint_queues_then_conflicts(self):
+        with self.settings(CLOCKIFY_API_KEY="test-key"):
+            response = self.client.post(reverse("clockify_sync"))
+            self.assertEqual(response.status_code, 202)
+            response = self.client.post(reverse("clockify_sync"))
+            self.assertEqual(response.status_code, 409)
+
+        run_id = response.json()["id"]
+        response = self.client.get(reverse("clockify_sync_run", args=[run_id]))
+        self.assertEqual(response.json()["status"], "pending")
+
+    def test_failed_run_releases_lock(self):
+        run, _ = queue_sync_run()
+        self.assertTrue(claim_run(run))
+        with self.settings(CLOCKIFY_API_KEY=None):
+            execute_run(run)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, "failed")
+        self.assertFalse(run.active)
+        self.assertIsNotNone(run.duration_seconds)
+        _, created = queue_sync_run()
+        self.assertTrue(created)
+
+
+class DurationTotalsTests(TestCase):
+    def test_totals_are_grouped_in_sql(self):
+        project, (user,) = create_workspace()
+        for entry_id, duration, seconds in [("a", "PT1H30M", 5400), ("b", "PT30M", 1800)]:
+            ClockifyTimeEntry.objects.create(time_entry_id=entry_id, user=user, project=project, duration=duration, duration_seconds=seconds)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("clockify_time_entry_totals"), {"by": "project"})
+        self.assertEqual(response.json(), [{"project_id": project.pk, "project__name": "Project", "total_seconds": 7200, "entry_count": 2}])
+
+
+class DailySummaryTests(TestCase):
+    def setUp(self):
+        self.project, (self.user,) = create_workspace()
+
+    def values(self, start, seconds):
+        return {
+            "user_id": self.user.pk, "project_id": self.project.pk, "description": "", "start": start,
+            "end": None, "duration": f"PT{seconds}S", "duration_seconds": seconds,
+        }
+
+    def test_upsert_keeps_summary_in_step(self):
+        day1 = datetime(2025, 1, 1, 9, tzinfo=dt_timezone.utc)
+        day2 = datetime(2025, 1, 2, 9, tzinfo=dt_timezone.utc)
+        upsert_time_entries({"a": self.values(day1, 600), "b": self.values(day1, 300)})
+        summary = ClockifyDailySummary.objects.get()
+        self.assertEqual((summary.day, summary.total_seconds, summary.entry_count), (date(2025, 1, 1), 900, 2))
+
+        # Moving both entries to another day removes the old row
+        upsert_time_entries({"a": self.values(day2, 600), "b": self.values(day2, 300)})
+        self.assertEqual(list(ClockifyDailySummary.objects.values_list("day", "total_seconds")), [(date(2025, 1, 2), 900)])
+
+        ClockifyDailySummary.objects.all().delete()
+        self.assertEqual(rebuild_daily_summaries(), 1)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        project, (user,) = create_workspace()
+        ClockifyTimeEntry.objects.bulk_create([
+            ClockifyTimeEntry(time_entry_id=f"e{i}", user=user, project=project, duration="PT1M", duration_seconds=60)
+            for i in range(3)
+        ])
+
+    def test_ndjson_export_streams_one_object_per_line(self):
+        response = self.client.get(reverse("clockify_time_entries_export"))
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], ["e2", "e1", "e0"])
+        self.assertEqual(json.loads(lines[0])["user"], "User 0")
+
+    def test_csv_export_has_header(self):
+        response = self.client.get(reverse("clockify_time_entries_export"), {"format": "csv"})
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0], "id,user,project,description,start,end,duration,duration_seconds")
+        self.assertEqual(len(rows), 4)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(reverse("clockify_time_entries_export"), {"format": "xml"})
+        self.assertEqual(response.status_code, 404)
+
+
+class ApiQueryCountTests(TestCase):
+    """
+    Each list endpoint must cost the same number of queries whatever the result size.
+    """
+
+    def create_rows(self, count):
+        workspace = ClockifyWorkspace.objects.create(workspace_id=f"ws{count}", name=f"Workspace {count}")
+        for n in range(count):
+            project = ClockifyProjects.objects.create(project_id=f"p{count}-{n}", name=f"Project {n}", workspace=workspace)
+            user = ClockifyUsers.objects.create(user_id=f"u{count}-{n}", name=f"User {n}", email=f"u{n}@example.com", workspace=workspace)
+            ClockifyTimeEntry.objects.create(
+                time_entry_id=f"e{count}-{n}", user=user, project=project,
+                start=datetime(2025, 1, 1, 9, tzinfo=dt_timezone.utc), duration="PT1H", duration_seconds=3600,
+            )
+
+    def assert_constant_queries(self, url_name):
+        self.create_rows(1)
+        with self.assertNumQueries(1):
+            small = self.client.get(reverse(url_name)).json()
+
+        self.create_rows(20)
+        with self.assertNumQueries(1):
+            large = self.client.get(reverse(url_name)).json()
+        self.assertEqual((len(small), len(large)), (1, 21))
+        return large
+
+    def test_users_endpoint(self):
+        rows = self.assert_constant_queries("clockify_all_users")
+        self.assertEqual(set(rows[0]), {"workspace", "user_id", "name", "email"})
+
+    def test_projects_endpoint(self):
+        rows = self.assert_constant_queries("clockify_projects_list")
+        self.assertEqual(set(rows[0]), {"workspace", "project_id", "name"})
+
+    def test_time_entries_endpoint(self):
+        rows = self.assert_constant_queries("clockify_time_entries")
+        self.assertEqual(rows[0]["user"], "User 19")
+        self.assertEqual(rows[0]["start"], "Jan 01, 2025 09:00 AM")
+
+
+class ReportsPaginationTests(TestCase):
+    def setUp(self):
+        project, (user,) = create_workspace()
+        ClockifyTimeEntry.objects.bulk_create([
+            ClockifyTimeEntry(
+                time_entry_id=f"e{i}", user=user, project=project, duration="PT1M", duration_seconds=60,
+                start=datetime(2025, 1, 1, 9, i, tzinfo=dt_timezone.utc),
+            )
+            for i in range(60)
+        ])
+        admin = get_user_model().objects.create_user(username="admin", password="x", role="admin")
+        self.client.force_login(admin)
+
+    def test_cursor_walks_every_entry_once(self):
+        seen, cursor = [], None
+        while True:
+            response = self.client.get(reverse("dashboard:clockify_reports"), {"cursor": cursor} if cursor else {})
+            page = response.context["page"]
+            seen += [entry.time_entry_id for entry in page]
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(len(seen), 60)
+        self.assertEqual(len(set(seen)), 60)
+
+    def test_forged_cursors_fall_back_to_first_page(self):
+        for cursor in ["not-base64!", encode_cursor("next", "abc", 1), encode_cursor("next", [1], 1), encode_cursor("next", None, 1)]:
+            response = self.client.get(reverse("dashboard:clockify_reports"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["page"].object_list[0].time_entry_id, "e59")
@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path('workspaces/', include('clockify_integration.workspace_urls')),
+    path('sync/', views.ClockifySyncAPIView.as_view(), name='clockify_sync'),
+    path('sync/<int:pk>/', views.ClockifySyncRunDetailAPIView.as_view(), name='clockify_sync_run'),
 ]
\ No newline at end of file
@@ -1,98 +1,170 @@
-from django.shortcuts import render
+import csv
+from itertools import chain
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.shortcuts import render, get_object_or_404
 from django.conf import settings
+from rest_framework.renderers import BaseRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .services import sync_clockify_workspaces, sync_clockify_users, sync_clockify_projects, sync_clockify_time_entries 
-from .serializers import ClockifyWorkspaceSerializer, ClockifyUserSerializer, ClockifyProjectSerializer, ClockifyTimeEntrySerializer
-from django.utils import timezone
+from .jobs import queue_sync_run
+from .reports import TOTAL_GROUPINGS, duration_totals
+from .serializers import ClockifyWorkspaceSerializer, ClockifyUserSerializer, ClockifyProjectSerializer, ClockifyTimeEntrySerializer, SyncRunSerializer
+from .models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry, SyncRun
 
 class ClockifyWorkspaceListAPIView(APIView):
     """
-    Fetch workspaces from Clockify API, save/update in DB, and return name/timezone list.
+    Return synced workspaces from the DB. Use ClockifySyncAPIView to refresh them.
     """
     def get(self, request):
-        api_key = settings.CLOCKIFY_API_KEY
-        if not api_key:
-            return Response({"error": "API key is required in settings."}, status=status.HTTP_400_BAD_REQUEST)
-
-        workspaces = sync_clockify_workspaces()
-
-        if isinstance(workspaces, dict) and workspaces.get("error"):
-            return Response(workspaces, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
+        workspaces = ClockifyWorkspace.objects.all()
         serializer = ClockifyWorkspaceSerializer(workspaces, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
 class ClockifyAllUsersAPIView(APIView):
     """
-    Fetch users from all Clockify workspaces, save/update them in DB, and return list.
+    Return synced users from all Clockify workspaces.
     """
     def get(self, request):
-        users = sync_clockify_users()
-
-        if isinstance(users, dict) and users.get("error"):
-            return Response(users, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Custom serializer response to include workspace name
-        data = [
-            {
-                "workspace": u.workspace.name if u.workspace else None,
-                "user_id": u.user_id,
-                "name": u.name,
-                "email": u.email,
-                
-            }
-            for u in users
-        ]
-
-        return Response(data, status=status.HTTP_200_OK)
+        # Workspace name is joined in the same query
+        users = ClockifyUsers.objects.select_related("workspace").only("user_id", "name", "email", "workspace__name")
+        serializer = ClockifyUserSerializer(users, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 class ClockifyProjectsListAPIView(APIView):
     """
-    Fetch projects from all Clockify workspaces, save/update them in DB, and return list.
+    Return synced projects from all Clockify workspaces.
     """
     def get(self, request):
-        projects = sync_clockify_projects()
-
-        if isinstance(projects, dict) and projects.get("error"):
-            return Response(projects, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Serialize manually since each project has workspace info
-        data = [
-            {
-                "workspace": p.workspace.name if p.workspace else None,
-                "project_id": p.project_id,
-                "name": p.name,
-                
-            }
-            for p in projects
-        ]
-
-        return Response(data, status=status.HTTP_200_OK)
+        projects = ClockifyProjects.objects.select_related("workspace").only("project_id", "name", "workspace__name")
+        serializer = ClockifyProjectSerializer(projects, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
     
 class ClockifyTimeEntriesAPIView(APIView):
     def get(self, request):
-        entries = sorted(sync_clockify_time_entries(), key=lambda e: e.id, reverse=True)
-
-        if isinstance(entries, dict) and entries.get("error"):
-            return Response(entries, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        data = []
-        for e in entries:
-            # Localize and format start/end times
-            start = e.start.astimezone(timezone.get_current_timezone()).strftime("%b %d, %Y %I:%M %p") if e.start else None
-            end = e.end.astimezone(timezone.get_current_timezone()).strftime("%b %d, %Y %I:%M %p") if e.end else None
-
-            data.append({
-                "id": e.time_entry_id,
-                "user": e.user.name if e.user else None,
-                "project": e.project.name if e.project else None,
-                "description": e.description,
-                "start": start,
-                "end": end,
-                "duration": e.duration,
-            })
-
-        return Response(data, status=status.HTTP_200_OK)
-    
+        # Newest synced entries first; user and project names are joined in the same query
+        entries = (
+            ClockifyTimeEntry.objects.select_related("user", "project")
+            .only("time_entry_id", "description", "start", "end", "duration", "duration_seconds", "user__name", "project__name")
+            .order_by("-id")
+        )
+        serializer = ClockifyTimeEntrySerializer(entries, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ClockifySyncAPIView(APIView):
+    """
+    GET: status of the latest sync run.
+    POST: queue a background sync ({"full": true} walks full history).
+    Runs are executed by `manage.py clockify_sync`; only one can be active at a time.
+    """
+    def get(self, request):
+        run = SyncRun.objects.first()
+        if run is None:
+            return Response({"detail": "No sync has run yet."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(SyncRunSerializer(run).data, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        if not settings.CLOCKIFY_API_KEY:
+            return Response({"error": "API key is required in settings."}, status=status.HTTP_400_BAD_REQUEST)
+
+        run, created = queue_sync_run(full=bool(request.data.get("full")))
+        code = status.HTTP_202_ACCEPTED if created else status.HTTP_409_CONFLICT
+        return Response(SyncRunSerializer(run).data, status=code)
+
+
+class ClockifySyncRunDetailAPIView(APIView):
+    """
+    Poll a single sync run by id.
+    """
+    def get(self, request, pk):
+        run = get_object_or_404(SyncRun, pk=pk)
+        return Response(SyncRunSerializer(run).data, status=status.HTTP_200_OK)
+
+
+class ClockifyTimeEntryTotalsAPIView(APIView):
+    """
+    Total tracked seconds grouped by ?by=user|project|day (default user),
+    computed in the database.
+    """
+    def get(self, request):
+        by = request.query_params.get("by", "user")
+        if by not in TOTAL_GROUPINGS:
+            return Response({"error": f"'by' must be one of: {', '.join(TOTAL_GROUPINGS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = duration_totals(ClockifyTimeEntry.objects.all(), by)
+        return Response(list(rows), status=status.HTTP_200_OK)
+
+
+# Columns streamed by ClockifyTimeEntryExportAPIView, in output order
+EXPORT_FIELDS = {
+    "id": "time_entry_id",
+    "user": "user__name",
+    "project": "project__name",
+    "description": "description",
+    "start": "start",
+    "end": "end",
+    "duration": "duration",
+    "duration_seconds": "duration_seconds",
+}
+
+
+class Echo:
+    """
+    File-like object whose write() just returns the value, so csv.writer
+    rows can be yielded straight into a StreamingHttpResponse.
+    """
+    def write(self, value):
+        return value
+
+
+class ExportRenderer(BaseRenderer):
+    """
+    Negotiates an export format. The export body is streamed by the view; only
+    error responses (e.g. an unknown ?format=) are rendered here, as JSON.
+    """
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"" if data is None else DjangoJSONEncoder().encode(data).encode()
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class ClockifyTimeEntryExportAPIView(APIView):
+    """
+    Stream every time entry as NDJSON (default) or CSV (?format=csv).
+    Rows come from a values() iterator in chunks, so memory stays flat and
+    the first bytes go out before the whole table is read.
+    """
+    # Only used for content negotiation (?format= / Accept); the view streams its own body
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        export_format = request.accepted_renderer.format
+        rows = (
+            ClockifyTimeEntry.objects.order_by("-id")
+            .values_list(*EXPORT_FIELDS.values())
+            .iterator(chunk_size=settings.CLOCKIFY_EXPORT_CHUNK_SIZE)
+        )
+        columns = list(EXPORT_FIELDS)
+
+        if export_format == "csv":
+            writer = csv.writer(Echo())
+            lines = chain([writer.writerow(columns)], (writer.writerow(row) for row in rows))
+        else:
+            encoder = DjangoJSONEncoder()
+            lines = (encoder.encode(dict(zip(columns, row))) + "\n" for row in rows)
+
+        response = StreamingHttpResponse(lines, content_type=request.accepted_renderer.media_type)
+        response["Content-Disposition"] = f'attachment; filename="clockify_time_entries.{export_format}"'
+        return response
@@ -4,6 +4,8 @@ from .views import (
     ClockifyAllUsersAPIView,
     ClockifyProjectsListAPIView,
     ClockifyTimeEntriesAPIView,
+    ClockifyTimeEntryTotalsAPIView,
+    ClockifyTimeEntryExportAPIView,
 )
 
 urlpatterns = [
@@ -11,4 +13,6 @@ urlpatterns = [
     path('users/', ClockifyAllUsersAPIView.as_view(), name='clockify_all_users'),
     path('projects/', ClockifyProjectsListAPIView.as_view(), name='clockify_projects_list'),
     path('time_entries/', ClockifyTimeEntriesAPIView.as_view(), name='clockify_time_entries'),
+    path('time_entries/export/', ClockifyTimeEntryExportAPIView.as_view(), name='clockify_time_entries_export'),
+    path('time_entries/totals/', ClockifyTimeEntryTotalsAPIView.as_view(), name='clockify_time_entry_totals'),
 ]
\ No newline at end of file
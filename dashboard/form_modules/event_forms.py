@@ -1,5 +1,7 @@
 from django import forms  # Django form utilities
+import os  # Check the renamed event's folder
 from event.models import Event  # Event model
+from event.consistency import event_folder_path  # Where an event's filters live
 
 # 📁 Form for editing Event name and year (admin/senior only)
 class EventForm(forms.ModelForm):
@@ -11,6 +13,10 @@ class EventForm(forms.ModelForm):
         name = self.cleaned_data['name']
         if Event.objects.exclude(id=self.instance.id).filter(name=name).exists():
             raise forms.ValidationError("Event name must be unique.")
+        # A rename moves the event's folder; it cannot land on another non-empty one
+        folder = event_folder_path(name)
+        if self.instance.pk and folder != event_folder_path(self.instance.name) and os.path.isdir(folder) and os.listdir(folder):
+            raise forms.ValidationError("A folder with this name already exists in filter storage.")
         return name
 
     def clean_year(self):
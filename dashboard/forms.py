@@ -4,6 +4,7 @@ from django import forms  # Django form utilities
 from users.models import CustomUser  # Custom user model (if used elsewhere)
 from django.contrib.auth import get_user_model  # Dynamic user model retrieval
 from event.models import Event, Filter  # Importing related models
+from clockify_integration.models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects  # Report filter choices
 
 User = get_user_model()  # Ensures compatibility with custom user models
 
@@ -41,6 +42,27 @@ class FilterUploadForm(forms.ModelForm):
         fields = ['name', 'file']  # Adjust based on your Filter model
 
 
+# 📦 Several .xmp files and/or ZIP packs in one upload
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', MultipleFileInput(attrs={'accept': '.xmp,.zip'}))
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        single_clean = super().clean
+        if isinstance(data, (list, tuple)) and data:
+            return [single_clean(d, initial) for d in data]
+        return [single_clean(data or None, initial)]  # No files: the usual "required" error
+
+
+class FilterBatchUploadForm(forms.Form):
+    files = MultipleFileField(label='Filter files (.xmp) or ZIP packs')
+
+
 # 🧩 Form for editing user details (admin-only)
 class UserEditForm(forms.ModelForm):
     class Meta:
@@ -59,3 +81,26 @@ class RoleUpdateForm(forms.ModelForm):
                 ('junior', 'Junior'),
             ])  # 📋 Dropdown for selecting role
         }
+
+
+# ⏱️ Filters for the Clockify reports page (all optional)
+class ClockifyReportFilterForm(forms.Form):
+    workspace = forms.ModelChoiceField(queryset=ClockifyWorkspace.objects.all(), required=False)
+    user = forms.ModelChoiceField(queryset=ClockifyUsers.objects.select_related('workspace').order_by('name'), required=False)
+    project = forms.ModelChoiceField(queryset=ClockifyProjects.objects.select_related('workspace').order_by('name'), required=False)
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+
+
+# 🎚️ Search presets by a develop setting range and/or camera profile
+class PresetSearchForm(forms.Form):
+    setting = forms.CharField(required=False, label="Setting")  # e.g. Exposure2012
+    min_value = forms.FloatField(required=False, label="Min")
+    max_value = forms.FloatField(required=False, label="Max")
+    profile = forms.CharField(required=False, label="Camera Profile")
+
+    def clean(self):
+        cleaned = super().clean()
+        if (cleaned.get('min_value') is not None or cleaned.get('max_value') is not None) and not cleaned.get('setting'):
+            raise forms.ValidationError("Choose a setting to apply the range to.")
+        return cleaned
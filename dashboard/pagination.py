@@ -0,0 +1,140 @@
+import base64
+import json
+from datetime import datetime
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+
+# -------------------------------------------------------------------
+# Keyset (seek) pagination
+# Pages are addressed by an opaque cursor holding the sort key and pk of
+# the boundary row, so every page costs one indexed range query with no
+# OFFSET and no COUNT(*).
+# -------------------------------------------------------------------
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(direction, key_value, pk):
+    payload = json.dumps([direction, key_value, pk], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Return (direction, key_value, pk), or None for a missing or tampered cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, key_value, pk = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        return None
+    if direction not in ("next", "prev") or not isinstance(pk, int) or isinstance(pk, bool):
+        return None
+    return direction, key_value, pk
+
+
+def _row_value(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def _coerce_cursor(queryset, key, decoded):
+    # Cursors are client-supplied: convert the key back to the field's type so a
+    # forged or stale value cannot reach the query as a bad lookup argument
+    direction, key_value, pk = decoded
+    try:
+        field = queryset.model._meta.get_field(key)
+        key_value = field.to_python(key_value)
+    except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+        return None
+    if key_value is None:
+        return None
+    if isinstance(key_value, datetime) and timezone.is_naive(key_value):
+        key_value = timezone.make_aware(key_value)
+    return direction, key_value, pk
+
+
+def keyset_paginate(queryset, key, cursor=None, per_page=25):
+    """
+    Paginate `queryset` newest-first on (key, pk).
+    `key` must be a non-null model field and should be indexed together with
+    any filter columns. Works with model and values() querysets (include "pk"
+    in values() for the latter). A cursor that does not decode to the key's
+    type is ignored and the first page is returned.
+    """
+    decoded = decode_cursor(cursor)
+    if decoded:
+        decoded = _coerce_cursor(queryset, key, decoded)
+
+    if decoded and decoded[0] == "prev":
+        # Walk backwards in ascending order, then flip the page
+        _, key_value, pk = decoded
+        rows = list(
+            queryset.filter(Q(**{f"{key}__gt": key_value}) | Q(**{key: key_value, "pk__gt": pk}))
+            .order_by(key, "pk")[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if decoded:
+            _, key_value, pk = decoded
+            queryset = queryset.filter(Q(**{f"{key}__lt": key_value}) | Q(**{key: key_value, "pk__lt": pk}))
+        rows = list(queryset.order_by(f"-{key}", "-pk")[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = decoded is not None
+
+    if not rows:
+        return KeysetPage(rows)
+
+    first, last = rows[0], rows[-1]
+    next_cursor = encode_cursor("next", _row_value(last, key), _row_value(last, "pk")) if has_next else None
+    previous_cursor = encode_cursor("prev", _row_value(first, key), _row_value(first, "pk")) if has_previous else None
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def approximate_count(queryset, cap=1000):
+    """
+    A cheap total for keyset pages. Returns (count, exact).
+    PostgreSQL answers from the planner's row estimate; other backends count
+    at most `cap` rows, so the cost stays bounded however large the set is.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), False
+
+    count = queryset.order_by().values("pk")[:cap + 1].count()
+    return min(count, cap), count <= cap
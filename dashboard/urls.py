@@ -5,14 +5,18 @@ from dashboard.view_modules.user_views import (
     view_forgot_password_requests, mark_forgot_password_handled
 )
 from dashboard.view_modules.event_views import edit_event, delete_event
-from dashboard.view_modules.filter_views import delete_filter
-from dashboard.view_modules.clockify_views import ClockifyReportsView
+from dashboard.view_modules.filter_views import (
+    delete_filter, search_presets, download_event_filters, download_filter, upload_filters_batch
+)
+from dashboard.view_modules.search_views import unified_search, event_typeahead
+from dashboard.view_modules.clockify_views import ClockifyReportsView, clockify_daily_summary, clockify_user_report
 from .views import view_users_by_role
 
 app_name = 'dashboard'
 
 urlpatterns = [
     path('', views.dashboard_redirect, name='redirect'),
+    path('search/', unified_search, name='search'),
 
     path('dashboard/', include([
         path('', views.admin_home, name='admin_home'),
@@ -33,14 +37,19 @@ urlpatterns = [
     path('events/', include([
         path('', views.event_folder_list, name='event_folder_list'),
         path('create/', views.create_event, name='create_event'),
+        path('autocomplete/', event_typeahead, name='event_typeahead'),
         path('<int:event_id>/filters/', views.event_filters, name='event_filters'),
+        path('<int:event_id>/filters/download/', download_event_filters, name='download_event_filters'),
         path('<int:event_id>/upload-filter/', views.upload_filter, name='upload_filter'),
+        path('<int:event_id>/upload-filters/', upload_filters_batch, name='upload_filters_batch'),
         path('edit/<int:event_id>/', edit_event, name='edit_event'),
         path('delete/<int:event_id>/', delete_event, name='delete_event'),
     ])),
 
     path('filters/', include([
+        path('<int:filter_id>/download/', download_filter, name='download_filter'),
         path('delete/<int:filter_id>/', delete_filter, name='delete_filter'),
+        path('search/', search_presets, name='search_presets'),
     ])),
 
     path('forgot-password-requests/', include([
@@ -49,7 +58,9 @@ urlpatterns = [
     ])),
 
     path('clockify/', include([
-        path('', views.ClockifyReportsView, name='clockify_reports'),
+        path('', ClockifyReportsView, name='clockify_reports'),
+        path('daily-summary/', clockify_daily_summary, name='clockify_daily_summary'),
+        path('user-report/', clockify_user_report, name='clockify_user_report'),
         path('', include('clockify_integration.urls')),
     ])),
 
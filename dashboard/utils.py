@@ -1,3 +1,5 @@
+import time  # Cache generation tokens
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied  # 🚫 Raise error if unauthorized
 
 # 🔐 Utility function to check if user is an admin
@@ -21,3 +23,25 @@ def admin_or_senior_required(view_func):
         return view_func(request, *args, **kwargs)
     return wrapper
 
+
+
+# 🔁 Generation-token caching: cached entries embed the current token of their
+# family in their keys, and bumping the token retires them all at once without
+# knowing the keys. Shared by the event typeahead and editor analytics caches.
+def cache_generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(key, generation, None)
+        generation = cache.get(key, generation)  # Another worker may have added it first
+    return generation
+
+
+def bump_cache_generation(key):
+    cache.set(key, time.time_ns(), None)
+
+
+# ⏱️ Render a number of seconds as H:MM:SS (hours are not wrapped at 24)
+def format_seconds(seconds):
+    seconds = int(seconds or 0)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
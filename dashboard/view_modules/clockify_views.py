@@ -1,20 +1,115 @@
+from datetime import datetime, time, timedelta
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Sum
 from django.shortcuts import render
-from clockify_integration.models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry
+from django.utils import timezone
+from clockify_integration.models import ClockifyUsers, ClockifyTimeEntry, ClockifyDailySummary
+from dashboard.utils import format_seconds
+from dashboard.forms import ClockifyReportFilterForm
+from dashboard.pagination import keyset_paginate
 from dashboard.utils import admin_required
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+REPORT_PAGE_SIZE = 50
 
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# ⏱️ Clockify time entries, filtered and keyset-paginated (admin only)
 @admin_required
 def ClockifyReportsView(request):
+    form = ClockifyReportFilterForm(request.GET or None)
+    entries = ClockifyTimeEntry.objects.filter(start__isnull=False)
+
+    if form.is_valid():
+        data = form.cleaned_data
+        if data['workspace']:
+            entries = entries.filter(user__workspace=data['workspace'])
+        if data['user']:
+            entries = entries.filter(user=data['user'])
+        if data['project']:
+            entries = entries.filter(project=data['project'])
+        # Compare against datetimes (not start__date) so the (user/project, start) indexes apply
+        if data['date_from']:
+            entries = entries.filter(start__gte=_start_of_day(data['date_from']))
+        if data['date_to']:
+            entries = entries.filter(start__lt=_start_of_day(data['date_to'] + timedelta(days=1)))
 
-     # Fetch all time entries with related user, project, and workspace
-    entries = ClockifyTimeEntry.objects.select_related(
-        'user', 'project', 'user__workspace', 'project__workspace', 'updated_at'
-    ).order_by('-updated_at')
+    page = keyset_paginate(
+        entries.select_related('user', 'project', 'user__workspace'),
+        'start',
+        cursor=request.GET.get('cursor'),
+        per_page=REPORT_PAGE_SIZE,
+    )
+
+    # Page totals in one aggregate query over the page's rows
+    totals = ClockifyTimeEntry.objects.filter(pk__in=[e.pk for e in page]).aggregate(
+        entry_count=Count('id'),
+        total_seconds=Sum('duration_seconds'),
+    )
+    totals['total_duration'] = timedelta(seconds=totals['total_seconds']) if totals['total_seconds'] else None
+
+    # Preserve filters in pagination links
+    query = request.GET.copy()
+    query.pop('cursor', None)
 
     context = {
-        'entries': entries
+        'form': form,
+        'entries': page,
+        'page': page,
+        'totals': totals,
+        'filter_query': query.urlencode(),
     }
-    return render(request, 'dashboard/clockify/clockify_reports.html', context)
\ No newline at end of file
+    return render(request, 'dashboard/clockify/clockify_reports.html', context)
+
+
+def _user_day_totals(request, summaries):
+    """
+    Collapse daily summary rows (user x project x day) to one row per user per day
+    and paginate them, formatting durations for the page only.
+    """
+    rows = (
+        summaries.values('user_id', 'day')
+        .annotate(
+            user_name=F('user__name'),
+            email=F('user__email'),
+            workspace=F('user__workspace__name'),
+            total_seconds=Sum('total_seconds'),
+            entry_count=Sum('entry_count'),
+        )
+        .order_by('-day', 'user_name')
+    )
+    page_obj = Paginator(rows, REPORT_PAGE_SIZE).get_page(request.GET.get('page'))
+    for row in page_obj:
+        row['formatted_duration'] = format_seconds(row['total_seconds'])
+    return page_obj
+
+
+# 📅 Total tracked time per user per day, served from the daily summary rollup (admin only)
+@admin_required
+def clockify_daily_summary(request):
+    page_obj = _user_day_totals(request, ClockifyDailySummary.objects.all())
+    return render(request, 'dashboard/clockify/daily_summary.html', {'entries': page_obj, 'page_obj': page_obj})
+
+
+# 👤 Per-user daily report, optionally for one Clockify user (admin only)
+@admin_required
+def clockify_user_report(request):
+    summaries = ClockifyDailySummary.objects.all()
+    selected_user = None
+    user_id = request.GET.get('user')
+    if user_id and user_id.isdigit():
+        selected_user = ClockifyUsers.objects.filter(pk=user_id).first()
+        summaries = summaries.filter(user_id=user_id)
+
+    page_obj = _user_day_totals(request, summaries)
+    return render(request, 'dashboard/clockify/clockify_user_report.html', {
+        'entries': page_obj,
+        'page_obj': page_obj,
+        'users': ClockifyUsers.objects.order_by('name').only('id', 'name'),
+        'selected_user': selected_user,
+    })
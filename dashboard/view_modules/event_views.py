@@ -3,6 +3,7 @@ from django.contrib import messages  # Add this import
 from dashboard.utils import admin_or_senior_required
 from dashboard.form_modules.event_forms import EventForm
 from event.models import Event
+from event.archive import invalidate_event_archive
 
 
 
@@ -12,9 +13,15 @@ def edit_event(request, event_id):
     event = get_object_or_404(Event, id=event_id)
     form = EventForm(request.POST or None, instance=event)
     if form.is_valid():
-        form.save()
-        messages.success(request, f'Event "{event.name}" was successfully updated.')
-        return redirect('dashboard:event_folder_list')
+        try:
+            form.save()
+        except OSError:
+            # The folder move failed (e.g. the target appeared meanwhile); nothing was saved
+            event.refresh_from_db(fields=['name'])
+            form.add_error('name', "The event folder could not be renamed. Choose another name.")
+        else:
+            messages.success(request, f'Event "{event.name}" was successfully updated.')
+            return redirect('dashboard:event_folder_list')
     return render(request, 'dashboard/events/edit_event.html', {'form': form, 'event': event})
 
 
@@ -25,6 +32,7 @@ def delete_event(request, event_id):
 
     if request.method == 'POST':
         event_name = event.name  # Store name before deletion
+        invalidate_event_archive(event)
         event.delete()
         messages.success(request, f'Event "{event_name}" was successfully deleted.')
         return redirect('dashboard:event_folder_list')
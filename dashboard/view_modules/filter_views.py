@@ -1,7 +1,20 @@
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages  # Add this import
 from dashboard.utils import admin_or_senior_required
-from event.models import Filter
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from dashboard.forms import FilterBatchUploadForm, PresetSearchForm
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import content_disposition_header
+from event.archive import archive_cache_path, archive_fingerprint, invalidate_event_archive, stream_filters_zip
+from event.models import Event, Filter, FilterSetting
+from event.serving import serve_media
+from event.uploads import batch_create_filters
+import os
+from event.xmp import filters_matching_settings
 
 
 # 🗑️ Delete filter (admin/senior only)
@@ -13,8 +26,110 @@ def delete_filter(request, filter_id):
         filter_name = filter_obj.name  # Store name before deletion
         event_id = filter_obj.event.id  # Store event_id before deletion
         filter_obj.delete()
+        invalidate_event_archive(filter_obj.event)
         messages.success(request, f'Filter "{filter_name}" was successfully deleted.')
         return redirect('dashboard:event_filters', event_id=event_id)
 
     return render(request, 'dashboard/filters/delete_filter.html', {'filter': filter_obj})
 
+
+# 🔎 Search presets by parsed develop settings (all logged-in users)
+@login_required
+def search_presets(request):
+    form = PresetSearchForm(request.GET or None)
+    results = None
+
+    if form.is_valid() and any(form.cleaned_data.values()):
+        data = form.cleaned_data
+        ranges = {}
+        if data['setting']:
+            ranges[data['setting']] = (data['min_value'], data['max_value'])
+        filters = filters_matching_settings(
+            Filter.objects.select_related('event').order_by('event__name', 'name'),
+            ranges=ranges,
+            profile=data['profile'],
+        )
+        results = Paginator(filters, 25).get_page(request.GET.get('page'))
+
+    # Preserve the search in pagination links
+    query = request.GET.copy()
+    query.pop('page', None)
+
+    return render(request, 'dashboard/filters/search_presets.html', {
+        'form': form,
+        'results': results,
+        'setting_keys': FilterSetting.objects.values_list('key', flat=True).distinct().order_by('key'),
+        'search_query': query.urlencode(),
+    })
+
+
+# 📦 Download an event's filters as one ZIP (roles in FILTER_DOWNLOAD_ROLES)
+# ?ids=1,2,3 limits it to a subset. Full-event archives are cached on disk
+# keyed by their content fingerprint, which doubles as the ETag.
+@login_required
+def download_event_filters(request, event_id):
+    if request.user.role not in settings.FILTER_DOWNLOAD_ROLES:
+        raise PermissionDenied
+    event = get_object_or_404(Event, id=event_id)
+    filters = event.filters.order_by('name')
+
+    # Accepts ?ids=1,2,3 or repeated ?ids=1&ids=2 (checkbox form)
+    ids = [i for value in request.GET.getlist('ids') for i in value.split(',') if i.isdigit()]
+    if ids:
+        filters = filters.filter(id__in=ids)
+
+    fingerprint = archive_fingerprint(filters)
+    etag = f'"{fingerprint}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        return HttpResponseNotModified(headers={'ETag': etag})
+
+    filename = f"{event.name.replace(' ', '_')}_filters.zip"
+    cache_path = None if ids else archive_cache_path(event, fingerprint)
+
+    if cache_path and os.path.exists(cache_path):
+        name = os.path.relpath(cache_path, settings.MEDIA_ROOT)
+        return serve_media(request, name, etag=fingerprint, filename=filename, content_type='application/zip')
+
+    response = StreamingHttpResponse(stream_filters_zip(filters, cache_path), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, filename)  # Same header as the cached copy
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)  # Always revalidate; 304 when unchanged
+    return response
+
+
+# ⬇️ Download a single filter file (roles in FILTER_DOWNLOAD_ROLES)
+# The content digest is a strong ETag, so unchanged files revalidate with a 304.
+@login_required
+def download_filter(request, filter_id):
+    if request.user.role not in settings.FILTER_DOWNLOAD_ROLES:
+        raise PermissionDenied
+    filter_obj = get_object_or_404(Filter.objects.only('file', 'sha256'), id=filter_id)
+    return serve_media(request, filter_obj.file.name, etag=filter_obj.sha256 or None)
+
+
+# 📦 Upload many filters at once: several .xmp files and/or ZIP packs (admin/senior only)
+# Returns a per-file report; fetch()/XHR clients asking for JSON get it as JSON.
+@admin_or_senior_required
+def upload_filters_batch(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    report = None
+
+    if request.method == 'POST':
+        form = FilterBatchUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            report = batch_create_filters(event, form.cleaned_data['files'])
+            created = sum(1 for row in report if row['status'] == 'created')
+
+            if 'application/json' in request.headers.get('Accept', ''):
+                return JsonResponse({'created': created, 'results': report}, status=201 if created else 200)
+            messages.success(request, f"✅ {created} of {len(report)} filters uploaded.")
+        elif 'application/json' in request.headers.get('Accept', ''):
+            return JsonResponse({'errors': form.errors}, status=400)
+    else:
+        form = FilterBatchUploadForm()
+
+    return render(request, 'dashboard/filters/upload_filters_batch.html', {
+        'form': form,
+        'event': event,
+        'report': report,
+    })
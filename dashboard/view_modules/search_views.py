@@ -0,0 +1,66 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
+from django.urls import reverse
+from event.models import Event, Filter
+from event.search import KINDS, search
+from event.typeahead import suggest_event_names, suggest_event_years
+
+SEARCH_LIMIT = 20
+
+
+# 🔍 Unified search over event names, filter names and tags (all logged-in users)
+# GET ?q=wed ven[&kind=event|filter][&limit=N] -> ranked, prefix-matching JSON results
+@login_required
+def unified_search(request):
+    query = request.GET.get('q', '')
+    kinds = [request.GET['kind']] if request.GET.get('kind') in KINDS else KINDS
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SEARCH_LIMIT)), 100))
+    except ValueError:
+        limit = SEARCH_LIMIT
+
+    hits = search(query, kinds=kinds, limit=limit)
+
+    # Load every hit with one query per kind
+    ids = {kind: [pk for hit_kind, pk, _ in hits if hit_kind == kind] for kind in KINDS}
+    events = Event.objects.only('id', 'name', 'year').in_bulk(ids['event'])
+    filters = (
+        Filter.objects.select_related('event')
+        .only('id', 'name', 'tags', 'event__id', 'event__name', 'event__year')
+        .in_bulk(ids['filter'])
+    )
+
+    results = []
+    for kind, pk, score in hits:
+        if kind == 'event' and pk in events:
+            event = events[pk]
+            results.append({
+                'type': 'event', 'id': pk, 'name': event.name, 'year': event.year, 'score': score,
+                'url': reverse('dashboard:event_filters', args=[pk]),
+            })
+        elif kind == 'filter' and pk in filters:
+            filter_obj = filters[pk]
+            results.append({
+                'type': 'filter', 'id': pk, 'name': filter_obj.name, 'tags': filter_obj.tags, 'score': score,
+                'event': filter_obj.event.name, 'year': filter_obj.event.year,
+                'url': reverse('dashboard:event_filters', args=[filter_obj.event_id]),
+                'download_url': reverse('dashboard:download_filter', args=[pk]),
+            })
+
+    return JsonResponse({'query': query, 'results': results})
+
+
+# ⌨️ Typeahead for the event search form (all logged-in users)
+# GET ?field=name&q=wed -> {"results": ["Wedding Venice", ...]}; ?field=year&q=20 -> years
+@login_required
+def event_typeahead(request):
+    query = request.GET.get('q', '')
+    if request.GET.get('field') == 'year':
+        results = suggest_event_years(query)
+    else:
+        results = suggest_event_names(query)
+
+    response = JsonResponse({'results': results})
+    patch_cache_control(response, private=True, max_age=60)
+    return response
@@ -6,6 +6,7 @@ from dashboard.utils import admin_required
 from django.contrib.auth.decorators import login_required, user_passes_test
 from dashboard.utils import is_admin
 from users.models import ForgotPasswordRequest  
+from django.db import transaction
 
 User = get_user_model()
 
@@ -17,7 +18,8 @@ def update_role(request, user_id):
     if request.method == "POST":
         form = RoleUpdateForm(request.POST, instance=user)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()  # Saving the user moves their editor logs to the new role (editors_log/signals.py)
             messages.success(request, f'Role for user "{user.username}" was successfully updated.')
             return redirect('dashboard:view_users_by_role', role=user.role)
     else:
@@ -1,10 +1,14 @@
 # dashboard/views.py
 from django.db.models import Q  # for complex queries
+from django.db.models import Count, Sum  # per-event preset counts and sizes
+from django.db.models.functions import Coalesce
 from django.contrib import messages  # for flash messages
 from django.shortcuts import render, redirect, get_object_or_404  # for rendering and redirects
 from django.contrib.auth.decorators import login_required, user_passes_test  # for access control
 from .forms import AdminUserCreationForm  # form for creating users
 from event.models import Event, Filter  # models for events and filters
+from event.archive import invalidate_event_archive  # drop cached ZIPs when filters change
+from event.search import matching_ids  # full-text event name search
 from dashboard.forms import EventForm  # form for creating events
 from dashboard.forms import FilterForm  # form for uploading filters
 from .forms import FilterUploadForm
@@ -12,8 +16,8 @@ from django.contrib.auth import get_user_model  # 🔄 Dynamically fetch the act
 from event.forms import EventSearchForm  # 🧾 Import search form from event app and handles search input from user
 from django.db.models import Q  # 🔍 Enables complex OR-based query filtering
 from dashboard.view_modules.user_views import edit_user, delete_user, update_role # Re-export modular views
+from dashboard.view_modules.clockify_views import ClockifyReportsView  # Re-export modular views
 from django.core.paginator import Paginator 
-from clockify_integration.models import ClockifyWorkspace, ClockifyUsers, ClockifyProjects, ClockifyTimeEntry
 
 
 User = get_user_model()  # 🎯 Reference the CustomUser model defined in the users app
@@ -124,10 +128,23 @@ def view_users_by_role(request, role):
         'search_query': search_query,  # Pass search query back to template
     })
 
+# Sort keys of the event list -> ORDER BY (ties broken by name)
+EVENT_SORTS = {
+    'name': ['name'],
+    'filters': ['filter_count', 'name'],
+    '-filters': ['-filter_count', 'name'],
+    'size': ['total_size', 'name'],
+    '-size': ['-total_size', 'name'],
+}
+
 # List all event folders with optional search
 def event_folder_list(request):
     form = EventSearchForm(request.GET or None)
-    events = Event.objects.all()
+    # Preset count and total size for every row in the same query as the page
+    events = Event.objects.annotate(
+        filter_count=Count('filters'),
+        total_size=Coalesce(Sum('filters__size_bytes'), 0),
+    ).order_by('-year', 'name')  # Meta.ordering is dropped from aggregate queries
 
     # Filter logic
     if form.is_valid():
@@ -135,13 +152,15 @@ def event_folder_list(request):
         year = form.cleaned_data.get('year')
 
         if name:
-            events = events.filter(name__icontains=name)
+            # Full-text prefix match via the search index instead of a LIKE scan
+            ids = matching_ids(name, 'event')
+            events = events.filter(id__in=ids) if ids is not None else events.none()
         if year:
             events = events.filter(year=year)
 
-    # Autocomplete data
-    name_list = Event.objects.values_list('name', flat=True).distinct()
-    year_list = Event.objects.values_list('year', flat=True).distinct()
+        sort = form.cleaned_data.get('sort')
+        if sort in EVENT_SORTS:
+            events = events.order_by(*EVENT_SORTS[sort])
 
     # Pagination - Add these lines
     paginator = Paginator(events, 10)  # Show 10 events per page
@@ -151,8 +170,6 @@ def event_folder_list(request):
     context = {
         'form': form,
         'events': events_page,  # Change this from events to events_page
-        'name_list': name_list,
-        'year_list': year_list,
     }
     return render(request, 'dashboard/event_folders.html', context)
 
@@ -205,6 +222,7 @@ def upload_filter(request, event_id):
                 new_filter = form.save(commit=False)
                 new_filter.event = event
                 new_filter.save()
+                invalidate_event_archive(event)
                 messages.success(request, f"✅ Filter '{filter_name}' uploaded successfully.")
                 return redirect('dashboard:event_filters', event_id=event.id)
 
@@ -215,17 +233,3 @@ def upload_filter(request, event_id):
         'form': form,
         'event': event
     })
-
-#clockify
-@user_passes_test(is_admin)
-def ClockifyReportsView(request):
-
-     # Fetch all time entries with related user, project, and workspace
-    entries = ClockifyTimeEntry.objects.select_related(
-        'user', 'project', 'user__workspace', 'project__workspace'
-    ).all()
-
-    context = {
-        'entries': entries
-    }
-    return render(request, 'dashboard/clockify/clockify_reports.html', context)
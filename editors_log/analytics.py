@@ -0,0 +1,84 @@
+from django.conf import settings  # Cache lifetime
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Sum
+from django.db.models.functions import TruncMonth
+from dashboard.utils import bump_cache_generation, cache_generation
+from .models import EditorLog
+
+GENERATION_KEY = 'editor-analytics:generation'
+
+# Columns each breakdown is grouped by
+GROUPINGS = {
+    'editor': ['user_id', 'username'],
+    'role': ['author_role'],
+    'event': ['event'],
+    'month': ['month_start'],
+}
+
+# Per-log counters that are totalled and averaged
+METRICS = ['clip', 'teamedit', 'indiedit', 'build', 'duration_seconds']
+
+
+# -------------------------------------------------------------------
+# Editor productivity analytics
+# Every breakdown is one GROUP BY over EditorLog with Sum/Avg per metric.
+# Results are cached per (date_from, date_to) period under a generation
+# token that any EditorLog change replaces (see editors_log/signals.py).
+# -------------------------------------------------------------------
+def invalidate_analytics():
+    bump_cache_generation(GENERATION_KEY)
+
+
+def log_totals(logs, by):
+    """
+    Group an EditorLog queryset by editor, role, event or month and return dict
+    rows with log_count plus total_<metric> and avg_<metric> (per log) for
+    every metric. Runs as a single GROUP BY query.
+    """
+    group = GROUPINGS[by]
+    if by == 'editor':
+        logs = logs.annotate(username=F('user__username'))
+    elif by == 'month':
+        logs = logs.annotate(month_start=TruncMonth('log_date'))
+
+    aggregates = {'log_count': Count('id')}
+    for metric in METRICS:
+        aggregates[f'total_{metric}'] = Sum(metric)
+        aggregates[f'avg_{metric}'] = Avg(metric)
+
+    ordering = group if by == 'month' else ['-total_duration_seconds', *group]
+    rows = list(logs.values(*group).annotate(**aggregates).order_by(*ordering))
+    for row in rows:
+        for key, value in row.items():
+            if key.startswith('avg_') and value is not None:
+                row[key] = round(value, 2)
+    return rows
+
+
+def period_analytics(date_from, date_to):
+    """
+    Every breakdown plus overall totals for logs dated date_from..date_to
+    (inclusive, either may be None), cached for EDITOR_ANALYTICS_CACHE_SECONDS.
+    """
+    key = f'editor-analytics:{cache_generation(GENERATION_KEY)}:{date_from or ""}:{date_to or ""}'
+
+    def compute():
+        logs = EditorLog.objects.all()
+        if date_from:
+            logs = logs.filter(log_date__gte=date_from)
+        if date_to:
+            logs = logs.filter(log_date__lte=date_to)
+
+        overall = logs.aggregate(
+            log_count=Count('id'),
+            **{f'total_{metric}': Sum(metric) for metric in METRICS},
+            **{f'avg_{metric}': Avg(metric) for metric in METRICS},
+        )
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'overall': {k: round(v, 2) if k.startswith('avg_') and v is not None else v for k, v in overall.items()},
+            **{by: log_totals(logs, by) for by in GROUPINGS},
+        }
+
+    return cache.get_or_set(key, compute, settings.EDITOR_ANALYTICS_CACHE_SECONDS)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EditorsLogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'editors_log'
+
+    def ready(self):
+        from editors_log import signals  # noqa: F401  Registers analytics cache receivers
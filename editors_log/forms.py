@@ -1,7 +1,8 @@
 from django import forms
 from .models import EditorLog
+from .importer import POLICIES
 from django.utils import timezone
-from django.core.validators import RegexValidator
+from django.core.validators import FileExtensionValidator, RegexValidator
 
 class EditorLogForm(forms.ModelForm):
     date_field = forms.DateField(
@@ -131,4 +132,21 @@ class EditorLogForm(forms.ModelForm):
             instance.user = user
         if commit:
             instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+
+class EditorLogImportForm(forms.Form):
+    file = forms.FileField(
+        label="CSV or XLSX file",
+        validators=[FileExtensionValidator(['csv', 'xlsx'])],
+        widget=forms.ClearableFileInput(attrs={
+            'accept': '.csv,.xlsx',
+            'class': 'border p-2 rounded-md w-full bg-white',
+        }),
+    )
+    policy = forms.ChoiceField(
+        label="When a day is already logged",
+        choices=POLICIES.items(),
+        initial='skip',
+        widget=forms.Select(attrs={'class': 'border p-2 rounded-md w-full'}),
+    )
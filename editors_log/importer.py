@@ -0,0 +1,210 @@
+import csv  # Streaming CSV reader
+import datetime
+import io
+import math
+import re  # Duration strings
+from django.conf import settings  # Row limit
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .analytics import invalidate_analytics
+from .models import EditorLog
+
+BATCH_SIZE = 500
+
+REQUIRED_COLUMNS = ('date', 'event', 'duration')
+COUNTER_COLUMNS = ('clip', 'teamedit', 'indiedit', 'build')
+COUNTER_MAX = 2147483647  # Largest value an IntegerField holds on every backend
+UPDATE_FIELDS = ['event', *COUNTER_COLUMNS, 'duration', 'duration_seconds', 'notes', 'updated_at']
+
+# What to do with a row whose day the editor already logged
+POLICIES = {
+    'skip': "Keep the existing log",
+    'update': "Overwrite the existing log",
+}
+
+DURATION_RE = re.compile(r'^(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d$')  # Same rule as EditorLogForm
+
+
+class ImportFileError(Exception):
+    """The file as a whole cannot be read (bad format, missing columns, too many rows)."""
+
+
+# -------------------------------------------------------------------
+# Function: read_rows
+# Purpose: Stream (row_number, {column: value}) pairs from a .csv or .xlsx
+#          upload. Headers are matched case-insensitively; row 1 is the header.
+# -------------------------------------------------------------------
+def read_rows(upload):
+    if upload.name.lower().endswith('.xlsx'):
+        rows = _xlsx_rows(upload)
+    else:
+        rows = csv.reader(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+
+    try:
+        header = [str(cell or '').strip().lower() for cell in next(rows, [])]
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ImportFileError(f"Missing column(s): {', '.join(missing)}.")
+
+        for number, values in enumerate(rows, start=2):
+            if not any(value not in (None, '') for value in values):
+                continue  # Blank line
+            yield number, dict(zip(header, values))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"Could not read the file: {e}")
+
+
+def _xlsx_rows(upload):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("XLSX import needs the openpyxl package; upload a CSV instead.")
+    try:
+        workbook = load_workbook(upload, read_only=True, data_only=True)
+    except Exception:  # openpyxl raises a variety of zip/XML errors for bad files
+        raise ImportFileError("Not a valid .xlsx workbook.")
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+# -------------------------------------------------------------------
+# Function: parse_row
+# Purpose: Turn one raw row into EditorLog field values, or raise ValueError
+#          with a message for the report. Accepts the strings a CSV holds and
+#          the date/time/number cells an XLSX sheet holds.
+# -------------------------------------------------------------------
+def _parse_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        parsed = parse_date(str(value or '').strip())
+    except ValueError:
+        parsed = None
+    if not parsed:
+        raise ValueError("Date must be YYYY-MM-DD.")
+    return parsed
+
+
+def _parse_duration(value):
+    if isinstance(value, datetime.datetime):
+        value = value.time()
+    if isinstance(value, datetime.timedelta) and value < datetime.timedelta(days=1):
+        value = (datetime.datetime.min + value).time()
+    if isinstance(value, datetime.time):
+        return value.replace(microsecond=0)
+    value = str(value or '').strip()
+    if not DURATION_RE.match(value):
+        raise ValueError("Duration must be in 24-hour format (HH:MM:SS).")
+    hours, minutes, seconds = map(int, value.split(':'))
+    return datetime.time(hours, minutes, seconds)
+
+
+def _parse_counter(column, value):
+    if value in (None, ''):
+        return 0
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{column} must be a whole number.")
+    if not math.isfinite(number) or number < 0 or number != int(number):
+        raise ValueError(f"{column} must be a whole number of 0 or more.")
+    if number > COUNTER_MAX:
+        raise ValueError(f"{column} must be {COUNTER_MAX} or less.")
+    return int(number)
+
+
+def parse_row(raw):
+    event = str(raw.get('event') or '').strip()
+    if not event:
+        raise ValueError("Event is required.")
+    if len(event) > EditorLog._meta.get_field('event').max_length:
+        raise ValueError("Event name is too long.")
+
+    fields = {
+        'log_date': _parse_date(raw.get('date')),
+        'event': event,
+        'duration': _parse_duration(raw.get('duration')),
+        'notes': str(raw.get('notes') or '').strip() or None,
+    }
+    for column in COUNTER_COLUMNS:
+        fields[column] = _parse_counter(column, raw.get(column))
+    return fields
+
+
+# -------------------------------------------------------------------
+# Function: import_editor_logs
+# Purpose: Import a CSV/XLSX of one editor's logs. Rows are parsed as they
+#          stream in and written in batches: one query finds the days already
+#          logged (by the indexed (user, log_date)), new rows go through
+#          bulk_create and, with policy='update', existing ones through
+#          bulk_update. The whole import is one transaction.
+#          Returns {'created', 'updated', 'skipped', 'errors': [(row, message)]}
+# -------------------------------------------------------------------
+def import_editor_logs(user, upload, policy='skip'):
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}.")
+
+    report = {'created': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+    seen = set()
+    batch = []
+
+    with transaction.atomic():
+        for number, raw in read_rows(upload):
+            if number - 1 > settings.EDITOR_LOG_IMPORT_MAX_ROWS:
+                raise ImportFileError(f"Only {settings.EDITOR_LOG_IMPORT_MAX_ROWS} rows can be imported at once.")
+            try:
+                fields = parse_row(raw)
+            except ValueError as e:
+                report['errors'].append((number, str(e)))
+                continue
+            if fields['log_date'] in seen:
+                report['errors'].append((number, f"{fields['log_date']} appears more than once in this file."))
+                continue
+            seen.add(fields['log_date'])
+
+            batch.append(fields)
+            if len(batch) >= BATCH_SIZE:
+                _write_batch(user, batch, policy, report)
+                batch = []
+        _write_batch(user, batch, policy, report)
+
+    if report['created'] or report['updated']:
+        invalidate_analytics()  # bulk_create/bulk_update send no signals
+    return report
+
+
+def _write_batch(user, batch, policy, report):
+    if not batch:
+        return
+    existing = {
+        log.log_date: log
+        for log in EditorLog.objects.filter(user=user, log_date__in=[fields['log_date'] for fields in batch])
+    }
+
+    new_logs, changed_logs = [], []
+    for fields in batch:
+        day = fields.pop('log_date')
+        log = existing.get(day)
+        if log is None:
+            log = EditorLog(user=user, year=day.year, month=day.month, date=day.day, **fields)
+            new_logs.append(log)
+        elif policy == 'update':
+            for name, value in fields.items():
+                setattr(log, name, value)
+            log.updated_at = timezone.now()  # auto_now only applies in save()
+            changed_logs.append(log)
+        else:
+            report['skipped'] += 1
+            continue
+        log.set_derived_fields()  # bulk_create/bulk_update skip save()
+
+    EditorLog.objects.bulk_create(new_logs, batch_size=BATCH_SIZE)
+    if changed_logs:
+        EditorLog.objects.bulk_update(changed_logs, UPDATE_FIELDS, batch_size=BATCH_SIZE)
+    report['created'] += len(new_logs)
+    report['updated'] += len(changed_logs)
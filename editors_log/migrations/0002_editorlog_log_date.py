@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+def backfill_log_date(apps, schema_editor):
+    from editors_log.models import log_date_from_parts
+
+    EditorLog = apps.get_model('editors_log', 'EditorLog')
+    logs = list(EditorLog.objects.only('id', 'year', 'month', 'date'))
+    for log in logs:
+        log.log_date = log_date_from_parts(log.year, log.month, log.date)
+    EditorLog.objects.bulk_update(logs, ['log_date'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editors_log', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='editorlog',
+            name='log_date',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_log_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='editorlog',
+            name='log_date',
+            field=models.DateField(editable=False),
+        ),
+        migrations.AlterModelOptions(
+            name='editorlog',
+            options={'ordering': ['-log_date', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='editorlog',
+            index=models.Index(fields=['user', 'log_date'], name='editorlog_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='editorlog',
+            index=models.Index(fields=['log_date'], name='editorlog_date_idx'),
+        ),
+    ]
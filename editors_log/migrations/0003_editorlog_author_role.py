@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+def backfill_author_role(apps, schema_editor):
+    EditorLog = apps.get_model('editors_log', 'EditorLog')
+    User = apps.get_model('users', 'CustomUser')
+    for role in User.objects.values_list('role', flat=True).distinct():
+        EditorLog.objects.filter(user__role=role).update(author_role=role)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editors_log', '0002_editorlog_log_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='editorlog',
+            name='author_role',
+            field=models.CharField(default='', editable=False, max_length=10),
+        ),
+        migrations.RunPython(backfill_author_role, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='editorlog',
+            index=models.Index(fields=['author_role', 'log_date'], name='editorlog_role_date_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+def backfill_duration_seconds(apps, schema_editor):
+    from editors_log.models import duration_to_seconds
+
+    EditorLog = apps.get_model('editors_log', 'EditorLog')
+    logs = list(EditorLog.objects.only('id', 'duration'))
+    for log in logs:
+        log.duration_seconds = duration_to_seconds(log.duration)
+    EditorLog.objects.bulk_update(logs, ['duration_seconds'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('editors_log', '0003_editorlog_author_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='editorlog',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_duration_seconds, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,21 @@
+import calendar
+import datetime
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+def log_date_from_parts(year, month, day):
+    """Build a date from the split columns, clamping the day to the month's length"""
+    return datetime.date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def duration_to_seconds(duration):
+    """Seconds in a TimeField duration (HH:MM:SS), 0 when unset"""
+    if not duration:
+        return 0
+    return duration.hour * 3600 + duration.minute * 60 + duration.second
+
+
 class EditorLog(models.Model):
     # User information (linked to your CustomUser model)
     user = models.ForeignKey(
@@ -9,11 +23,13 @@ class EditorLog(models.Model):
         on_delete=models.CASCADE,
         related_name='editor_logs'
     )
+    author_role = models.CharField(max_length=10, editable=False, default='')  # Copy of user.role so role listings skip the join
     
     # Date information
     year = models.PositiveIntegerField(default=timezone.now().year)
     month = models.PositiveIntegerField(default=timezone.now().month)
     date = models.PositiveIntegerField(help_text="Day of month (1-31)")  # This replaces "day 1", "day 2"
+    log_date = models.DateField(editable=False)  # Same day as a real date, for indexed sorting and range filters
     
     # Event information
     event = models.CharField(max_length=255)
@@ -22,8 +38,9 @@ class EditorLog(models.Model):
     indiedit = models.IntegerField(default=0)
     build = models.IntegerField(default=0)
     
-    # Duration (stored as time)
+    # Duration (stored as time, plus seconds so totals and averages run in SQL)
     duration = models.TimeField()
+    duration_seconds = models.PositiveIntegerField(editable=False, default=0)
     
     # Notes
     notes = models.TextField(blank=True, null=True)
@@ -33,11 +50,28 @@ class EditorLog(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-year', '-month', '-date']
+        ordering = ['-log_date', '-id']
         unique_together = ['user', 'year', 'month', 'date',]
+        indexes = [
+            models.Index(fields=['user', 'log_date'], name='editorlog_user_date_idx'),  # Per-editor listings
+            models.Index(fields=['log_date'], name='editorlog_date_idx'),  # Admin listing and date ranges
+            models.Index(fields=['author_role', 'log_date'], name='editorlog_role_date_idx'),  # Senior/junior listings
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.year}/{self.month}/{self.date}"
+
+    def set_derived_fields(self):
+        """Fill the columns copied from other fields; bulk_create() callers must call this themselves"""
+        # Keep the real date in step with the year/month/date columns
+        self.log_date = log_date_from_parts(self.year, self.month, self.date)
+        self.duration_seconds = duration_to_seconds(self.duration)
+        if self._state.adding or not self.author_role:
+            self.author_role = self.user.role  # Later role changes arrive via sync_author_role()
+
+    def save(self, *args, **kwargs):
+        self.set_derived_fields()
+        super().save(*args, **kwargs)
     
     def get_duration_24h(self):
         """Return duration in 24-hour format as string"""
@@ -48,9 +82,19 @@ class EditorLog(models.Model):
     @property
     def user_role(self):
         """Convenience method to get user role"""
-        return self.user.role
+        return self.author_role or self.user.role
     
     @property
     def username(self):
         """Convenience method to get username"""
-        return self.user.username
\ No newline at end of file
+        return self.user.username
+
+
+def sync_author_role(user):
+    """Copy a user's current role onto their logs after it changes. Returns rows updated."""
+    from editors_log.analytics import invalidate_analytics  # Avoid circular import
+
+    updated = EditorLog.objects.filter(user=user).exclude(author_role=user.role).update(author_role=user.role)
+    if updated:
+        invalidate_analytics()  # update() sends no signals; per-role totals changed
+    return updated
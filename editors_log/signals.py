@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from editors_log.analytics import invalidate_analytics
+from editors_log.models import EditorLog, sync_author_role
+
+
+# -------------------------------------------------------------------
+# Retire cached analytics whenever a log changes.
+# bulk_create()/update() send no signals; callers using them invalidate
+# the cache themselves (see editors_log.models.sync_author_role).
+# -------------------------------------------------------------------
+@receiver(post_save, sender=EditorLog)
+@receiver(post_delete, sender=EditorLog)
+def refresh_analytics(sender, **kwargs):
+    invalidate_analytics()
+
+
+# -------------------------------------------------------------------
+# Copy a user's role onto their logs whenever the user is saved, so every
+# path that changes a role (dashboard, Django admin, shell) keeps the
+# role-filtered listings and per-role analytics current. The UPDATE only
+# touches logs whose stored role differs; saves limited to other fields,
+# such as last_login on sign-in, skip it.
+# -------------------------------------------------------------------
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_log_roles(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and 'role' not in update_fields):
+        return
+    sync_author_role(instance)
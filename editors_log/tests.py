@@ -1,3 +1,386 @@
-from django.test import TestCase
+import datetime
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.http import QueryDict
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from dashboard.pagination import encode_cursor
+from dashboard.utils import format_seconds
+
+from .analytics import period_analytics
+from .importer import ImportFileError, import_editor_logs
+from .models import EditorLog, sync_author_role
+from .views import filter_logs_by_date
+
+User = get_user_model()
+
+
+def create_log(user, day, event='Wedding', duration=datetime.time(1, 30), **fields):
+    return EditorLog.objects.create(
+        user=user, year=day.year, month=day.month, date=day.day, event=event, duration=duration, **fields
+    )
+
+
+class LogDateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('editor', password='x', role='junior')
+        for day in (1, 10, 20, 28):
+            create_log(self.user, datetime.date(2025, 2, day), event=f'Event {day}')
+
+    def dates(self, query):
+        logs, dates = filter_logs_by_date(EditorLog.objects.all(), QueryDict(query))
+        return sorted(log.log_date.day for log in logs), dates
+
+    def test_derived_columns(self):
+        log = create_log(self.user, datetime.date(2025, 3, 5), duration=datetime.time(2, 3, 4))
+        self.assertEqual(log.log_date, datetime.date(2025, 3, 5))
+        self.assertEqual(log.duration_seconds, 2 * 3600 + 3 * 60 + 4)
+        self.assertEqual(log.author_role, 'junior')
+
+    def test_day_past_month_end_is_clamped(self):
+        log = EditorLog.objects.create(user=self.user, year=2025, month=4, date=31, event='Gala',
+                                       duration=datetime.time(1))
+        self.assertEqual(log.log_date, datetime.date(2025, 4, 30))
+
+    def test_single_day(self):
+        self.assertEqual(self.dates('filter_date=2025-02-10')[0], [10])
+
+    def test_inclusive_range(self):
+        days, dates = self.dates('date_from=2025-02-10&date_to=2025-02-20')
+        self.assertEqual(days, [10, 20])
+        self.assertEqual(dates['date_query'], 'date_from=2025-02-10&date_to=2025-02-20')
+        self.assertEqual(self.dates('date_from=2025-02-11')[0], [20, 28])
+        self.assertEqual(self.dates('date_to=2025-02-10')[0], [1, 10])
+
+    def test_invalid_dates_are_ignored(self):
+        days, dates = self.dates('date_from=2025-02-31&date_to=tomorrow')
+        self.assertEqual(days, [1, 10, 20, 28])
+        self.assertEqual(dates, {'date_query': ''})
+
+    def test_range_filter_in_the_list_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard:editor_log_list'), {'date_from': '2025-02-15'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['grouped_logs']), ['2025-02-28', '2025-02-20'])
+        self.assertEqual(response.context['date_from'], '2025-02-15')
+
+
+class RoleScopedListTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', password='x', role='admin')
+        self.senior = User.objects.create_user('senior', password='x', role='senior')
+        self.junior = User.objects.create_user('junior', password='x', role='junior')
+        day = datetime.date(2025, 5, 1)
+        for offset in range(3):
+            for user in (self.senior, self.junior):
+                create_log(user, day + datetime.timedelta(days=offset), event=f'{user.username} {offset}')
+
+    def listed_authors(self, user):
+        self.client.force_login(user)
+        response = self.client.get(reverse('dashboard:editor_log_list'))
+        return {log.user.username for logs in response.context['grouped_logs'].values() for log in logs}
+
+    def test_each_role_sees_its_own_role(self):
+        self.assertEqual(self.listed_authors(self.admin), {'senior', 'junior'})
+        self.assertEqual(self.listed_authors(self.senior), {'senior'})
+        self.assertEqual(self.listed_authors(self.junior), {'junior'})
+
+    def test_listing_is_two_queries(self):
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(4):  # Session and user, then the page and the count
+            response = self.client.get(reverse('dashboard:editor_log_list'))
+        self.assertEqual(response.context['total'], 6)
+
+    def test_role_change_moves_existing_logs(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('dashboard:update_role', args=[self.junior.pk]), {'role': 'senior'})
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(set(EditorLog.objects.filter(user=self.junior).values_list('author_role', flat=True)), {'senior'})
+        self.assertEqual(self.listed_authors(self.senior), {'senior', 'junior'})
+
+    def test_role_change_in_django_admin_moves_existing_logs(self):
+        admin = User.objects.create_superuser('root', 'root@example.com', 'x', role='admin')
+        self.client.force_login(admin)
+        response = self.client.post(reverse('admin:users_customuser_change', args=[self.junior.pk]), {
+            'username': 'junior', 'role': 'senior', 'is_active': 'on',
+            'date_joined_0': '2025-01-01', 'date_joined_1': '00:00:00',
+        })
+        self.assertEqual(response.status_code, 302, getattr(response, 'context_data', {}).get('errors'))
+        self.assertEqual(set(EditorLog.objects.filter(user=self.junior).values_list('author_role', flat=True)), {'senior'})
+
+    def test_saving_a_user_syncs_only_role_changes(self):
+        self.junior.role = 'senior'
+        self.junior.save(update_fields=['last_login'])  # e.g. signing in
+        self.assertFalse(EditorLog.objects.filter(user=self.junior, author_role='senior').exists())
+
+        self.junior.save()
+        self.assertEqual(EditorLog.objects.filter(user=self.junior, author_role='senior').count(), 3)
+
+    def test_sync_only_touches_stale_rows(self):
+        self.assertEqual(sync_author_role(self.junior), 0)
+        User.objects.filter(pk=self.junior.pk).update(role='admin')
+        self.junior.refresh_from_db()
+        self.assertEqual(sync_author_role(self.junior), 3)
+        self.assertEqual(sync_author_role(self.junior), 0)
+
+    def test_edits_keep_the_recorded_role(self):
+        log = EditorLog.objects.select_related('user').filter(user=self.junior).first()
+        log.user.role = 'senior'
+        log.notes = 'edited'
+        log.save()
+        self.assertEqual(log.author_role, 'junior')  # Only sync_author_role() moves it
+
+
+class LogPaginationTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', password='x', role='admin')
+        editors = [User.objects.create_user(f'editor{i}', password='x', role='junior') for i in range(2)]
+        start = datetime.date(2025, 1, 1)
+        for offset in range(30):  # Two logs per day, so pages split ties on log_date
+            for editor in editors:
+                create_log(editor, start + datetime.timedelta(days=offset))
+        self.newest = EditorLog.objects.order_by('-log_date', '-pk').first()
+        self.client.force_login(self.admin)
+
+    def page(self, cursor=None):
+        response = self.client.get(reverse('dashboard:editor_log_list'), {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response.context['page_obj']
+
+    def test_cursors_walk_every_log_once_in_both_directions(self):
+        pages = [self.page()]
+        while pages[-1].has_next:
+            pages.append(self.page(pages[-1].next_cursor))
+        self.assertEqual([len(page) for page in pages], [25, 25, 10])
+        seen = [log.pk for page in pages for log in page]
+        self.assertEqual(seen, list(EditorLog.objects.order_by('-log_date', '-pk').values_list('pk', flat=True)))
+
+        back = self.page(pages[1].previous_cursor)
+        self.assertEqual([log.pk for log in back], [log.pk for log in pages[0]])
+        self.assertFalse(back.has_previous)
+
+    def test_malformed_cursors_fall_back_to_first_page(self):
+        for cursor in ['not-base64!', 'e30', encode_cursor('sideways', '2025-01-05', 1)]:
+            page = self.page(cursor)
+            self.assertEqual(page.object_list[0].pk, self.newest.pk)
+            self.assertFalse(page.has_previous)
+
+    def test_wrongly_typed_cursors_fall_back_to_first_page(self):
+        for key_value in ['abc', '2025-02-31', 20250105, [2025, 1, 5], None]:
+            page = self.page(encode_cursor('next', key_value, 1))
+            self.assertEqual(page.object_list[0].pk, self.newest.pk)
+
+    def test_cursor_applies_to_one_editors_logs(self):
+        editor = User.objects.get(username='editor0')
+        url = reverse('dashboard:user_editor_logs', args=[editor.pk])
+        first = self.client.get(url).context['page_obj']
+        second = self.client.get(url, {'cursor': first.next_cursor}).context['page_obj']
+        self.assertEqual([len(first), len(second)], [25, 5])
+        self.assertEqual({log.user_id for log in [*first, *second]}, {editor.pk})
+        response = self.client.get(url, {'cursor': encode_cursor('next', 'abc', 1)})
+        self.assertEqual(response.status_code, 200)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin', password='x', role='admin')
+        self.senior = User.objects.create_user('senior', password='x', role='senior')
+        self.junior = User.objects.create_user('junior', password='x', role='junior')
+        create_log(self.senior, datetime.date(2025, 1, 10), event='Wedding', clip=4, duration=datetime.time(2))
+        create_log(self.senior, datetime.date(2025, 2, 10), event='Gala', clip=2, duration=datetime.time(1))
+        create_log(self.junior, datetime.date(2025, 2, 11), event='Wedding', clip=1, duration=datetime.time(0, 30))
+
+    def row(self, rows, **match):
+        return next(row for row in rows if all(row[k] == v for k, v in match.items()))
+
+    def test_breakdowns(self):
+        analytics = period_analytics(None, None)
+        self.assertEqual(analytics['overall']['log_count'], 3)
+        self.assertEqual(analytics['overall']['total_clip'], 7)
+        self.assertEqual(analytics['overall']['avg_clip'], 2.33)
+
+        senior = self.row(analytics['editor'], username='senior')
+        self.assertEqual((senior['log_count'], senior['total_duration_seconds'], senior['avg_clip']), (2, 3 * 3600, 3))
+        self.assertEqual([row['username'] for row in analytics['editor']], ['senior', 'junior'])  # Most time first
+        self.assertEqual(self.row(analytics['role'], author_role='junior')['total_clip'], 1)
+        self.assertEqual(self.row(analytics['event'], event='Wedding')['log_count'], 2)
+        self.assertEqual([row['log_count'] for row in analytics['month']], [1, 2])  # Oldest month first
+
+    def test_period_is_inclusive(self):
+        analytics = period_analytics('2025-02-01', '2025-02-10')
+        self.assertEqual(analytics['overall']['log_count'], 1)
+        self.assertEqual(period_analytics('2025-02-11', None)['overall']['log_count'], 1)
+
+    def test_results_are_cached_until_a_log_changes(self):
+        period_analytics(None, None)
+        with self.assertNumQueries(0):
+            period_analytics(None, None)
+
+        create_log(self.junior, datetime.date(2025, 3, 1), clip=10)
+        self.assertEqual(period_analytics(None, None)['overall']['total_clip'], 17)
+        EditorLog.objects.filter(event='Gala').delete()
+        self.assertEqual(period_analytics(None, None)['overall']['total_clip'], 15)
+
+    def test_role_sync_retires_cached_role_totals(self):
+        period_analytics(None, None)
+        User.objects.filter(pk=self.junior.pk).update(role='senior')
+        self.junior.refresh_from_db()
+        sync_author_role(self.junior)
+        roles = [row['author_role'] for row in period_analytics(None, None)['role']]
+        self.assertEqual(roles, ['senior'])
+
+    def test_format_seconds(self):
+        self.assertEqual(format_seconds(None), '0:00:00')
+        self.assertEqual(format_seconds(90061.6), '25:01:01')
+
+    def test_views_are_admin_only(self):
+        self.client.force_login(self.senior)
+        self.assertEqual(self.client.get(reverse('dashboard:editor_analytics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('dashboard:editor_analytics_api')).status_code, 403)
+
+    def test_api(self):
+        self.client.force_login(self.admin)
+        url = reverse('dashboard:editor_analytics_api')
+        data = self.client.get(url, {'date_from': '2025-01-01', 'by': 'event'}).json()
+        self.assertEqual(set(data), {'date_from', 'date_to', 'overall', 'event'})
+        self.assertEqual(data['overall']['log_count'], 3)
+
+        response = self.client.get(url, {'by': 'weekday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_renders_formatted_durations(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('dashboard:editor_analytics'), {'date_from': '2025-01-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['overall']['total_duration'], '3:30:00')
+
+
+def csv_upload(*lines, name='logs.csv'):
+    return SimpleUploadedFile(name, '\n'.join(lines).encode(), content_type='text/csv')
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('editor', password='x', role='senior')
+
+    def test_headers_match_in_any_case_and_order(self):
+        report = import_editor_logs(self.user, csv_upload(
+            '\ufeffEvent, DURATION ,Date,Clip,Notes',
+            'Wedding,01:30:00,2025-03-01,4,  first day ',
+            'Gala,00:45:00,2025-03-02,,',
+        ))
+        self.assertEqual(report, {'created': 2, 'updated': 0, 'skipped': 0, 'errors': []})
+
+        log = EditorLog.objects.get(log_date='2025-03-01')
+        self.assertEqual((log.event, log.clip, log.notes, log.duration_seconds), ('Wedding', 4, 'first day', 5400))
+        self.assertEqual(log.author_role, 'senior')
+        self.assertIsNone(EditorLog.objects.get(log_date='2025-03-02').notes)
+
+    def test_missing_required_column(self):
+        with self.assertRaisesMessage(ImportFileError, "Missing column(s): duration."):
+            import_editor_logs(self.user, csv_upload('date,event', '2025-03-01,Wedding'))
+
+    def test_invalid_rows_are_reported_and_the_rest_imported(self):
+        report = import_editor_logs(self.user, csv_upload(
+            'date,event,duration,clip',
+            '2025-03-01,Wedding,01:00:00,1',
+            '2025-02-30,Wedding,01:00:00,1',
+            '2025-03-02,,01:00:00,1',
+            '2025-03-03,Gala,1:00,1',
+            '2025-03-04,Gala,01:00:00,-2',
+            ',,,',
+            '2025-03-01,Again,01:00:00,1',
+        ))
+        self.assertEqual(report['created'], 1)
+        self.assertEqual(report['errors'], [
+            (3, "Date must be YYYY-MM-DD."),
+            (4, "Event is required."),
+            (5, "Duration must be in 24-hour format (HH:MM:SS)."),
+            (6, "clip must be a whole number of 0 or more."),
+            (8, "2025-03-01 appears more than once in this file."),
+        ])
+        self.assertEqual(EditorLog.objects.count(), 1)
+
+    def test_counters_outside_the_integer_range(self):
+        report = import_editor_logs(self.user, csv_upload(
+            'date,event,duration,clip,build',
+            '2025-03-01,Wedding,01:00:00,inf,1',
+            '2025-03-02,Wedding,01:00:00,1,1e400',
+            '2025-03-03,Wedding,01:00:00,nan,1',
+            '2025-03-04,Wedding,01:00:00,99999999999999999999,1',
+            '2025-03-05,Wedding,01:00:00,2147483647,1',
+        ))
+        self.assertEqual(report['created'], 1)
+        self.assertEqual(report['errors'], [
+            (2, "clip must be a whole number of 0 or more."),
+            (3, "build must be a whole number of 0 or more."),
+            (4, "clip must be a whole number of 0 or more."),
+            (5, "clip must be 2147483647 or less."),
+        ])
+        self.assertEqual(EditorLog.objects.get().clip, 2147483647)
+
+    def test_existing_days_are_skipped_or_updated(self):
+        create_log(self.user, datetime.date(2025, 3, 1), event='Original')
+        upload = ('date,event,duration', '2025-03-01,Replaced,02:00:00', '2025-03-02,New,02:00:00')
+
+        report = import_editor_logs(self.user, csv_upload(*upload), policy='skip')
+        self.assertEqual((report['created'], report['skipped']), (1, 1))
+        self.assertEqual(EditorLog.objects.get(log_date='2025-03-01').event, 'Original')
+
+        report = import_editor_logs(self.user, csv_upload(*upload), policy='update')
+        self.assertEqual((report['updated'], report['skipped']), (2, 0))
+        log = EditorLog.objects.get(log_date='2025-03-01')
+        self.assertEqual((log.event, log.duration_seconds), ('Replaced', 7200))
+
+    @override_settings(EDITOR_LOG_IMPORT_MAX_ROWS=2)
+    def test_row_cap_rejects_the_whole_file(self):
+        rows = [f'2025-03-0{day},Wedding,01:00:00' for day in range(1, 4)]
+        with self.assertRaisesMessage(ImportFileError, "Only 2 rows can be imported at once."):
+            import_editor_logs(self.user, csv_upload('date,event,duration', *rows))
+        self.assertFalse(EditorLog.objects.exists())
+
+        import_editor_logs(self.user, csv_upload('date,event,duration', *rows[:2]))
+        self.assertEqual(EditorLog.objects.count(), 2)
+
+    def test_unreadable_csv(self):
+        upload = SimpleUploadedFile('logs.csv', b'date,event,duration\n\xff\xfe,x,y')
+        with self.assertRaisesMessage(ImportFileError, "Could not read the file"):
+            import_editor_logs(self.user, upload)
+
+    def test_xlsx_without_openpyxl(self):
+        with mock.patch.dict('sys.modules', {'openpyxl': None}):
+            with self.assertRaisesMessage(ImportFileError, "XLSX import needs the openpyxl package"):
+                import_editor_logs(self.user, SimpleUploadedFile('logs.xlsx', b'PK'))
+
+    def test_xlsx_cells(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        workbook.active.append(['Date', 'Event', 'Duration', 'Build'])
+        workbook.active.append([datetime.datetime(2025, 3, 1), 'Wedding', datetime.time(1, 15), 3])
+        workbook.active.append(['2025-03-02', 'Gala', '00:30:00', 2.5])
+        data = io.BytesIO()
+        workbook.save(data)
+
+        report = import_editor_logs(self.user, SimpleUploadedFile('logs.xlsx', data.getvalue()))
+        self.assertEqual(report['created'], 1)
+        self.assertEqual(report['errors'], [(3, "build must be a whole number of 0 or more.")])
+        self.assertEqual(EditorLog.objects.get().duration_seconds, 4500)
+
+    def test_view_reports_file_errors_on_the_form(self):
+        self.client.force_login(self.user)
+        url = reverse('dashboard:import_editor_logs')
+        response = self.client.post(url, {'file': csv_upload('date,event'), 'policy': 'skip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['form'].errors['file'], ["Missing column(s): duration."])
+
+        response = self.client.post(url, {'file': csv_upload('date,event,duration', '2025-03-01,Wedding,01:00:00'),
+                                          'policy': 'skip'})
+        self.assertEqual(response.context['report']['created'], 1)
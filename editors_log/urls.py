@@ -4,7 +4,10 @@ from . import views
 urlpatterns = [
     path('editors-log/', views.editor_log_list, name='editor_log_list'),
     path('editors-log/add/', views.add_editor_log, name='add_editor_log'),
+    path('editors-log/import/', views.import_editor_logs_view, name='import_editor_logs'),
     path('editors-log/<int:pk>/edit/', views.edit_editor_log, name='edit_editor_log'),
     path('editors-log/<int:user_id>/', views.user_editor_logs, name='user_editor_logs'),
+    path('editors-log/analytics/', views.editor_analytics, name='editor_analytics'),
+    path('editors-log/analytics/data/', views.editor_analytics_api, name='editor_analytics_api'),
 
 ]
@@ -2,54 +2,94 @@
 from django.contrib.auth import get_user_model
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils import timezone
+from .analytics import GROUPINGS, period_analytics
 from .models import EditorLog
-from .forms import EditorLogForm
-from django.core.paginator import Paginator  
+from .forms import EditorLogForm, EditorLogImportForm
+from .importer import ImportFileError, import_editor_logs
+from dashboard.utils import admin_required, format_seconds
+from dashboard.pagination import approximate_count, keyset_paginate
+from django.utils.dateparse import parse_date
+from urllib.parse import urlencode
 
 User = get_user_model()
 
+LOGS_PER_PAGE = 25
+
+# Columns the log list templates render
+LIST_FIELDS = ('id', 'user', 'log_date', 'event', 'clip', 'teamedit', 'indiedit', 'build', 'notes', 'duration')
+
+
+def parse_log_dates(params, keys=('filter_date', 'date_from', 'date_to')):
+    """Valid dates among `keys` of a GET QueryDict, as 'YYYY-MM-DD' strings."""
+    dates = {}
+    for key in keys:
+        try:
+            value = parse_date(params.get(key) or '')
+        except ValueError:
+            value = None  # Well-formed but impossible, e.g. 2024-02-31
+        if value:
+            dates[key] = value.isoformat()
+    return dates
+
+
+def filter_logs_by_date(logs, params):
+    """
+    Narrow logs to ?filter_date= (one day) or ?date_from=/?date_to= (inclusive range).
+    Filters on the indexed log_date column; invalid dates are ignored.
+    Returns (logs, dates): the active dates as 'YYYY-MM-DD' strings for the
+    filter form, plus 'date_query' to carry them through pagination links.
+    """
+    dates = parse_log_dates(params)
+    if 'filter_date' in dates:
+        logs = logs.filter(log_date=dates['filter_date'])
+    if 'date_from' in dates:
+        logs = logs.filter(log_date__gte=dates['date_from'])
+    if 'date_to' in dates:
+        logs = logs.filter(log_date__lte=dates['date_to'])
+
+    dates['date_query'] = urlencode(dates)
+    return logs, dates
+
+
 @login_required
 def editor_log_list(request):
     user = request.user
     role = getattr(user, 'role', None)
 
+    # One joined query for the page: only the columns the list shows, plus the author's username
+    logs = EditorLog.objects.select_related('user').only(*LIST_FIELDS, 'user__id', 'user__username')
+
     if role == 'admin':
-        logs = EditorLog.objects.all()
-    elif role == 'senior':
-        logs = EditorLog.objects.filter(user__role='senior')
-    elif role == 'junior':
-        logs = EditorLog.objects.filter(user__role='junior')
+        pass
+    elif role in ('senior', 'junior'):
+        logs = logs.filter(author_role=role)  # Denormalized, indexed with log_date; no join to filter
     else:
-        logs = EditorLog.objects.filter(user=user)
+        logs = logs.filter(user=user)
 
-    # Date filtering: If 'filter_date' is provided (e.g., '2023-10-15'), filter by year, month, date
-    filter_date = request.GET.get('filter_date')
-    if filter_date:
-        try:
-            year, month, date = map(int, filter_date.split('-'))
-            logs = logs.filter(year=year, month=month, date=date)
-        except ValueError:
-            pass  # Ignore invalid dates
+    # Date filtering: a single day ('filter_date', e.g. '2023-10-15') or a 'date_from'/'date_to' range
+    logs, dates = filter_logs_by_date(logs, request.GET)
 
-    # Order by recency: newest first (adjust if you have a 'created_at' field)
-    logs = logs.order_by('-year', '-month', '-date', '-id')  # '-id' ensures stable ordering for same dates
-
-    # Paginate: 25 logs per page
-    paginator = Paginator(logs, 25)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on (log_date, id): every page is one indexed range query
+    page_obj = keyset_paginate(logs, 'log_date', cursor=request.GET.get('cursor'), per_page=LOGS_PER_PAGE)
+    total, total_exact = approximate_count(logs)
 
     # Group the paginated logs by day (for display)
     grouped_logs = {}
     for log in page_obj.object_list:  # Use the current page's logs
-        day_key = f"{log.year}-{log.month:02d}-{log.date:02d}"
+        day_key = log.log_date.isoformat()
         grouped_logs.setdefault(day_key, []).append(log)
 
-    # Pass both page_obj (for pagination) and grouped_logs (for display), plus filter_date for form prepopulation
+    # Pass both page_obj (for pagination) and grouped_logs (for display), plus the dates for form prepopulation
     context = {
         'grouped_logs': grouped_logs,
         'page_obj': page_obj,
-        'filter_date': filter_date,  # To prepopulate the form
+        'total': total,
+        'total_exact': total_exact,
+        **dates,  # filter_date/date_from/date_to to prepopulate the form
     }
     return render(request, 'dashboard/editors_log/log_list.html', context)
 
@@ -65,6 +105,35 @@ def add_editor_log(request):
     return render(request, 'dashboard/editors_log/add_log.html', {'form': form})
 
 
+# 📥 Backfill many days at once from a CSV/XLSX file (the uploader's own logs)
+@login_required
+def import_editor_logs_view(request):
+    report = None
+
+    if request.method == 'POST':
+        form = EditorLogImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                report = import_editor_logs(request.user, form.cleaned_data['file'], form.cleaned_data['policy'])
+            except ImportFileError as e:
+                form.add_error('file', str(e))
+            except IntegrityError:
+                form.add_error(None, "Some of these days were logged at the same time by another request; please retry.")
+            else:
+                messages.success(
+                    request,
+                    f"✅ {report['created']} logs added, {report['updated']} updated, {report['skipped']} kept as they were.",
+                )
+    else:
+        form = EditorLogImportForm()
+
+    return render(request, 'dashboard/editors_log/import_logs.html', {
+        'form': form,
+        'report': report,
+        'columns': ['date', 'event', 'clip', 'teamedit', 'indiedit', 'build', 'duration', 'notes'],
+    })
+
+
 @login_required
 def edit_editor_log(request, pk):
     log = get_object_or_404(EditorLog, pk=pk)
@@ -90,32 +159,75 @@ def user_editor_logs(request, user_id):
     target_user = get_object_or_404(User, id=user_id)
 
     # Get ALL logs of that user (not filtered by your admin/senior/junior logic)
-    logs = EditorLog.objects.filter(user=target_user)
+    logs = EditorLog.objects.filter(user=target_user).only(*LIST_FIELDS)
 
     # Date filtering (optional)
-    filter_date = request.GET.get('filter_date')
-    if filter_date:
-        try:
-            year, month, date = map(int, filter_date.split('-'))
-            logs = logs.filter(year=year, month=month, date=date)
-        except ValueError:
-            pass
+    logs, dates = filter_logs_by_date(logs, request.GET)
 
-    logs = logs.order_by('-year', '-month', '-date', '-id')
-
-    paginator = Paginator(logs, 25)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = keyset_paginate(logs, 'log_date', cursor=request.GET.get('cursor'), per_page=LOGS_PER_PAGE)
+    total, total_exact = approximate_count(logs)
 
     # Group logs by day
     grouped_logs = {}
     for log in page_obj.object_list:
-        day_key = f"{log.year}-{log.month:02d}-{log.date:02d}"
+        day_key = log.log_date.isoformat()
         grouped_logs.setdefault(day_key, []).append(log)
 
     return render(request, 'dashboard/editors_log/user_logs.html', {
         'target_user': target_user,
         'grouped_logs': grouped_logs,
         'page_obj': page_obj,
-        'filter_date': filter_date
+        'total': total,
+        'total_exact': total_exact,
+        **dates,
+    })
+
+
+def _analytics_period(params):
+    """?date_from=/?date_to= from the request, defaulting to the last 12 months."""
+    dates = parse_log_dates(params, keys=('date_from', 'date_to'))
+    if not dates:
+        today = timezone.localdate()
+        year, month = divmod(today.year * 12 + today.month - 1 - 11, 12)
+        dates['date_from'] = today.replace(year=year, month=month + 1, day=1).isoformat()
+    return dates.get('date_from'), dates.get('date_to')
+
+
+# 📊 Editor productivity totals and averages per editor, role, event and month (admin only)
+@admin_required
+def editor_analytics(request):
+    date_from, date_to = _analytics_period(request.GET)
+    analytics = period_analytics(date_from, date_to)
+
+    # Durations are aggregated as seconds; format them for display only
+    sections = []
+    for by in GROUPINGS:
+        label = GROUPINGS[by][-1]  # username, author_role, event or month_start
+        rows = [
+            {**row, 'label': row[label], 'total_duration': format_seconds(row['total_duration_seconds']),
+             'avg_duration': format_seconds(row['avg_duration_seconds'])}
+            for row in analytics[by]
+        ]
+        sections.append((by, rows))
+
+    overall = analytics['overall']
+    return render(request, 'dashboard/editors_log/analytics.html', {
+        'sections': sections,
+        'overall': {**overall, 'total_duration': format_seconds(overall['total_duration_seconds']),
+                    'avg_duration': format_seconds(overall['avg_duration_seconds'])},
+        'date_from': date_from,
+        'date_to': date_to,
     })
+
+
+# GET ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD[&by=editor|role|event|month] -> the same figures as JSON
+@admin_required
+def editor_analytics_api(request):
+    by = request.GET.get('by')
+    if by and by not in GROUPINGS:
+        return JsonResponse({'error': f"'by' must be one of: {', '.join(GROUPINGS)}"}, status=400)
+
+    analytics = period_analytics(*_analytics_period(request.GET))
+    if by:
+        analytics = {key: analytics[key] for key in ('date_from', 'date_to', 'overall', by)}
+    return JsonResponse(analytics)
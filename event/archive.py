@@ -0,0 +1,107 @@
+import glob  # Find cached archives to invalidate
+import hashlib  # Archive fingerprints
+import os  # Paths and atomic renames
+import tempfile  # Per-download partial archives
+import zipfile  # Archive format
+from django.conf import settings  # MEDIA_ROOT
+
+CHUNK_SIZE = 64 * 1024  # Bytes copied per read
+
+
+# -------------------------------------------------------------------
+# Class: _ZipStream
+# Purpose: Write-only sink for zipfile. It has no tell()/seek(), so zipfile
+#          writes data descriptors and never needs to rewind; whatever has
+#          been written is drained and yielded as the next response chunk.
+# -------------------------------------------------------------------
+class _ZipStream:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+# -------------------------------------------------------------------
+# Function: archive_fingerprint
+# Purpose: Stable digest of which files (and which contents) a ZIP holds.
+#          Used as the ETag and cache key, so any upload/delete changes it.
+# -------------------------------------------------------------------
+def archive_fingerprint(filters):
+    digest = hashlib.sha256()
+    for filter_id, name, sha256 in sorted(filters.values_list('id', 'file', 'sha256')):
+        digest.update(f"{filter_id}:{name}:{sha256}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+def archive_cache_path(event, fingerprint):
+    return os.path.join(settings.MEDIA_ROOT, 'archives', f"event-{event.id}-{fingerprint}.zip")
+
+
+# -------------------------------------------------------------------
+# Function: invalidate_event_archive
+# Purpose: Drop cached archives of an event after its filter set changes
+# -------------------------------------------------------------------
+def invalidate_event_archive(event):
+    pattern = os.path.join(settings.MEDIA_ROOT, 'archives', f"event-{event.id}-*.zip")
+    for path in glob.glob(pattern):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# -------------------------------------------------------------------
+# Function: stream_filters_zip
+# Purpose: Yield a ZIP of the given filters chunk by chunk, holding at most
+#          one chunk in memory. With `cache_path`, the bytes are also teed to
+#          that file, which only appears once the archive is complete.
+# -------------------------------------------------------------------
+def stream_filters_zip(filters, cache_path=None):
+    sink = _ZipStream()
+    cache = None
+    tmp_path = None
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # A private temp file per download; concurrent requests for the same
+        # archive each write their own and the last complete one wins
+        cache = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(cache_path), prefix=f"{os.path.basename(cache_path)}.", suffix='.tmp', delete=False
+        )
+        tmp_path = cache.name
+
+    def emit():
+        data = sink.drain()
+        if cache and data:
+            cache.write(data)
+        return data
+
+    completed = False
+    try:
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for filter_obj in filters:
+                arcname = os.path.basename(filter_obj.file.name)
+                with filter_obj.file.open('rb') as source, archive.open(arcname, 'w') as dest:
+                    for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                        dest.write(chunk)
+                        if len(sink.buffer) >= CHUNK_SIZE:
+                            yield emit()
+                yield emit()
+        yield emit()  # Central directory
+        completed = True
+    finally:
+        if cache:
+            cache.close()
+            if completed:
+                os.replace(tmp_path, cache_path)
+            else:
+                os.remove(tmp_path)  # Client went away mid-download
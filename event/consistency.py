@@ -0,0 +1,259 @@
+import json  # Trash manifests
+import logging
+import os  # Folder renames and walks
+import shutil  # Recursive removal in the reaper
+import threading  # Background reaping after a delete commits
+import time
+import uuid
+from contextlib import contextmanager
+from django.conf import settings  # MEDIA_ROOT
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+FILTERS_DIR = 'filters'
+TRASH_DIR = '.trash'  # Under MEDIA_ROOT so moves into it are same-filesystem renames
+
+
+# -------------------------------------------------------------------
+# Storage consistency for event folders (filters/<Event_Name>/)
+#   - rename: the folder is moved with one os.rename() and the Filter file
+#     paths are rewritten in the same transaction; a failed save moves it back
+#   - delete: after the transaction commits, the folder is renamed into
+#     MEDIA_ROOT/.trash (instant) and removed by a background reaper, so the
+#     request never waits on rmtree
+#   - reconcile(): reports (and optionally repairs) drift between the
+#     database and the disk
+# -------------------------------------------------------------------
+def event_folder_name(name):
+    return name.replace(" ", "_")  # e.g. "Jomanji Festival" -> "Jomanji_Festival"
+
+
+def event_folder_path(name):
+    return os.path.join(settings.MEDIA_ROOT, FILTERS_DIR, event_folder_name(name))
+
+
+def trash_path():
+    return os.path.join(settings.MEDIA_ROOT, TRASH_DIR)
+
+
+@contextmanager
+def move_event_folder(old_name, new_name):
+    """
+    Move filters/<old> to filters/<new> around a block that saves the rename,
+    undoing the move if the block raises. Enter it outside the block's own
+    transaction.atomic() so a failed commit is undone too.
+
+    Inside an outer transaction a later rollback could not move the folder
+    back, so the files are hard-linked into the new folder instead and the old
+    folder is trashed only once everything commits.
+    """
+    source, target = event_folder_path(old_name), event_folder_path(new_name)
+    if source == target or not os.path.isdir(source):
+        yield
+        return
+
+    if os.path.isdir(target) and not os.listdir(target):
+        os.rmdir(target)  # Empty placeholder; rename() will not replace it on every OS
+
+    if transaction.get_connection().in_atomic_block:
+        _link_tree(source, target)
+        try:
+            yield
+        except BaseException:
+            shutil.rmtree(target, ignore_errors=True)
+            raise
+        transaction.on_commit(lambda: _trash_and_reap(source))
+        return
+
+    os.rename(source, target)  # Atomic on one filesystem; raises if target is in use
+    try:
+        yield
+    except BaseException:
+        os.rename(target, source)
+        raise
+
+
+def _link_tree(source, target):
+    os.makedirs(target)  # Raises if a non-empty folder already has the name
+    for name in os.listdir(source):
+        path = os.path.join(source, name)
+        if not os.path.isfile(path):
+            continue
+        try:
+            os.link(path, os.path.join(target, name))
+        except OSError:
+            shutil.copyfile(path, os.path.join(target, name))  # No hard links on this filesystem
+
+
+def relink_filter_paths(event, old_name):
+    """Rewrite the stored file names of an event's filters after a folder move."""
+    from event.models import Filter  # Avoid circular import
+
+    old_prefix = f"{FILTERS_DIR}/{event_folder_name(old_name)}/"
+    new_prefix = f"{FILTERS_DIR}/{event_folder_name(event.name)}/"
+    filters = list(Filter.objects.filter(event=event, file__startswith=old_prefix).only('id', 'file'))
+    for filter_obj in filters:
+        filter_obj.file.name = new_prefix + filter_obj.file.name[len(old_prefix):]
+    Filter.objects.bulk_update(filters, ['file'], batch_size=500)
+    return len(filters)
+
+
+# -------------------------------------------------------------------
+# Deferred deletion
+# -------------------------------------------------------------------
+def trash_folder(path, digests=()):
+    """
+    Move `path` into the trash with a manifest of blob digests that may have
+    become unreferenced. Returns the trash entry name, or None if `path` is gone.
+    """
+    if not os.path.exists(path):
+        entry = None
+    else:
+        os.makedirs(trash_path(), exist_ok=True)
+        entry = f"{os.path.basename(path)}.{uuid.uuid4().hex[:8]}"
+        os.rename(path, os.path.join(trash_path(), entry))
+
+    if digests:
+        manifest = entry or f"blobs.{uuid.uuid4().hex[:8]}"
+        with open(os.path.join(trash_path(), f"{manifest}.json"), 'w') as f:
+            json.dump(sorted(d for d in digests if d), f)
+    return entry
+
+
+def reap_trash(min_age=0):
+    """
+    Remove trashed folders and collect blobs listed in their manifests.
+    Entries younger than `min_age` seconds are left for their own reaper.
+    Returns the number of entries removed.
+    """
+    from event.models import collect_filter_blobs  # Avoid circular import
+
+    root = trash_path()
+    if not os.path.isdir(root):
+        return 0
+
+    removed = 0
+    cutoff = time.time() - min_age
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        try:
+            if os.path.getmtime(path) > cutoff:
+                continue
+            if name.endswith('.json'):
+                with open(path) as f:
+                    collect_filter_blobs(set(json.load(f)))
+                os.remove(path)
+            else:
+                shutil.rmtree(path)
+            removed += 1
+        except FileNotFoundError:
+            continue  # Another reaper got there first
+        except (OSError, ValueError):
+            logger.exception("Could not reap %s", path)
+    return removed
+
+
+def _reap_in_background():
+    try:
+        reap_trash()
+    finally:
+        connection.close()  # Thread-local connection opened by blob collection
+
+
+def _trash_and_reap(path, digests=()):
+    try:
+        trash_folder(path, digests)
+    except OSError:
+        logger.exception("Could not move %s to trash", path)
+        return
+    threading.Thread(target=_reap_in_background, daemon=True).start()
+
+
+def delete_event_files(event_name, digests):
+    """
+    Schedule removal of an event's folder once the current transaction commits.
+    The rename into the trash happens on commit; the slow part runs on a
+    daemon thread. Anything a crash leaves behind is picked up by
+    `manage.py reconcile_filter_storage --reap`.
+    """
+    path = event_folder_path(event_name)
+    transaction.on_commit(lambda: _trash_and_reap(path, digests))
+
+
+def delete_filter_file(name, digest):
+    """Remove one filter's link, and its blob if unreferenced, after commit."""
+    from event.models import collect_filter_blobs  # Avoid circular import
+    from event.storage import get_filter_storage
+
+    def on_commit():
+        if name:
+            get_filter_storage().delete(name)
+        collect_filter_blobs({digest})
+
+    transaction.on_commit(on_commit)
+
+
+# -------------------------------------------------------------------
+# Reconciliation
+# -------------------------------------------------------------------
+def reconcile(fix=False, grace=3600):
+    """
+    Compare the database with MEDIA_ROOT and return a report:
+      orphan_folders: filters/<dir> with no matching event
+      stray_files:    files in event folders with no Filter row
+      missing_files:  Filter rows whose file is gone (relinked from the blob if fix)
+      orphan_blobs:   stored blobs no Filter references
+    With fix=True, orphans are moved to the trash or deleted and missing files
+    whose blob still exists are restored. Files and blobs modified in the last
+    `grace` seconds are skipped, as an upload may not have committed its row yet.
+    """
+    from event.models import Event, Filter  # Avoid circular import
+    from event.storage import get_filter_storage
+
+    storage = get_filter_storage()
+    cutoff = time.time() - grace
+    report = {'orphan_folders': [], 'stray_files': [], 'missing_files': [], 'orphan_blobs': [], 'restored': []}
+    filters_root = os.path.join(settings.MEDIA_ROOT, FILTERS_DIR)
+
+    expected_folders = {event_folder_name(name) for name in Event.objects.values_list('name', flat=True).iterator()}
+    known_files = set()
+    for pk, name, digest in Filter.objects.values_list('id', 'file', 'sha256').iterator():
+        known_files.add(name)
+        if storage.exists(name):
+            continue
+        report['missing_files'].append(name)
+        if fix and digest and storage.exists(storage.blob_name(digest)):
+            storage.link(storage.blob_name(digest), name)
+            report['restored'].append(name)
+
+    if os.path.isdir(filters_root):
+        for folder in sorted(os.listdir(filters_root)):
+            path = os.path.join(filters_root, folder)
+            if not os.path.isdir(path):
+                continue
+            if folder not in expected_folders:
+                report['orphan_folders'].append(f"{FILTERS_DIR}/{folder}")
+                if fix:
+                    trash_folder(path)
+                continue
+            for filename in sorted(os.listdir(path)):
+                name = f"{FILTERS_DIR}/{folder}/{filename}"
+                if name not in known_files and os.path.getmtime(os.path.join(path, filename)) < cutoff:
+                    report['stray_files'].append(name)
+                    if fix:
+                        os.remove(os.path.join(path, filename))
+
+    blob_root = storage.path(storage.blob_root)
+    if os.path.isdir(blob_root):
+        on_disk = {
+            digest for folder, _, files in os.walk(blob_root) for digest in files
+            if os.path.getmtime(os.path.join(folder, digest)) < cutoff
+        }
+        referenced = set(Filter.objects.exclude(sha256='').values_list('sha256', flat=True).distinct().iterator())
+        report['orphan_blobs'] = sorted(on_disk - referenced)
+        if fix:
+            for digest in report['orphan_blobs']:
+                storage.delete_blob(digest)
+
+    return report
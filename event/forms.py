@@ -1,6 +1,14 @@
 from django import forms
 
-# 🔎 Form for searching events by name or year or both with two boxes
+# 🔎 Form for searching events by name or year or both with two boxes, plus list ordering
 class EventSearchForm(forms.Form):
     name = forms.CharField(required=False, label="Event Name")
-    year = forms.IntegerField(required=False, label="Year")
\ No newline at end of file
+    year = forms.IntegerField(required=False, label="Year")
+    sort = forms.ChoiceField(required=False, label="Sort by", choices=[
+        ('', 'Newest year'),
+        ('name', 'Name (A–Z)'),
+        ('-filters', 'Most presets'),
+        ('filters', 'Fewest presets'),
+        ('-size', 'Largest'),
+        ('size', 'Smallest'),
+    ])
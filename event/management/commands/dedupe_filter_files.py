@@ -0,0 +1,41 @@
+import os
+from django.core.management.base import BaseCommand
+from event.models import Filter
+from event.storage import get_filter_storage, file_sha256
+
+
+class Command(BaseCommand):
+    help = "Hash existing filter files and replace duplicates with hard links to one shared blob."
+
+    def handle(self, *args, **options):
+        storage = get_filter_storage()
+        linked = missing = saved_bytes = 0
+
+        for filter_obj in Filter.objects.filter(sha256='').iterator():
+            name = filter_obj.file.name
+            if not name or not storage.exists(name):
+                missing += 1
+                continue
+
+            with storage.open(name) as content:
+                digest = file_sha256(content)
+            path = storage.path(name)
+            blob_path = storage.path(storage.blob_name(digest))
+
+            if not os.path.exists(blob_path):
+                # First copy of these bytes becomes the blob
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                storage.link(name, storage.blob_name(digest))
+            elif not os.path.samefile(path, blob_path):
+                # Duplicate: swap the file for a link to the existing blob
+                saved_bytes += os.path.getsize(path)
+                tmp_name = f"{name}.dedupe"
+                storage.link(storage.blob_name(digest), tmp_name)
+                os.replace(storage.path(tmp_name), path)
+                linked += 1
+
+            Filter.objects.filter(pk=filter_obj.pk).update(sha256=digest)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Linked {linked} duplicate files ({saved_bytes} bytes reclaimed); {missing} filters had no file on disk."
+        ))
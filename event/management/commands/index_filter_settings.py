@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from event.models import Filter
+from event.xmp import index_filter_settings
+
+
+class Command(BaseCommand):
+    help = "Parse every filter's XMP file and rebuild its searchable develop settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing', action='store_true', help="Only index filters that have no settings yet.")
+
+    def handle(self, *args, **options):
+        filters = Filter.objects.all()
+        if options['missing']:
+            filters = filters.filter(settings__isnull=True)
+
+        indexed = settings = 0
+        for filter_obj in filters.iterator():
+            settings += index_filter_settings(filter_obj)
+            indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {settings} settings across {indexed} filters."))
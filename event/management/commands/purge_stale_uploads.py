@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from event.resumable import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete abandoned resumable uploads and their stored chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int, help="Idle seconds before an upload is abandoned (default: FILTER_UPLOAD_EXPIRE_AFTER).")
+
+    def handle(self, *args, **options):
+        removed = purge_stale_uploads(options['max_age'])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} stale upload(s)."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from event.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of events and filters from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help="Rows indexed per round trip.")
+
+    def handle(self, *args, **options):
+        total = rebuild_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} row(s)."))
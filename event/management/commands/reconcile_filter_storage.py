@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from event.consistency import reap_trash, reconcile
+
+
+class Command(BaseCommand):
+    help = "Find orphaned event folders, stray or missing filter files and unreferenced blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Trash orphans and restore missing files from their blobs.")
+        parser.add_argument('--reap', action='store_true', help="Also empty the trash left by deleted events.")
+        parser.add_argument('--grace', type=int, default=3600, help="Ignore files changed in the last N seconds (default 3600).")
+
+    def handle(self, *args, **options):
+        report = reconcile(fix=options['fix'], grace=options['grace'])
+
+        for key, label in [
+            ('orphan_folders', "Orphaned folders"),
+            ('stray_files', "Files without a filter"),
+            ('missing_files', "Filters without a file"),
+            ('orphan_blobs', "Unreferenced blobs"),
+            ('restored', "Restored from blobs"),
+        ]:
+            self.stdout.write(f"{label}: {len(report[key])}")
+            for item in report[key][:50]:
+                self.stdout.write(f"  {item}")
+
+        if options['reap']:
+            removed = reap_trash()
+            self.stdout.write(f"Reaped {removed} trash entr{'y' if removed == 1 else 'ies'}.")
+
+        if options['fix']:
+            self.stdout.write(self.style.SUCCESS("Storage reconciled."))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:12
+
+import event.models
+import event.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0003_alter_event_options_event_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filter',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='filter',
+            name='file',
+            field=models.FileField(storage=event.storage.get_filter_storage, upload_to=event.models.filter_upload_path, validators=[event.models.validate_filters_file]),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0004_filter_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilterSetting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('value_text', models.CharField(max_length=255)),
+                ('value_number', models.FloatField(blank=True, null=True)),
+                ('filter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='settings', to='event.filter')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'value_number'], name='event_filte_key_4d011b_idx'), models.Index(fields=['key', 'value_text'], name='event_filte_key_5b27e1_idx')],
+                'unique_together': {('filter', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from event import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_index(schema_editor.connection)
+    if not search.backend(schema_editor.connection):
+        return
+
+    Event = apps.get_model('event', 'Event')
+    Filter = apps.get_model('event', 'Filter')
+    search.index_objects('event', list(Event.objects.only('id', 'name')))
+    search.index_objects('filter', list(Filter.objects.only('id', 'event_id', 'name', 'tags')))
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0006_uploadsession'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:24
+
+import os
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_size_bytes(apps, schema_editor):
+    Filter = apps.get_model('event', 'Filter')
+
+    batch = []
+    for filter_obj in Filter.objects.filter(size_bytes=0).only('id', 'file').iterator(chunk_size=1000):
+        try:
+            filter_obj.size_bytes = os.path.getsize(os.path.join(settings.MEDIA_ROOT, filter_obj.file.name))
+        except (OSError, TypeError):
+            continue  # Missing file; reconcile_filter_storage reports it
+        batch.append(filter_obj)
+        if len(batch) >= 1000:
+            Filter.objects.bulk_update(batch, ['size_bytes'])
+            batch = []
+    Filter.objects.bulk_update(batch, ['size_bytes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filter',
+            name='size_bytes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_size_bytes, migrations.RunPython.noop),
+    ]
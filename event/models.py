@@ -1,8 +1,14 @@
-from django.db import models  # Base class for Django models
+from django.db import models, transaction  # Base class for Django models
 import os  # File and folder operations
-import shutil
+import uuid  # Unguessable ids for upload sessions
 from django.conf import settings  # Access project settings like MEDIA_ROOT
 from django.core.exceptions import ValidationError  # Raise validation errors
+from event.storage import get_filter_storage, file_sha256  # Deduplicating filter storage
+from event.xmp import index_filter_settings  # Parse develop settings on upload
+from event.consistency import (  # Keep event folders in step with the database
+    delete_event_files, delete_filter_file, event_folder_name, event_folder_path, move_event_folder, relink_filter_paths
+)
+from event.archive import invalidate_event_archive  # Cached ZIPs name the old paths after a rename
 
 # -------------------------------------------------------------------
 # Model: Event
@@ -24,34 +30,39 @@ class Event(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)  # Save to DB first
+        old_name = None
+        if self.pk:
+            old_name = Event.objects.filter(pk=self.pk).values_list('name', flat=True).first()
+
+        if old_name and event_folder_name(old_name) != event_folder_name(self.name):
+            # Rename: move the folder and repoint filter paths together; if the
+            # DB write fails the folder is moved back
+            with move_event_folder(old_name, self.name), transaction.atomic():
+                super().save(*args, **kwargs)
+                relink_filter_paths(self, old_name)
+            invalidate_event_archive(self)
+        else:
+            super().save(*args, **kwargs)  # Save to DB first
 
         # Create folder after saving (e.g., filters/Jomanji_Festival)
-        folder_name = self.name.replace(" ", "_")
-        folder_path = os.path.join(settings.MEDIA_ROOT, 'filters', folder_name)
-        os.makedirs(folder_path, exist_ok=True)
+        os.makedirs(event_folder_path(self.name), exist_ok=True)
 
     def delete(self, *args, **kwargs):
-        # First delete the physical folder
-        folder_name = self.name.replace(" ", "_")
-        folder_path = os.path.join(settings.MEDIA_ROOT, 'filters', folder_name)
-        
-        if os.path.exists(folder_path):
-            try:
-                shutil.rmtree(folder_path)
-                print(f"Deleted folder: {folder_path}")
-            except Exception as e:
-                print(f"Error deleting folder: {e}")
-        
-        # Then delete the database record
-        super().delete(*args, **kwargs)
+        # Remember which blobs this event's filters use before they cascade away
+        digests = set(self.filters.values_list('sha256', flat=True))
+
+        # Delete the database record; the folder is trashed once that commits
+        # and removed in the background, so large events don't block the request
+        result = super().delete(*args, **kwargs)
+        delete_event_files(self.name, digests)
+        return result
 
 # -------------------------------------------------------------------
 # Function: filter_upload_path
 # Purpose: Define dynamic upload path based on event name
 # -------------------------------------------------------------------
 def filter_upload_path(instance, filename):
-    folder = instance.event.name.replace(" ", "_")  # Clean folder name
+    folder = event_folder_name(instance.event.name)  # Clean folder name
     return f"filters/{folder}/{filename}"  # e.g., filters/Jomanji_Festival/vintage.xmp
 
 
@@ -73,12 +84,109 @@ class Filter(models.Model):
     name = models.CharField(max_length=255)  # e.g., "vintage"
     file = models.FileField(
         upload_to=filter_upload_path,  # Dynamic path based on event
+        storage=get_filter_storage,  # Stored once per content, hard-linked per event
         validators=[validate_filters_file]  # Restrict to .xmp files
     )
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # Content digest; rows sharing it share a blob
+    size_bytes = models.PositiveBigIntegerField(default=0)  # File size, stored so listings can sum it in SQL
     tags = models.CharField(max_length=255, blank=True)  # Optional tags for search/filtering
 
     class Meta:
         unique_together = ('event', 'name')  # ✅ Allows same filter name across different events
 
     def __str__(self):
-        return f"{self.name} [{self.event.name}]"
\ No newline at end of file
+        return f"{self.name} [{self.event.name}]"
+
+    def save(self, *args, **kwargs):
+        # Digest (and measure) new uploads so identical files can share a blob
+        new_file = bool(self.file) and not self.file._committed
+        if new_file:
+            self.sha256 = file_sha256(self.file)
+            self.size_bytes = self.file.size
+        super().save(*args, **kwargs)
+
+        # Index develop settings of new uploads for search
+        if new_file:
+            index_filter_settings(self)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        # Once committed, remove this event's link, then the blob if nothing else references it
+        delete_filter_file(self.file.name, self.sha256)
+        return result
+
+
+# -------------------------------------------------------------------
+# Model: FilterSetting
+# Purpose: One parsed crs: develop setting of a filter's XMP file, e.g.
+#          Exposure2012 = 0.5 or CameraProfile = "Adobe Standard"
+# -------------------------------------------------------------------
+class FilterSetting(models.Model):
+    filter = models.ForeignKey(Filter, on_delete=models.CASCADE, related_name='settings')
+    key = models.CharField(max_length=100)  # crs attribute name, e.g. "Exposure2012"
+    value_text = models.CharField(max_length=255)  # Raw value as written in the XMP
+    value_number = models.FloatField(null=True, blank=True)  # Parsed value for numeric settings
+
+    class Meta:
+        unique_together = ('filter', 'key')
+        indexes = [
+            models.Index(fields=['key', 'value_number']),  # Numeric range searches
+            models.Index(fields=['key', 'value_text']),  # Profile / text searches
+        ]
+
+    def __str__(self):
+        return f"{self.key}={self.value_text}"
+
+
+# -------------------------------------------------------------------
+# Function: collect_filter_blobs
+# Purpose: Delete stored blobs no Filter row references any more
+# -------------------------------------------------------------------
+def collect_filter_blobs(digests):
+    digests = {d for d in digests if d}
+    if not digests:
+        return
+    referenced = set(Filter.objects.filter(sha256__in=digests).values_list('sha256', flat=True))
+    storage = get_filter_storage()
+    for digest in digests - referenced:
+        storage.delete_blob(digest)
+
+
+# -------------------------------------------------------------------
+# Model: UploadSession
+# Purpose: A resumable, chunked upload of one .xmp file or ZIP bundle.
+#          Chunks are stored under MEDIA_ROOT/uploads/<id>/ until `offset`
+#          reaches `size`, then assembled and turned into Filter rows.
+# -------------------------------------------------------------------
+class UploadSession(models.Model):
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='upload_sessions')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)  # Original name; .xmp or .zip
+    size = models.BigIntegerField()  # Total bytes announced by the client
+    sha256 = models.CharField(max_length=64, blank=True)  # Optional whole-file digest checked after assembly
+    offset = models.BigIntegerField(default=0)  # Bytes received so far; the resume point
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+    result = models.JSONField(null=True, blank=True)  # Per-file report once complete
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Last chunk; used to expire abandoned uploads
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),  # Stale session cleanup
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def chunk_dir(self):
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', str(self.id))
@@ -0,0 +1,178 @@
+import hashlib  # Chunk and whole-file checksums
+import logging
+import os  # Chunk files and atomic renames
+import shutil  # Remove a session's chunk folder
+import uuid  # Chunk folders are named by session id
+from datetime import timedelta
+from django.conf import settings  # MEDIA_ROOT and upload limits
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from event.models import UploadSession
+from event.uploads import batch_create_filters
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------
+# Resumable upload protocol (tus-like, offset based)
+#   POST   /api/uploads/                 start: {event, filename, size, sha256?}
+#   HEAD   /api/uploads/<id>/            resume point in the Upload-Offset header
+#   PATCH  /api/uploads/<id>/            raw chunk body with Upload-Offset and
+#                                        Upload-Checksum: sha256 <hex> headers
+#   DELETE /api/uploads/<id>/            abort and discard received chunks
+# Each chunk is a short request, so no worker is held for the whole upload.
+# The chunk that reaches `size` triggers assembly and Filter creation.
+# -------------------------------------------------------------------
+
+class OffsetMismatch(Exception):
+    """The client's Upload-Offset is not where the session currently is."""
+
+    def __init__(self, offset):
+        super().__init__(f"Expected offset {offset}.")
+        self.offset = offset
+
+
+class ChecksumMismatch(Exception):
+    """A chunk (or the assembled file) does not match its declared checksum."""
+
+
+def _chunk_path(session, offset):
+    # Zero-padded offsets keep chunk files in byte order when sorted
+    return os.path.join(session.chunk_dir, f"{offset:015d}.chunk")
+
+
+def parse_checksum(header):
+    """
+    Parse an "Upload-Checksum: sha256 <hex>" header. Returns the hex digest,
+    or None when absent. Other algorithms are rejected with ValueError.
+    """
+    if not header:
+        return None
+    algorithm, _, digest = header.strip().partition(' ')
+    if algorithm.lower() != 'sha256' or len(digest) != 64:
+        raise ValueError("Upload-Checksum must be 'sha256 <hex digest>'.")
+    return digest.lower()
+
+
+def append_chunk(session_id, offset, data, checksum=None):
+    """
+    Store one chunk at `offset` and advance the session.
+    Raises OffsetMismatch if the chunk is not the next expected one (the client
+    should HEAD and resume from the returned offset) and ChecksumMismatch if
+    the bytes were corrupted in transit. Returns the updated session.
+    """
+    if checksum and hashlib.sha256(data).hexdigest() != checksum:
+        raise ChecksumMismatch("Chunk checksum does not match.")
+
+    with transaction.atomic():
+        # Row lock serialises concurrent PATCHes of the same session
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.status != 'uploading':
+            raise OffsetMismatch(session.offset)
+        if offset != session.offset or not data or offset + len(data) > session.size:
+            raise OffsetMismatch(session.offset)
+
+        os.makedirs(session.chunk_dir, exist_ok=True)
+        path = _chunk_path(session, offset)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+        session.offset = offset + len(data)
+        session.save(update_fields=['offset', 'updated_at'])
+
+    if session.offset == session.size:
+        complete_upload(session)
+    return session
+
+
+def _assemble(session):
+    # Concatenate chunks in offset order into one file, hashing as we go
+    target = os.path.join(session.chunk_dir, 'assembled')
+    digest = hashlib.sha256()
+    with open(target, 'wb') as out:
+        for name in sorted(os.listdir(session.chunk_dir)):
+            if not name.endswith('.chunk'):
+                continue
+            with open(os.path.join(session.chunk_dir, name), 'rb') as chunk:
+                for block in iter(lambda: chunk.read(64 * 1024), b''):
+                    digest.update(block)
+                    out.write(block)
+    return target, digest.hexdigest()
+
+
+def complete_upload(session):
+    """
+    Assemble a fully received session, verify its whole-file checksum and
+    create its filters (a .zip bundle expands to one filter per .xmp).
+    The per-file report is stored on the session; chunks are removed.
+    """
+    try:
+        path, digest = _assemble(session)
+        if session.sha256 and digest != session.sha256.lower():
+            raise ChecksumMismatch("Assembled file checksum does not match.")
+
+        with open(path, 'rb') as f:
+            session.result = batch_create_filters(session.event, [File(f, name=session.filename)])
+        session.status = 'complete'
+    except (ChecksumMismatch, OSError) as e:
+        session.status = 'failed'
+        session.error = str(e)
+    except Exception:
+        # Anything else must still end the session, or it stays 'uploading' at offset == size
+        logger.exception("Could not process upload %s", session.pk)
+        session.status = 'failed'
+        session.error = "The upload could not be processed."
+    finally:
+        shutil.rmtree(session.chunk_dir, ignore_errors=True)
+
+    session.save(update_fields=['status', 'result', 'error', 'updated_at'])
+    return session
+
+
+def abort_upload(session):
+    session.delete()  # The post_delete receiver removes the chunks
+
+
+def purge_stale_uploads(max_age=None):
+    """
+    Delete unfinished sessions idle for longer than `max_age` seconds
+    (FILTER_UPLOAD_EXPIRE_AFTER by default) together with their chunks, and
+    chunk folders as old whose session no longer exists.
+    Returns the number of sessions removed.
+    """
+    max_age = max_age or settings.FILTER_UPLOAD_EXPIRE_AFTER
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    stale = UploadSession.objects.filter(status='uploading', updated_at__lt=cutoff)
+
+    count = 0
+    for session in stale.iterator():
+        abort_upload(session)
+        count += 1
+
+    _sweep_orphaned_chunks(cutoff.timestamp())
+    return count
+
+
+def _sweep_orphaned_chunks(cutoff):
+    root = os.path.join(settings.MEDIA_ROOT, 'uploads')
+    try:
+        entries = [entry for entry in os.scandir(root) if entry.is_dir() and entry.stat().st_mtime < cutoff]
+    except FileNotFoundError:
+        return
+    known = {
+        str(pk) for pk in
+        UploadSession.objects.filter(pk__in=_valid_uuids(entry.name for entry in entries)).values_list('pk', flat=True)
+    }
+    for entry in entries:
+        if entry.name not in known:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _valid_uuids(names):
+    for name in names:
+        try:
+            yield uuid.UUID(name)
+        except ValueError:
+            pass
@@ -0,0 +1,229 @@
+import re  # Query tokenising
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+# -------------------------------------------------------------------
+# Full-text search over event names, filter names and filter tags.
+# Everything lives in one `search_index` table with a row per object:
+#   kind ("event"/"filter"), object_id, event_id, title, tags
+# On SQLite it is an FTS5 virtual table ranked with bm25(); on PostgreSQL a
+# plain table with a generated, GIN-indexed tsvector ranked with ts_rank().
+# Rows are kept current by the signals in event/signals.py. Other backends
+# fall back to icontains lookups.
+# -------------------------------------------------------------------
+
+TABLE = 'search_index'
+KINDS = ('event', 'filter')
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+        kind UNINDEXED, object_id UNINDEXED, event_id UNINDEXED, title, tags,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+]
+
+POSTGRES_SCHEMA = [
+    f"""CREATE TABLE IF NOT EXISTS {TABLE} (
+        kind varchar(10) NOT NULL,
+        object_id bigint NOT NULL,
+        event_id bigint NOT NULL,
+        title text NOT NULL,
+        tags text NOT NULL DEFAULT '',
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', tags), 'B')
+        ) STORED,
+        PRIMARY KEY (kind, object_id)
+    )""",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_document_idx ON {TABLE} USING GIN (document)",
+]
+
+
+def backend(conn=None):
+    vendor = (conn or connection).vendor
+    return vendor if vendor in ('sqlite', 'postgresql') else None
+
+
+def create_index(conn=None):
+    conn = conn or connection
+    statements = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRES_SCHEMA}.get(backend(conn), [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def drop_index(conn=None):
+    conn = conn or connection
+    if backend(conn):
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+def tokens(query):
+    return TOKEN_RE.findall(query.lower())[:10]  # Cap terms so a pasted paragraph stays cheap
+
+
+def match_expression(query, conn=None):
+    """
+    Build the backend's prefix-matching query from free text, or None if the
+    text has no searchable words. Every word must match as a prefix (AND),
+    so "wed ven" finds "Wedding Venice".
+    Words are reduced to \\w characters first, so user input never reaches
+    the FTS/tsquery syntax.
+    """
+    words = tokens(query)
+    if not words:
+        return None
+    if backend(conn) == 'postgresql':
+        return ' & '.join(f"{word}:*" for word in words)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+# -------------------------------------------------------------------
+# Index maintenance
+# -------------------------------------------------------------------
+def _rows(kind, objects):
+    if kind == 'event':
+        return [(kind, obj.pk, obj.pk, obj.name, '') for obj in objects]
+    return [(kind, obj.pk, obj.event_id, obj.name, (obj.tags or '').replace(',', ' ')) for obj in objects]
+
+
+def _rowid(kind, pk):
+    # FTS5 only indexes its text columns, so rows are addressed by a rowid
+    # derived from (kind, id): events even, filters odd
+    return pk * 2 + (kind == 'filter')
+
+
+def index_objects(kind, objects):
+    """Insert or replace the index rows of saved Event or Filter objects."""
+    rows = _rows(kind, objects)
+    if not rows or not backend():
+        return
+    with connection.cursor() as cursor:
+        if backend() == 'postgresql':
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (kind, object_id, event_id, title, tags) VALUES (%s, %s, %s, %s, %s) "
+                f"ON CONFLICT (kind, object_id) DO UPDATE SET event_id = EXCLUDED.event_id, "
+                f"title = EXCLUDED.title, tags = EXCLUDED.tags",
+                rows,
+            )
+        else:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {TABLE} (rowid, kind, object_id, event_id, title, tags) "
+                f"VALUES (%s, %s, %s, %s, %s, %s)",
+                [(_rowid(kind, row[1]), *row) for row in rows],
+            )
+
+
+def remove_objects(kind, ids):
+    ids = list(ids)
+    if not ids or not backend():
+        return
+    with connection.cursor() as cursor:
+        if backend() == 'postgresql':
+            cursor.executemany(f"DELETE FROM {TABLE} WHERE kind = %s AND object_id = %s", [(kind, pk) for pk in ids])
+        else:
+            cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [(_rowid(kind, pk),) for pk in ids])
+
+
+def rebuild_index(batch_size=2000):
+    """Recreate every row from the Event and Filter tables. Returns rows indexed."""
+    from event.models import Event, Filter  # Avoid circular import
+
+    if not backend():
+        return 0
+    create_index()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+
+    total = 0
+    sources = [
+        ('event', Event.objects.only('id', 'name')),
+        ('filter', Filter.objects.only('id', 'event_id', 'name', 'tags')),
+    ]
+    for kind, queryset in sources:
+        batch = []
+        for obj in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                index_objects(kind, batch)
+                total += len(batch)
+                batch = []
+        index_objects(kind, batch)
+        total += len(batch)
+    return total
+
+
+# -------------------------------------------------------------------
+# Queries
+# -------------------------------------------------------------------
+def _ranked_sql():
+    # Lower bm25() is better, so negate it to get "higher score is better" everywhere
+    if backend() == 'postgresql':
+        return (
+            f"SELECT kind, object_id, ts_rank(document, to_tsquery('simple', %s)) AS score "
+            f"FROM {TABLE} WHERE document @@ to_tsquery('simple', %s) {{kinds}} "
+            f"ORDER BY score DESC, object_id DESC LIMIT %s",
+            2,
+        )
+    return (
+        f"SELECT kind, object_id, -bm25({TABLE}, 0, 0, 0, 10.0, 3.0) AS score "
+        f"FROM {TABLE} WHERE {TABLE} MATCH %s {{kinds}} "
+        f"ORDER BY score DESC, object_id DESC LIMIT %s",
+        1,
+    )
+
+
+def search(query, kinds=KINDS, limit=20):
+    """
+    Ranked prefix search. Returns [(kind, object_id, score)], best first.
+    Title matches outrank tag matches.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+
+    if not backend():
+        return _fallback_search(query, kinds, limit)
+
+    sql, repeats = _ranked_sql()
+    kind_filter = f"AND kind IN ({', '.join(['%s'] * len(kinds))})"
+    params = [expression] * repeats + list(kinds) + [limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(kinds=kind_filter), params)
+        return [(kind, int(object_id), float(score)) for kind, object_id, score in cursor.fetchall()]
+
+
+def matching_ids(query, kind):
+    """
+    Subquery of object ids of one kind matching `query`, for use as
+    `Model.objects.filter(id__in=matching_ids(...))` so filtering, ordering and
+    pagination stay in one SQL statement. Returns None if nothing is searchable.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return None
+    if backend() == 'postgresql':
+        sql = f"SELECT object_id FROM {TABLE} WHERE kind = %s AND document @@ to_tsquery('simple', %s)"
+    elif backend() == 'sqlite':
+        sql = f"SELECT object_id FROM {TABLE} WHERE kind = %s AND {TABLE} MATCH %s"
+    else:
+        return _fallback_ids(query, kind)
+    return RawSQL(sql, (kind, expression))
+
+
+def _fallback_ids(query, kind):
+    from event.models import Event, Filter  # Avoid circular import
+
+    model = Event if kind == 'event' else Filter
+    queryset = model.objects.all()
+    for word in tokens(query):
+        queryset = queryset.filter(name__icontains=word)
+    return queryset.values('pk')
+
+
+def _fallback_search(query, kinds, limit):
+    results = []
+    for kind in kinds:
+        results += [(kind, pk, 0.0) for pk in _fallback_ids(query, kind).values_list('pk', flat=True)[:limit]]
+    return results[:limit]
@@ -0,0 +1,29 @@
+import os
+from django.conf import settings
+from rest_framework import serializers
+from .models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'event', 'filename', 'size', 'sha256', 'offset', 'status', 'result', 'error', 'created_at']
+        read_only_fields = ['id', 'offset', 'status', 'result', 'error', 'created_at']
+
+    def validate_filename(self, value):
+        value = os.path.basename(value.replace('\\', '/'))
+        if not value.lower().endswith(('.xmp', '.zip')):
+            raise serializers.ValidationError("Only .xmp files or .zip bundles can be uploaded.")
+        return value
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Size must be positive.")
+        if value > settings.FILTER_RESUMABLE_MAX_SIZE:
+            raise serializers.ValidationError(f"Uploads are limited to {settings.FILTER_RESUMABLE_MAX_SIZE} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        if value and len(value) != 64:
+            raise serializers.ValidationError("Expected a hex SHA-256 digest.")
+        return value.lower()
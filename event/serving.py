@@ -0,0 +1,132 @@
+import mimetypes  # Guess Content-Type from the file name
+import os  # stat() and paths
+import re  # Range header parsing
+from urllib.parse import quote  # Escape internal redirect paths
+from django.conf import settings  # MEDIA_ROOT and serving backend
+from django.core.exceptions import SuspiciousFileOperation  # Raised by safe_join
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join  # Refuse paths escaping MEDIA_ROOT
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024  # Bytes read per chunk for partial responses
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# -------------------------------------------------------------------
+# Function: parse_range
+# Purpose: Turn a single "bytes=a-b" Range header into (start, end), both
+#          inclusive. Returns None to send the whole file (no/ignored Range)
+#          and raises ValueError for an unsatisfiable range.
+#          Multi-range requests are answered with the full file, which
+#          RFC 9110 allows.
+# -------------------------------------------------------------------
+def parse_range(header, size):
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(0, size - int(last)), size - 1  # Suffix range: last N bytes
+
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _range_applies(request, etag, last_modified):
+    # If-Range: only honour Range when the client's copy is still current
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag  # Strong comparison
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+# -------------------------------------------------------------------
+# Function: serve_media
+# Purpose: Serve a file under MEDIA_ROOT after the caller has checked access.
+#   name:         storage name relative to MEDIA_ROOT
+#   etag:         strong validator (e.g. content digest); defaults to mtime+size
+#   filename:     download name for Content-Disposition
+#
+# Conditional requests (If-None-Match / If-Modified-Since) are answered with
+# 304 before touching the file. The body is then handed to the front-end
+# server (FILE_SERVE_BACKEND = "nginx" -> X-Accel-Redirect, "sendfile" ->
+# X-Sendfile), or sent by Django: whole files via FileResponse, which WSGI
+# servers turn into os.sendfile(), and single byte ranges as 206 responses.
+# -------------------------------------------------------------------
+def serve_media(request, name, etag=None, filename=None, content_type=None):
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+        stat = os.stat(path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("File not found")
+
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = quote_etag(etag or f"{stat.st_mtime_ns:x}-{size:x}")
+    filename = filename or os.path.basename(name)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, path, name, size, etag, last_modified, content_type)
+        response['Content-Disposition'] = content_disposition_header(True, filename)  # Escapes quotes, RFC 5987 for non-ASCII
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)  # Always revalidate; 304 when unchanged
+    return response
+
+
+def _file_response(request, path, name, size, etag, last_modified, content_type):
+    backend = settings.FILE_SERVE_BACKEND
+
+    if backend == 'nginx':
+        # nginx serves the bytes (ranges included) from its internal location
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(settings.FILE_SERVE_INTERNAL_URL + name)
+        return response
+    if backend == 'sendfile':
+        # Apache mod_xsendfile / lighttpd take an absolute path
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+        return response
+
+    byte_range = None
+    if request.method in ('GET', 'HEAD') and _range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(path, start, end), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,43 @@
+import shutil  # Remove a deleted upload session's chunk folder
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from event.models import Event, Filter, UploadSession
+from event import search
+from event.typeahead import invalidate_typeahead
+
+
+# -------------------------------------------------------------------
+# Keep the full-text search index (and the event typeahead cache) in step
+# with Event/Filter rows.
+# bulk_create() sends no signals; callers using it index the new rows
+# themselves (see event.uploads.batch_create_filters).
+# -------------------------------------------------------------------
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, **kwargs):
+    search.index_objects('event', [instance])
+    invalidate_typeahead()
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+    search.remove_objects('event', [instance.pk])
+    invalidate_typeahead()
+
+
+@receiver(post_save, sender=Filter)
+def index_filter(sender, instance, **kwargs):
+    search.index_objects('filter', [instance])
+
+
+@receiver(post_delete, sender=Filter)
+def unindex_filter(sender, instance, **kwargs):
+    search.remove_objects('filter', [instance.pk])
+
+
+# Chunks of an upload session go with it, including sessions removed by
+# deleting their event; only once the deletion has committed.
+@receiver(post_delete, sender=UploadSession)
+def remove_upload_chunks(sender, instance, **kwargs):
+    transaction.on_commit(partial(shutil.rmtree, instance.chunk_dir, ignore_errors=True))
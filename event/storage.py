@@ -0,0 +1,63 @@
+import hashlib  # Content digests
+import os  # Hard links and folder creation
+import shutil  # Copy fallback when hard links are unavailable
+from django.core.files.storage import FileSystemStorage  # Base local storage
+
+
+# -------------------------------------------------------------------
+# Function: file_sha256
+# Purpose: Hex SHA-256 of a Django File, leaving it rewound for the next reader
+# -------------------------------------------------------------------
+def file_sha256(content):
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+# -------------------------------------------------------------------
+# Class: ContentAddressedStorage
+# Purpose: Store each distinct file once under blobs/<aa>/<sha256> and expose
+#          it at its usual per-event path (filters/<Event>/<file>) as a hard
+#          link, so the same preset uploaded to many events uses disk once.
+# -------------------------------------------------------------------
+class ContentAddressedStorage(FileSystemStorage):
+    blob_root = 'blobs'
+
+    def blob_name(self, digest):
+        return f"{self.blob_root}/{digest[:2]}/{digest}"
+
+    def _save(self, name, content):
+        blob_name = self.blob_name(file_sha256(content))
+
+        # Write the blob only the first time these bytes are seen
+        if not self.exists(blob_name):
+            saved = super()._save(blob_name, content)
+            if saved != blob_name:  # Lost a race with an identical upload
+                super().delete(saved)
+
+        self.link(blob_name, name)
+        return name
+
+    def link(self, blob_name, name):
+        target = self.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(self.path(blob_name), target)
+        except FileExistsError:
+            raise
+        except OSError:
+            # Filesystems without hard links get a plain copy
+            shutil.copyfile(self.path(blob_name), target)
+
+    def delete_blob(self, digest):
+        super().delete(self.blob_name(digest))
+
+
+filter_storage = ContentAddressedStorage()
+
+
+def get_filter_storage():
+    return filter_storage
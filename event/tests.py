@@ -1,3 +1,794 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import uuid
+import zipfile
+import zlib
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from event.archive import archive_cache_path, archive_fingerprint, stream_filters_zip
+from event.consistency import reap_trash
+from event.models import Event, Filter, UploadSession
+from event.resumable import purge_stale_uploads
+from event.search import search
+from event.serving import serve_media
+from event.storage import get_filter_storage
+from event.uploads import batch_create_filters
+from event.xmp import filters_matching_settings, parse_crs_settings
+
+
+def xmp(exposure='+0.50'):
+    return (
+        '<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+        '<rdf:Description xmlns:crs="http://ns.adobe.com/camera-raw-settings/1.0/" '
+        f'crs:Exposure2012="{exposure}"/></rdf:RDF></x:xmpmeta>'
+    ).encode()
+
+
+class MediaTestCase(TestCase):
+    """
+    Runs each test against an empty temporary MEDIA_ROOT.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.storage = get_filter_storage()
+
+    def make_filter(self, event, name, content=None):
+        return Filter.objects.create(event=event, name=name, file=ContentFile(content or xmp(), name=f'{name}.xmp'))
+
+    def blob_path(self, filter_obj):
+        return self.storage.path(self.storage.blob_name(filter_obj.sha256))
+
+
+class FilterBlobTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = Event.objects.create(name='First Event', year=2025)
+        self.second = Event.objects.create(name='Second Event', year=2025)
+
+    def test_identical_uploads_share_one_blob(self):
+        a = self.make_filter(self.first, 'vintage')
+        b = self.make_filter(self.second, 'vintage')
+
+        self.assertEqual(a.sha256, b.sha256)
+        self.assertEqual(a.file.name, 'filters/First_Event/vintage.xmp')
+        self.assertTrue(os.path.samefile(a.file.path, b.file.path))
+        self.assertTrue(os.path.samefile(a.file.path, self.blob_path(a)))
+        self.assertEqual(a.size_bytes, len(xmp()))
+
+    def test_different_content_gets_its_own_blob(self):
+        a = self.make_filter(self.first, 'vintage')
+        b = self.make_filter(self.second, 'vintage', xmp('-1.00'))
+        self.assertNotEqual(a.sha256, b.sha256)
+        self.assertFalse(os.path.samefile(a.file.path, b.file.path))
+
+    def test_deleting_one_copy_keeps_the_blob(self):
+        a = self.make_filter(self.first, 'vintage')
+        b = self.make_filter(self.second, 'vintage')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            a.delete()
+
+        self.assertFalse(os.path.exists(a.file.path))
+        self.assertTrue(os.path.exists(self.blob_path(b)))
+        with open(b.file.path, 'rb') as f:
+            self.assertEqual(f.read(), xmp())
+
+    def test_deleting_the_last_copy_removes_the_blob(self):
+        a = self.make_filter(self.first, 'vintage')
+        b = self.make_filter(self.second, 'vintage')
+        blob = self.blob_path(a)
+
+        for filter_obj in (a, b):
+            with self.captureOnCommitCallbacks(execute=True):
+                filter_obj.delete()
+
+        self.assertFalse(os.path.exists(blob))
+        self.assertFalse(os.path.exists(b.file.path))
+
+    def test_dedupe_command_links_existing_copies(self):
+        # Files written before content-addressed storage: separate copies, no digest
+        rows = []
+        for event in (self.first, self.second):
+            name = f'filters/{event.name.replace(" ", "_")}/legacy.xmp'
+            os.makedirs(os.path.dirname(self.storage.path(name)), exist_ok=True)
+            with open(self.storage.path(name), 'wb') as f:
+                f.write(xmp())
+            rows.append(Filter(event=event, name='legacy', file=name))
+        Filter.objects.bulk_create(rows)
+
+        call_command('dedupe_filter_files', stdout=StringIO())
+
+        a, b = Filter.objects.filter(name='legacy').order_by('event__name')
+        self.assertTrue(a.sha256)
+        self.assertEqual(a.sha256, b.sha256)
+        self.assertTrue(os.path.samefile(a.file.path, b.file.path))
+        self.assertTrue(os.path.samefile(a.file.path, self.blob_path(a)))
+
+
+class ArchiveCacheTests(MediaTestCase):
+    def test_concurrent_downloads_each_complete_the_cache(self):
+        event = Event.objects.create(name='Zip Event', year=2025)
+        for n in range(3):
+            self.make_filter(event, f'preset{n}', xmp(f'+0.{n}0'))
+        filters = list(event.filters.order_by('name'))
+        cache_path = archive_cache_path(event, archive_fingerprint(event.filters.all()))
+
+        # Interleave two streams of the same archive, as two threads would
+        first, second = stream_filters_zip(filters, cache_path), stream_filters_zip(filters, cache_path)
+        first_bytes, second_bytes = [next(first)], [next(second)]
+        first_bytes += list(first)
+        second_bytes += list(second)
+
+        self.assertEqual(b''.join(first_bytes), b''.join(second_bytes))
+        with zipfile.ZipFile(cache_path) as archive:
+            self.assertEqual(archive.namelist(), ['preset0.xmp', 'preset1.xmp', 'preset2.xmp'])
+        self.assertEqual([name for name in os.listdir(os.path.dirname(cache_path)) if name.endswith('.tmp')], [])
+
+
+    def test_streamed_and_cached_downloads_send_the_same_name(self):
+        event = Event.objects.create(name='Café "Noir"', year=2025)
+        self.make_filter(event, 'preset')
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+        url = reverse('dashboard:download_event_filters', args=[event.pk])
+
+        streamed = self.client.get(url)
+        b''.join(streamed.streaming_content)  # Completes the cached copy
+        cached = self.client.get(url)
+
+        self.assertFalse(streamed.has_header('Accept-Ranges'))
+        self.assertEqual(cached['Accept-Ranges'], 'bytes')  # Served from the cache by serve_media
+        expected = "attachment; filename*=utf-8''Caf%C3%A9_%22Noir%22_filters.zip"
+        self.assertEqual(streamed['Content-Disposition'], expected)
+        self.assertEqual(cached['Content-Disposition'], expected)
+
+class ServeMediaTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.name = 'filters/Serve/preset.xmp'
+        self.data = bytes(range(256)) * 4
+        os.makedirs(os.path.join(self.media_root, 'filters', 'Serve'))
+        with open(os.path.join(self.media_root, self.name), 'wb') as f:
+            f.write(self.data)
+
+    def serve(self, headers=None, **kwargs):
+        return serve_media(self.factory.get('/', headers=headers or {}), self.name, **kwargs)
+
+    def test_whole_file(self):
+        response = self.serve(etag='abc')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_byte_range_is_partial_content(self):
+        response = self.serve({'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.data)}')
+        self.assertEqual(b''.join(response.streaming_content), self.data[10:20])
+
+        suffix = self.serve({'Range': 'bytes=-4'})
+        self.assertEqual(b''.join(suffix.streaming_content), self.data[-4:])
+
+    def test_unsatisfiable_range(self):
+        response = self.serve({'Range': f'bytes={len(self.data)}-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_stale_if_range_sends_whole_file(self):
+        response = self.serve({'Range': 'bytes=0-9', 'If-Range': '"old"'}, etag='abc')
+        self.assertEqual(response.status_code, 200)
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.serve({'If-None-Match': '"abc"'}, etag='abc')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.serve({'If-None-Match': '"other"'}, etag='abc').status_code, 200)
+
+    @override_settings(FILE_SERVE_BACKEND='nginx', FILE_SERVE_INTERNAL_URL='/protected-media/')
+    def test_nginx_backend_redirects_internally(self):
+        response = self.serve()
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/filters/Serve/preset.xmp')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(FILE_SERVE_BACKEND='sendfile')
+    def test_sendfile_backend_passes_the_path(self):
+        response = self.serve()
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.media_root, self.name))
+
+    def test_download_name_is_escaped(self):
+        response = self.serve(filename='Boda "Sol".xmp')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Boda \\"Sol\\".xmp"')
+        response = self.serve(filename='Café.xmp')
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=utf-8''Caf%C3%A9.xmp")
+
+    def test_paths_outside_media_root_are_not_found(self):
+        with self.assertRaises(Http404):
+            serve_media(self.factory.get('/'), '../secret.txt')
+
+
+class ResumableUploadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user('senior', password='x', role='senior')
+        self.client.force_login(self.user)
+        self.event = Event.objects.create(name='Upload Event', year=2025)
+        self.data = xmp()
+
+    def start(self, **extra):
+        body = {'event': self.event.pk, 'filename': 'look.xmp', 'size': len(self.data), **extra}
+        response = self.client.post(reverse('upload_session_create'), body, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return UploadSession.objects.get(pk=response.json()['id'])
+
+    def send(self, session, offset, chunk, **headers):
+        return self.client.patch(
+            reverse('upload_session', args=[session.pk]), chunk,
+            content_type='application/offset+octet-stream', headers={'Upload-Offset': offset, **headers},
+        )
+
+    def test_create_reports_offset_zero(self):
+        response = self.client.post(
+            reverse('upload_session_create'),
+            {'event': self.event.pk, 'filename': 'look.xmp', 'size': len(self.data)},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Upload-Offset'], '0')
+        self.assertEqual(response['Upload-Length'], str(len(self.data)))
+
+    def test_junior_editors_cannot_upload(self):
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+        response = self.client.post(reverse('upload_session_create'), {}, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_offset_header_is_validated(self):
+        session = self.start()
+        url = reverse('upload_session', args=[session.pk])
+
+        response = self.client.patch(url, b'x', content_type='application/offset+octet-stream')
+        self.assertEqual(response.json(), {'error': "Upload-Offset header is required."})
+        for bad in ('abc', '-1', '1.5'):
+            response = self.send(session, bad, b'x')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'error': "Upload-Offset must be a non-negative integer."})
+
+    def test_resume_after_stale_offset(self):
+        session = self.start()
+        self.assertEqual(self.send(session, '0', self.data[:10]).status_code, 200)
+
+        head = self.client.head(reverse('upload_session', args=[session.pk]))
+        self.assertEqual(head['Upload-Offset'], '10')
+
+        conflict = self.send(session, '0', self.data[:10])
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.json()['offset'], 10)
+
+        bad_checksum = self.send(session, '10', self.data[10:20], **{'Upload-Checksum': f"sha256 {'0' * 64}"})
+        self.assertEqual(bad_checksum.status_code, 400)
+        session.refresh_from_db()
+        self.assertEqual(session.offset, 10)
+
+    def test_last_chunk_creates_the_filter(self):
+        session = self.start(sha256=hashlib.sha256(self.data).hexdigest())
+        self.send(session, '0', self.data[:10])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.send(session, '10', self.data[10:])
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['status'], 'complete')
+        self.assertEqual(Filter.objects.get(event=self.event).name, 'look')
+        self.assertFalse(os.path.exists(session.chunk_dir))
+
+    def test_checksum_mismatch_fails_the_session(self):
+        session = self.start(sha256='0' * 64)
+        response = self.send(session, '0', self.data)
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Filter.objects.exists())
+
+    def test_corrupt_bundle_member_is_reported(self):
+        bad = xmp('-0.20')
+        self.data = corrupt_member(zip_upload({'bad.xmp': bad, 'good.xmp': xmp()}), bad, bad.replace(b'-0.20', b'-0.90')).read()
+        session = self.start(filename='bundle.zip')
+        response = self.send(session, '0', self.data)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual({row['file']: row['status'] for row in response.json()['result']}, {'bad.xmp': 'invalid', 'good.xmp': 'created'})
+
+    def test_processing_errors_fail_the_session(self):
+        session = self.start()
+        with mock.patch('event.resumable.batch_create_filters', side_effect=RuntimeError("boom")), \
+                self.assertLogs('event.resumable', 'ERROR'):
+            response = self.send(session, '0', self.data)
+
+        self.assertEqual(response.status_code, 422)
+        session.refresh_from_db()
+        self.assertEqual((session.status, session.error), ('failed', "The upload could not be processed."))
+        self.assertFalse(os.path.exists(session.chunk_dir))
+
+    def test_deleting_the_event_removes_its_chunks(self):
+        session = self.start()
+        self.send(session, '0', self.data[:10])
+        self.assertTrue(os.path.isdir(session.chunk_dir))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertFalse(os.path.exists(session.chunk_dir))
+
+    def test_purge_removes_stale_sessions_and_orphaned_chunks(self):
+        session = self.start()
+        self.send(session, '0', self.data[:10])
+        orphan = os.path.join(self.media_root, 'uploads', str(uuid.uuid4()))
+        os.makedirs(orphan)
+        old = time.time() - 2 * 3600
+        os.utime(orphan, (old, old))
+        os.utime(session.chunk_dir, (old, old))
+        UploadSession.objects.filter(pk=session.pk).update(updated_at=timezone.now() - timedelta(hours=2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(purge_stale_uploads(max_age=3600), 1)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(session.chunk_dir))
+        self.assertFalse(os.path.exists(orphan))
+
+
+@mock.patch('event.consistency.threading.Thread')  # Reap in the test, not on a daemon thread
+class EventFolderConsistencyTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = Event.objects.create(name='Old Name', year=2025)
+        self.filter = self.make_filter(self.event, 'vintage')
+        self.user = get_user_model().objects.create_user('senior', password='x', role='senior')
+        self.client.force_login(self.user)
+
+    def folder(self, name):
+        return os.path.join(self.media_root, 'filters', name)
+
+    def edit(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('dashboard:edit_event', args=[self.event.pk]), {'name': name, 'year': 2025})
+
+    def test_rename_moves_folder_and_filter_paths(self, thread):
+        response = self.edit('New Name')
+        self.assertRedirects(response, reverse('dashboard:event_folder_list'), fetch_redirect_response=False)
+
+        self.filter.refresh_from_db()
+        self.assertEqual(self.filter.file.name, 'filters/New_Name/vintage.xmp')
+        self.assertTrue(os.path.isfile(self.filter.file.path))
+        self.assertFalse(os.path.exists(self.folder('Old_Name')))
+
+    def test_rename_onto_non_empty_folder_is_a_form_error(self, thread):
+        os.makedirs(self.folder('Taken'))
+        with open(os.path.join(self.folder('Taken'), 'keep.xmp'), 'wb') as f:
+            f.write(xmp())
+
+        response = self.edit('Taken')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('name', response.context['form'].errors)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.name, 'Old Name')
+        self.assertTrue(os.path.isfile(os.path.join(self.folder('Old_Name'), 'vintage.xmp')))
+
+    def test_failed_folder_move_is_a_form_error(self, thread):
+        with mock.patch('event.consistency._link_tree', side_effect=FileExistsError):
+            response = self.edit('New Name')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['form'].errors['name'], ["The event folder could not be renamed. Choose another name."])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.name, 'Old Name')
+        self.filter.refresh_from_db()
+        self.assertEqual(self.filter.file.name, 'filters/Old_Name/vintage.xmp')
+
+    def test_delete_trashes_folder_and_reaps_blob(self, thread):
+        blob = self.blob_path(self.filter)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+
+        self.assertFalse(os.path.exists(self.folder('Old_Name')))
+        self.assertTrue(thread.called)
+        self.assertEqual(reap_trash(), 2)  # The folder and its blob manifest
+        self.assertFalse(os.path.exists(blob))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, '.trash')), [])
+
+    def test_reconcile_command_reports_and_fixes_drift(self, thread):
+        Event.objects.filter(pk=self.event.pk).update(name='Renamed Elsewhere')  # Folder left behind
+        kept = Event.objects.create(name='Kept', year=2025)
+        missing = self.make_filter(kept, 'missing')
+        os.remove(missing.file.path)
+        with open(os.path.join(self.folder('Kept'), 'stray.xmp'), 'wb') as f:
+            f.write(xmp('-2.00'))
+        old = time.time() - 10
+        for folder, _, files in os.walk(self.media_root):
+            for name in files:
+                os.utime(os.path.join(folder, name), (old, old))
+
+        out = StringIO()
+        call_command('reconcile_filter_storage', '--grace=5', stdout=out)
+        self.assertIn("Orphaned folders: 1\n  filters/Old_Name", out.getvalue())
+        self.assertIn("Files without a filter: 1\n  filters/Kept/stray.xmp", out.getvalue())
+        self.assertIn("Filters without a file: 1", out.getvalue())
+        self.assertTrue(os.path.isdir(self.folder('Old_Name')))  # Report only
+
+        out = StringIO()
+        call_command('reconcile_filter_storage', '--grace=5', '--fix', '--reap', stdout=out)
+        self.assertIn("Restored from blobs: 1", out.getvalue())
+        self.assertTrue(os.path.isfile(missing.file.path))
+        self.assertFalse(os.path.exists(self.folder('Old_Name')))
+        self.assertFalse(os.path.exists(os.path.join(self.folder('Kept'), 'stray.xmp')))
+        self.assertIn("Reaped 1 trash entry.", out.getvalue())
+
+
+class EventTypeaheadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        Event.objects.create(name='Wedding Venice', year=2024)
+        Event.objects.create(name='Wedding Rome', year=2025)
+        Event.objects.create(name='Jomanji Festival', year=2023)
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+
+    def suggest(self, **params):
+        response = self.client.get(reverse('dashboard:event_typeahead'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_name_and_year_suggestions(self):
+        self.assertEqual(sorted(self.suggest(q='wed')), ['Wedding Rome', 'Wedding Venice'])
+        self.assertEqual(self.suggest(q='  '), [])
+        self.assertEqual(self.suggest(field='year', q='202'), [2025, 2024, 2023])
+        self.assertEqual(self.suggest(field='year', q='2024'), [2024])
+
+    def test_repeat_queries_are_cached(self):
+        self.suggest(q='wed')
+        with self.assertNumQueries(2):  # Session and user only
+            self.assertEqual(len(self.suggest(q='WED ')), 2)
+
+    def test_event_changes_retire_cached_results(self):
+        self.assertEqual(len(self.suggest(q='wed')), 2)
+        self.suggest(field='year')
+
+        Event.objects.create(name='Wedding Paris', year=2026)
+        self.assertEqual(len(self.suggest(q='wed')), 3)
+        self.assertEqual(self.suggest(field='year')[0], 2026)
+
+        Event.objects.get(name='Wedding Rome').delete()
+        self.assertNotIn('Wedding Rome', self.suggest(q='wed'))
+
+
+LOOK_XMP = b'''<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+<rdf:Description xmlns:crs="http://ns.adobe.com/camera-raw-settings/1.0/"
+  crs:ProcessVersion="11.0" crs:ConvertToGrayscale="False" crs:CameraProfile="Adobe Standard">
+ <crs:Exposure2012>-1.25</crs:Exposure2012>
+ <crs:ToneCurvePV2012><rdf:Seq><rdf:li>0, 0</rdf:li><rdf:li>255, 255</rdf:li></rdf:Seq></crs:ToneCurvePV2012>
+ <crs:Look>
+  <rdf:Description crs:Name="Adobe Monochrome" crs:Amount="1">
+   <crs:Parameters>
+    <rdf:Description crs:Version="6.7" crs:ProcessVersion="6.7" crs:ConvertToGrayscale="True"/>
+   </crs:Parameters>
+  </rdf:Description>
+ </crs:Look>
+</rdf:Description></rdf:RDF></x:xmpmeta>'''
+
+
+class FilterSettingsTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = Event.objects.create(name='Presets', year=2025)
+        self.bright = self.make_filter(self.event, 'bright', xmp('+0.50'))
+        self.mono = self.make_filter(self.event, 'mono', LOOK_XMP)
+
+    def test_flat_attributes(self):
+        self.assertEqual(parse_crs_settings(xmp('+0.50')), {'Exposure2012': '+0.50'})
+
+    def test_element_form_and_nested_look(self):
+        settings = parse_crs_settings(LOOK_XMP)
+        self.assertEqual(settings['Exposure2012'], '-1.25')
+        self.assertEqual(settings['ProcessVersion'], '11.0')  # Not the look's 6.7
+        self.assertEqual(settings['ConvertToGrayscale'], 'False')
+        self.assertEqual(settings['Look.Name'], 'Adobe Monochrome')
+        self.assertEqual(settings['Look.Amount'], '1')
+        self.assertEqual(settings['Look.Parameters.ProcessVersion'], '6.7')
+        self.assertEqual(settings['Look.Parameters.ConvertToGrayscale'], 'True')
+        self.assertNotIn('Name', settings)
+        self.assertNotIn('ToneCurvePV2012', settings)  # Lists are not scalar settings
+
+    def test_uploads_are_indexed(self):
+        stored = dict(self.mono.settings.values_list('key', 'value_number'))
+        self.assertEqual(stored['Exposure2012'], -1.25)
+        self.assertEqual(stored['ProcessVersion'], 11.0)
+        self.assertIsNone(stored['Look.Name'])
+
+    def test_range_search(self):
+        filters = Filter.objects.order_by('name')
+        self.assertEqual(list(filters_matching_settings(filters, ranges={'Exposure2012': (0, 1)})), [self.bright])
+        self.assertEqual(list(filters_matching_settings(filters, ranges={'Exposure2012': (None, 0)})), [self.mono])
+        self.assertEqual(list(filters_matching_settings(filters, ranges={'Exposure2012': (-2, None)})), [self.bright, self.mono])
+        self.assertEqual(list(filters_matching_settings(filters, ranges={'ProcessVersion': (7, None)})), [self.mono])
+
+    def test_profile_search_matches_camera_profile_and_look_name(self):
+        filters = Filter.objects.order_by('name')
+        self.assertEqual(list(filters_matching_settings(filters, profile='monochrome')), [self.mono])
+        self.assertEqual(list(filters_matching_settings(filters, profile='adobe standard')), [self.mono])
+        self.assertEqual(list(filters_matching_settings(filters, equals={'ConvertToGrayscale': 'false'})), [self.mono])
+
+    def test_search_view(self):
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+        url = reverse('dashboard:search_presets')
+
+        response = self.client.get(url, {'setting': 'Exposure2012', 'min_value': 0})
+        self.assertEqual(list(response.context['results']), [self.bright])
+        self.assertIn('Look.Name', response.context['setting_keys'])
+
+        response = self.client.get(url, {'profile': 'Monochrome'})
+        self.assertEqual(list(response.context['results']), [self.mono])
+
+        response = self.client.get(url, {'min_value': 0})
+        self.assertIsNone(response.context['results'])
+        self.assertTrue(response.context['form'].errors)
+
+    def test_index_command_missing_only(self):
+        self.mono.settings.all().delete()
+        out = StringIO()
+        call_command('index_filter_settings', '--missing', stdout=out)
+        self.assertIn("Indexed 9 settings across 1 filters.", out.getvalue())
+        self.assertTrue(self.mono.settings.filter(key='Look.Name').exists())
+
+        out = StringIO()
+        call_command('index_filter_settings', stdout=out)
+        self.assertIn("Indexed 10 settings across 2 filters.", out.getvalue())
+
+
+def zip_upload(members, name='pack.zip', compression=zipfile.ZIP_STORED):
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, 'w', compression) as archive:
+        for member, content in members.items():
+            if member.endswith('/'):
+                archive.mkdir(member)
+            else:
+                archive.writestr(member, content)
+    return SimpleUploadedFile(name, data.getvalue(), content_type='application/zip')
+
+
+def corrupt_member(upload, content, replacement):
+    # Overwrite a member's stored bytes in place, leaving its recorded CRC
+    data = upload.read()
+    return SimpleUploadedFile(upload.name, data.replace(content, replacement), content_type='application/zip')
+
+
+class BatchUploadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = Event.objects.create(name='Batch Event', year=2025)
+        self.client.force_login(get_user_model().objects.create_user('senior', password='x', role='senior'))
+        self.url = reverse('dashboard:upload_filters_batch', args=[self.event.pk])
+
+    def upload(self, *files, **headers):
+        return self.client.post(self.url, {'files': list(files)}, headers=headers)
+
+    def report(self, *files):
+        return {row['file']: (row['status'], row['message']) for row in batch_create_filters(self.event, files)}
+
+    def test_zip_members_are_expanded(self):
+        report = self.report(zip_upload({
+            'pack/': b'',
+            'pack/warm.xmp': xmp('+0.10'),
+            'pack/cool.xmp': xmp('-0.10'),
+            '__MACOSX/pack/._warm.xmp': b'resource fork',
+            'pack/.hidden.xmp': xmp(),
+            'pack/readme.txt': b'hello',
+        }), SimpleUploadedFile('single.xmp', xmp('+0.30')))
+
+        self.assertEqual(report, {
+            'warm.xmp': ('created', ''),
+            'cool.xmp': ('created', ''),
+            'readme.txt': ('invalid', "Only .xmp extension files are allowed."),
+            'single.xmp': ('created', ''),
+        })
+        self.assertEqual(sorted(self.event.filters.values_list('name', flat=True)), ['cool', 'single', 'warm'])
+        self.assertTrue(Filter.objects.get(name='warm').settings.filter(key='Exposure2012').exists())
+
+    def test_corrupt_members_are_reported(self):
+        good, bad = xmp('+0.10'), xmp('-0.20')
+        stored = corrupt_member(zip_upload({'good.xmp': good, 'bad.xmp': bad}), bad, bad.replace(b'-0.20', b'-0.90'))
+        deflated = zip_upload({'junk.xmp': b'x' * 4096}, name='deflated.zip', compression=zipfile.ZIP_DEFLATED)
+        raw = zlib.compress(b'x' * 4096)[2:-4]  # The member's deflate stream
+        deflated = SimpleUploadedFile('deflated.zip', deflated.read().replace(raw, b'\xff' * len(raw)))
+
+        report = self.report(stored, deflated, SimpleUploadedFile('broken.zip', b'not a zip'))
+        self.assertEqual(report['good.xmp'], ('created', ''))
+        self.assertEqual(report['bad.xmp'], ('invalid', "Could not be extracted from the ZIP archive."))
+        self.assertEqual(report['junk.xmp'], ('invalid', "Could not be extracted from the ZIP archive."))
+        self.assertEqual(report['broken.zip'], ('invalid', "Not a valid ZIP archive."))
+
+    def test_corrupt_member_through_the_view(self):
+        bad = xmp('-0.20')
+        upload = corrupt_member(zip_upload({'bad.xmp': bad}), bad, bad.replace(b'-0.20', b'-0.90'))
+        response = self.upload(upload, Accept='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['status'], 'invalid')
+
+    def test_duplicates_use_one_name_query(self):
+        self.make_filter(self.event, 'taken')
+        with CaptureQueriesContext(connection) as queries:
+            report = self.report(
+                SimpleUploadedFile('taken.xmp', xmp()),
+                SimpleUploadedFile('fresh.xmp', xmp()),
+                zip_upload({'fresh.xmp': xmp('+1.00')}),
+            )
+
+        self.assertEqual(report['taken.xmp'], ('duplicate', "A filter named 'taken' already exists for this event."))
+        self.assertEqual(report['fresh.xmp'], ('duplicate', "Appears more than once in this upload."))  # Later entry wins the key
+        self.assertEqual(self.event.filters.get(name='fresh').size_bytes, len(xmp()))
+        name_lookups = [q['sql'] for q in queries.captured_queries if '"name" IN' in q['sql']]
+        self.assertEqual(len(name_lookups), 1)
+
+    @override_settings(FILTER_BATCH_MAX_FILES=2)
+    def test_batch_size_limit(self):
+        results = batch_create_filters(self.event, [SimpleUploadedFile(f'p{n}.xmp', xmp()) for n in range(3)])
+        self.assertEqual([row['status'] for row in results], ['created', 'created', 'invalid'])
+        self.assertEqual(results[2]['message'], "Only 2 files can be uploaded at once.")
+
+    def test_json_report(self):
+        response = self.upload(SimpleUploadedFile('one.xmp', xmp()), SimpleUploadedFile('two.txt', b'x'),
+                               Accept='application/json')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['created'], 1)
+        self.assertEqual([row['status'] for row in data['results']], ['created', 'invalid'])
+        self.assertEqual(data['results'][0]['id'], Filter.objects.get(name='one').pk)
+
+        self.assertEqual(self.upload(Accept='application/json').status_code, 400)
+
+    def test_html_report(self):
+        response = self.upload(SimpleUploadedFile('one.xmp', xmp()), SimpleUploadedFile('one.xmp', xmp()))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.context['report']], ['created', 'duplicate'])
+        self.assertContains(response, "1 of 2 filters uploaded.")
+
+    def test_junior_editors_cannot_upload(self):
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+        self.assertEqual(self.upload(SimpleUploadedFile('one.xmp', xmp())).status_code, 403)
+
+    def test_integrity_error_rolls_back_rows_and_files(self):
+        with mock.patch('event.uploads.index_objects', side_effect=IntegrityError):
+            results = batch_create_filters(self.event, [SimpleUploadedFile('one.xmp', xmp())])
+
+        self.assertEqual(results[0]['status'], 'invalid')
+        self.assertEqual(results[0]['message'], "Another upload changed this event at the same time; please retry.")
+        self.assertFalse(Filter.objects.exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'filters', 'Batch_Event', 'one.xmp')))
+        self.assertFalse(self.storage.exists(self.storage.blob_name(hashlib.sha256(xmp()).hexdigest())))
+
+
+class SearchIndexTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.venice = Event.objects.create(name='Wedding Venice', year=2024)
+        self.rome = Event.objects.create(name='Rome Gala', year=2025)
+        self.sunset = self.make_filter(self.rome, 'sunset glow')
+        self.tagged = self.make_filter(self.venice, 'golden', xmp('+1.00'))
+        self.tagged.tags = 'sunset,warm'
+        self.tagged.save()
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+
+    def index_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT kind, object_id, title, tags FROM search_index ORDER BY kind, object_id")
+            return [(kind, int(pk), title, tags) for kind, pk, title, tags in cursor.fetchall()]
+
+    def test_migration_creates_fts5_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'search_index'")
+            self.assertIn('fts5', cursor.fetchone()[0].lower())
+
+    def test_signals_keep_the_index_current(self):
+        self.assertIn(('filter', self.tagged.pk, 'golden', 'sunset warm'), self.index_rows())
+
+        self.venice.name = 'Wedding Verona'
+        self.venice.save()
+        self.assertIn(('event', self.venice.pk, 'Wedding Verona', ''), self.index_rows())
+        self.assertEqual(search('venice'), [])
+
+        self.rome.delete()  # Cascades to its filter
+        self.assertEqual({(kind, pk) for kind, pk, _, _ in self.index_rows()},
+                         {('event', self.venice.pk), ('filter', self.tagged.pk)})
+
+    def test_title_matches_rank_above_tag_matches(self):
+        hits = search('sunset', kinds=['filter'])
+        self.assertEqual([pk for _, pk, _ in hits], [self.sunset.pk, self.tagged.pk])
+        self.assertGreater(hits[0][2], hits[1][2])
+
+    def test_every_word_must_match_as_a_prefix(self):
+        self.assertEqual([(kind, pk) for kind, pk, _ in search('wed ven')], [('event', self.venice.pk)])
+        self.assertEqual(search('wed gala'), [])
+        self.assertEqual(search('"*) OR ('), [])  # Punctuation never reaches MATCH
+
+    def test_unified_search_json(self):
+        response = self.client.get(reverse('dashboard:search'), {'q': 'sun'})
+        results = response.json()['results']
+        self.assertEqual([(row['type'], row['id']) for row in results], [('filter', self.sunset.pk), ('filter', self.tagged.pk)])
+        self.assertEqual(results[0]['event'], 'Rome Gala')
+        self.assertEqual(results[0]['download_url'], reverse('dashboard:download_filter', args=[self.sunset.pk]))
+
+        results = self.client.get(reverse('dashboard:search'), {'q': 'ga', 'kind': 'event', 'limit': 'x'}).json()['results']
+        self.assertEqual([(row['type'], row['name'], row['year']) for row in results], [('event', 'Rome Gala', 2025)])
+
+    def test_event_list_name_search(self):
+        response = self.client.get(reverse('dashboard:event_folder_list'), {'name': 'wedd'})
+        self.assertEqual([event.name for event in response.context['events']], ['Wedding Venice'])
+        response = self.client.get(reverse('dashboard:event_folder_list'), {'name': '!!'})
+        self.assertEqual(list(response.context['events']), [])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM search_index")
+        out = StringIO()
+        call_command('rebuild_search_index', '--batch-size=1', stdout=out)
+        self.assertIn("Indexed 4 row(s).", out.getvalue())
+        self.assertEqual(len(self.index_rows()), 4)
+        self.assertEqual([pk for _, pk, _ in search('golden')], [self.tagged.pk])
+
+
+class EventListTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.big = Event.objects.create(name='Big', year=2024)
+        self.small = Event.objects.create(name='Small', year=2025)
+        self.empty = Event.objects.create(name='Empty', year=2023)
+        for n in range(3):
+            self.make_filter(self.big, f'p{n}', xmp(f'+0.{n}0') + b' ' * 1000)
+        self.make_filter(self.small, 'only')
+        self.client.force_login(get_user_model().objects.create_user('junior', password='x'))
+
+    def listed(self, **params):
+        response = self.client.get(reverse('dashboard:event_folder_list'), params)
+        return [(event.name, event.filter_count, event.total_size) for event in response.context['events']]
+
+    def test_counts_and_sizes(self):
+        rows = {name: (count, size) for name, count, size in self.listed()}
+        big_size = sum(len(xmp(f'+0.{n}0')) + 1000 for n in range(3))
+        self.assertEqual(rows, {'Small': (1, len(xmp())), 'Big': (3, big_size), 'Empty': (0, 0)})
+
+    def test_sorts(self):
+        names = lambda sort: [name for name, _, _ in self.listed(sort=sort)]
+        self.assertEqual(names(''), ['Small', 'Big', 'Empty'])  # Newest year first
+        self.assertEqual(names('name'), ['Big', 'Empty', 'Small'])
+        self.assertEqual(names('-filters'), ['Big', 'Small', 'Empty'])
+        self.assertEqual(names('filters'), ['Empty', 'Small', 'Big'])
+        self.assertEqual(names('-size'), ['Big', 'Small', 'Empty'])
+        self.assertEqual(names('size'), ['Empty', 'Small', 'Big'])
+
+    def test_page_is_one_query_plus_count(self):
+        for n in range(12):
+            Event.objects.create(name=f'Filler {n}', year=2020)
+        with self.assertNumQueries(4):  # Paginator COUNT, session, user, then the annotated page
+            response = self.client.get(reverse('dashboard:event_folder_list'), {'sort': '-size'})
+        self.assertEqual(len(response.context['events']), 10)
+
+    def test_batch_upload_records_sizes(self):
+        batch_create_filters(self.empty, [SimpleUploadedFile('a.xmp', xmp()), SimpleUploadedFile('b.xmp', xmp('-1.00'))])
+        self.assertEqual(sorted(self.empty.filters.values_list('size_bytes', flat=True)), sorted([len(xmp()), len(xmp('-1.00'))]))
+        self.assertIn(('Empty', 2, len(xmp()) + len(xmp('-1.00'))), self.listed())
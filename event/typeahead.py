@@ -0,0 +1,50 @@
+import hashlib  # Cache-safe keys for arbitrary user input
+from django.conf import settings  # Cache lifetime
+from django.core.cache import cache
+from dashboard.utils import bump_cache_generation, cache_generation
+from event.search import search
+
+SUGGESTION_LIMIT = 10
+GENERATION_KEY = 'event-typeahead:generation'
+
+
+# -------------------------------------------------------------------
+# Event name/year typeahead
+# Name suggestions come from the full-text index's prefix index; the year list
+# is small and kept whole. Results are cached under a generation token that
+# Event save/delete replaces (see event/signals.py), which retires every
+# cached entry at once without having to know their keys.
+# -------------------------------------------------------------------
+def invalidate_typeahead():
+    bump_cache_generation(GENERATION_KEY)
+
+
+def _cached(field, query, compute):
+    digest = hashlib.sha1(query.encode()).hexdigest()[:16]
+    key = f'event-typeahead:{cache_generation(GENERATION_KEY)}:{field}:{digest}'
+    return cache.get_or_set(key, compute, settings.EVENT_TYPEAHEAD_CACHE_SECONDS)
+
+
+def suggest_event_names(query, limit=SUGGESTION_LIMIT):
+    from event.models import Event  # Avoid circular import
+
+    query = ' '.join(query.lower().split())
+    if not query:
+        return []
+
+    def compute():
+        ids = [pk for _, pk, _ in search(query, kinds=['event'], limit=limit)]
+        names = Event.objects.only('id', 'name').in_bulk(ids)
+        return [names[pk].name for pk in ids if pk in names]  # Keep rank order
+
+    return _cached('name', query, compute)
+
+
+def suggest_event_years(prefix=''):
+    from event.models import Event  # Avoid circular import
+
+    years = _cached('year', '', lambda: list(
+        Event.objects.order_by('-year').values_list('year', flat=True).distinct()
+    ))
+    prefix = prefix.strip()
+    return [year for year in years if str(year).startswith(prefix)]
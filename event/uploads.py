@@ -0,0 +1,142 @@
+import os  # File name handling
+import xml.etree.ElementTree as ET  # XMP parse errors
+import zipfile  # Preset packs uploaded as one archive
+import zlib  # Corrupt deflate streams in ZIP members
+from django.conf import settings  # Batch limits
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from event.archive import invalidate_event_archive
+from event.models import Filter, FilterSetting, collect_filter_blobs, filter_upload_path, validate_filters_file
+from event.storage import file_sha256
+from event.search import index_objects
+from event.xmp import parse_crs_settings, setting_rows
+
+
+# -------------------------------------------------------------------
+# Function: expand_uploads
+# Purpose: Flatten uploaded files into (filename, file, error) entries.
+#          ZIP archives contribute one entry per member; folders, dotfiles
+#          and macOS resource forks inside them are skipped, and members that
+#          cannot be extracted are reported as errors.
+# -------------------------------------------------------------------
+def expand_uploads(files):
+    for upload in files:
+        if not upload.name.lower().endswith('.zip'):
+            yield upload.name, upload, None
+            continue
+
+        try:
+            archive = zipfile.ZipFile(upload)
+        except zipfile.BadZipFile:
+            yield upload.name, None, "Not a valid ZIP archive."
+            continue
+
+        with archive:
+            for info in archive.infolist():
+                filename = os.path.basename(info.filename)
+                if info.is_dir() or not filename or filename.startswith('.') or '__MACOSX' in info.filename:
+                    continue
+                # Check the declared size before inflating anything
+                if info.file_size > settings.FILTER_MAX_UPLOAD_SIZE:
+                    yield filename, None, "File is too large."
+                    continue
+                try:
+                    data = archive.read(info)
+                except (zipfile.BadZipFile, zlib.error, EOFError, ValueError, NotImplementedError, RuntimeError):
+                    # Bad CRC, corrupt or truncated data, bad offsets, unsupported compression or encryption
+                    yield filename, None, "Could not be extracted from the ZIP archive."
+                    continue
+                yield filename, ContentFile(data, name=filename), None
+
+
+def _validate(filename, content, name, seen):
+    try:
+        validate_filters_file(content)
+    except ValidationError as e:
+        return 'invalid', e.messages[0], None
+    if content.size > settings.FILTER_MAX_UPLOAD_SIZE:
+        return 'invalid', "File is too large.", None
+    if not name or len(name) > Filter._meta.get_field('name').max_length:
+        return 'invalid', "File name cannot be used as a filter name.", None
+    if name in seen:
+        return 'duplicate', "Appears more than once in this upload.", None
+
+    content.seek(0)
+    try:
+        crs_settings = parse_crs_settings(content.read())
+    except ET.ParseError:
+        return 'invalid', "Not a valid XMP document.", None
+    return None, None, crs_settings
+
+
+# -------------------------------------------------------------------
+# Function: batch_create_filters
+# Purpose: Validate and create filters for many uploaded .xmp files (or ZIPs
+#          of them) in one pass. Duplicates are found with one name__in query,
+#          Filter and FilterSetting rows are inserted with bulk_create.
+#          Returns one report row per file:
+#            {'file', 'name', 'status': created|duplicate|invalid, 'message'}
+# -------------------------------------------------------------------
+def batch_create_filters(event, files):
+    results = []
+    pending = []  # (result, content, crs_settings) that passed validation
+    seen = set()
+
+    for filename, content, error in expand_uploads(files):
+        name = os.path.splitext(filename)[0]
+        result = {'file': filename, 'name': name, 'status': 'invalid', 'message': error or ''}
+        results.append(result)
+        if error:
+            continue
+        if len(results) > settings.FILTER_BATCH_MAX_FILES:
+            result['message'] = f"Only {settings.FILTER_BATCH_MAX_FILES} files can be uploaded at once."
+            continue
+
+        status, message, crs_settings = _validate(filename, content, name, seen)
+        if status:
+            result.update(status=status, message=message)
+            continue
+        seen.add(name)
+        pending.append((result, content, crs_settings))
+
+    # One query for every name in the batch
+    existing = set(
+        Filter.objects.filter(event=event, name__in=[result['name'] for result, _, _ in pending])
+        .values_list('name', flat=True)
+    )
+
+    storage = Filter._meta.get_field('file').storage
+    staged = []  # (result, unsaved Filter, crs_settings)
+    for result, content, crs_settings in pending:
+        if result['name'] in existing:
+            result.update(status='duplicate', message=f"A filter named '{result['name']}' already exists for this event.")
+            continue
+        filter_obj = Filter(event=event, name=result['name'], sha256=file_sha256(content), size_bytes=content.size)
+        filter_obj.file.name = storage.save(filter_upload_path(filter_obj, content.name), content)
+        staged.append((result, filter_obj, crs_settings))
+
+    if not staged:
+        return results
+
+    new_filters = [filter_obj for _, filter_obj, _ in staged]
+    try:
+        with transaction.atomic():
+            Filter.objects.bulk_create(new_filters)
+            FilterSetting.objects.bulk_create([
+                row for _, filter_obj, crs_settings in staged for row in setting_rows(filter_obj, crs_settings)
+            ])
+            index_objects('filter', new_filters)  # bulk_create skips the search signals
+    except IntegrityError:
+        # A concurrent upload took one of the names; undo the stored files
+        for filter_obj in new_filters:
+            storage.delete(filter_obj.file.name)
+        collect_filter_blobs({filter_obj.sha256 for filter_obj in new_filters})
+        for result, _, _ in staged:
+            result.update(status='invalid', message="Another upload changed this event at the same time; please retry.")
+        return results
+
+    for result, filter_obj, _ in staged:
+        result.update(status='created', id=filter_obj.pk)
+    invalidate_event_archive(event)
+    return results
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.UploadSessionCreateAPIView.as_view(), name='upload_session_create'),
+    path('<uuid:pk>/', views.UploadSessionAPIView.as_view(), name='upload_session'),
+]
@@ -1 +1,105 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
+from django.conf import settings
+from django.http import RawPostDataException
+from django.core.exceptions import RequestDataTooBig
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import BasePermission
+from rest_framework import status
+from .models import UploadSession
+from .resumable import ChecksumMismatch, OffsetMismatch, abort_upload, append_chunk, parse_checksum
+from .serializers import UploadSessionSerializer
+
+
+class IsAdminOrSenior(BasePermission):
+    """
+    Only admins and senior editors may upload filters.
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role in ['admin', 'senior']
+
+
+def _offset_headers(session):
+    return {
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.size),
+        "Cache-Control": "no-store",
+    }
+
+
+class UploadSessionCreateAPIView(APIView):
+    """
+    POST: start a resumable upload ({"event", "filename", "size", "sha256"?}).
+    Returns the session with its URL and the chunk size to use.
+    """
+    permission_classes = [IsAdminOrSenior]
+
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        session = serializer.save(user=request.user)
+
+        data = dict(serializer.data, chunk_size=settings.FILTER_UPLOAD_CHUNK_SIZE,
+                    url=request.build_absolute_uri(f"{session.id}/"))
+        return Response(data, status=status.HTTP_201_CREATED, headers={"Location": data["url"], **_offset_headers(session)})
+
+
+class UploadSessionAPIView(APIView):
+    """
+    HEAD/GET: current offset (resume point) and, once complete, the per-file report.
+    PATCH: append the raw request body at the Upload-Offset header, optionally
+    verified by "Upload-Checksum: sha256 <hex>". 409 means the offset is stale;
+    the response carries the offset to resume from.
+    DELETE: abort the upload and discard its chunks.
+    """
+    permission_classes = [IsAdminOrSenior]
+
+    def get_session(self, request, pk):
+        return get_object_or_404(UploadSession, pk=pk, user=request.user)
+
+    def get(self, request, pk):
+        session = self.get_session(request, pk)
+        return Response(UploadSessionSerializer(session).data, headers=_offset_headers(session))
+
+    def head(self, request, pk):
+        session = self.get_session(request, pk)
+        return Response(status=status.HTTP_200_OK, headers=_offset_headers(session))
+
+    def patch(self, request, pk):
+        session = self.get_session(request, pk)
+        offset = request.headers.get("Upload-Offset", "").strip()
+        if not offset:
+            return Response({"error": "Upload-Offset header is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if not offset.isascii() or not offset.isdigit():
+            return Response({"error": "Upload-Offset must be a non-negative integer."}, status=status.HTTP_400_BAD_REQUEST)
+        offset = int(offset)
+        try:
+            checksum = parse_checksum(request.headers.get("Upload-Checksum"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            data = request.body
+        except (RequestDataTooBig, RawPostDataException):
+            return Response({"error": f"Chunks are limited to {settings.FILTER_UPLOAD_CHUNK_SIZE} bytes."},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        try:
+            session = append_chunk(session.pk, offset, data, checksum)
+        except OffsetMismatch as e:
+            session.offset = e.offset
+            return Response({"error": str(e), "offset": e.offset}, status=status.HTTP_409_CONFLICT,
+                            headers=_offset_headers(session))
+        except ChecksumMismatch as e:
+            # Nothing was stored; the client resends the same chunk
+            return Response({"error": str(e), "offset": offset}, status=status.HTTP_400_BAD_REQUEST,
+                            headers=_offset_headers(session))
+
+        code = status.HTTP_201_CREATED if session.status == 'complete' else status.HTTP_200_OK
+        if session.status == 'failed':
+            code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        return Response(UploadSessionSerializer(session).data, status=code, headers=_offset_headers(session))
+
+    def delete(self, request, pk):
+        abort_upload(self.get_session(request, pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,112 @@
+import xml.etree.ElementTree as ET  # XMP is RDF/XML
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+# Camera Raw / Lightroom develop settings namespace
+CRS_NS = 'http://ns.adobe.com/camera-raw-settings/1.0/'
+
+# Settings that name the camera profile / look a preset applies
+PROFILE_KEYS = ['CameraProfile', 'Look.Name']
+
+
+# -------------------------------------------------------------------
+# Function: parse_crs_settings
+# Purpose: Extract scalar crs: settings from an XMP document as {key: text}.
+#          Settings inside nested crs elements are prefixed with the path of
+#          crs elements above them; rdf:Description/rdf:li wrappers add
+#          nothing, so Lightroom's
+#            <crs:Look><rdf:Description crs:Name="...">
+#              <crs:Parameters><rdf:Description crs:Version="..."/>
+#          gives "Look.Name" and "Look.Parameters.Version". The first value
+#          seen for a key wins.
+# -------------------------------------------------------------------
+def parse_crs_settings(data):
+    root = ET.fromstring(data)
+    settings = {}
+    prefix = f'{{{CRS_NS}}}'
+
+    stack = [(root, ())]  # Iterative walk: deep documents cannot exhaust the recursion limit
+    while stack:
+        element, path = stack.pop()
+        if element.tag.startswith(prefix):
+            path = (*path, element.tag[len(prefix):])
+            # Element form: <crs:Exposure2012>+0.50</crs:Exposure2012>
+            if len(element) == 0 and element.text and element.text.strip():
+                settings.setdefault('.'.join(path), element.text.strip())
+
+        for name, value in element.attrib.items():
+            if name.startswith(prefix):
+                settings.setdefault('.'.join((*path, name[len(prefix):])), value)
+
+        stack.extend((child, path) for child in reversed(element))  # Document order
+
+    return settings
+
+
+def to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Unsaved FilterSetting rows for parsed {key: text} settings
+def setting_rows(filter_obj, settings):
+    from event.models import FilterSetting  # Avoid circular import
+
+    return [
+        FilterSetting(filter=filter_obj, key=key[:100], value_text=value[:255], value_number=to_number(value))
+        for key, value in settings.items()
+    ]
+
+
+# -------------------------------------------------------------------
+# Function: index_filter_settings
+# Purpose: (Re)build the FilterSetting rows for one filter from its file.
+#          Returns the number of settings indexed; unreadable files index nothing.
+# -------------------------------------------------------------------
+def index_filter_settings(filter_obj):
+    from event.models import FilterSetting  # Avoid circular import
+
+    try:
+        with filter_obj.file.open('rb') as f:
+            settings = parse_crs_settings(f.read())
+    except (ET.ParseError, OSError, ValueError):
+        settings = {}
+
+    rows = setting_rows(filter_obj, settings)
+    with transaction.atomic():
+        FilterSetting.objects.filter(filter=filter_obj).delete()
+        FilterSetting.objects.bulk_create(rows)
+    return len(rows)
+
+
+# -------------------------------------------------------------------
+# Function: filters_matching_settings
+# Purpose: Narrow a Filter queryset by develop settings, all in SQL.
+#   ranges:  {key: (min, max)}, either bound may be None
+#   equals:  {key: text}, case-insensitive exact match
+#   profile: substring of the camera profile / look name
+# -------------------------------------------------------------------
+def filters_matching_settings(queryset, ranges=None, equals=None, profile=None):
+    from event.models import FilterSetting  # Avoid circular import
+
+    settings = FilterSetting.objects.filter(filter=OuterRef('pk'))
+
+    for key, (low, high) in (ranges or {}).items():
+        match = settings.filter(key=key)
+        if low is not None:
+            match = match.filter(value_number__gte=low)
+        if high is not None:
+            match = match.filter(value_number__lte=high)
+        queryset = queryset.filter(Exists(match))
+
+    for key, value in (equals or {}).items():
+        queryset = queryset.filter(Exists(settings.filter(key=key, value_text__iexact=value)))
+
+    if profile:
+        queryset = queryset.filter(Exists(settings.filter(
+            Q(key__in=PROFILE_KEYS) & Q(value_text__icontains=profile)
+        )))
+
+    return queryset